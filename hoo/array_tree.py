@@ -0,0 +1,452 @@
+"""
+Module that implements an array-backed (struct-of-arrays) HOO tree
+
+The statistics and geometry of every node are stored in preallocated NumPy
+arrays indexed by node id, instead of one Python object per node. Nodes are
+accessed through ArrayHOONode, a lightweight view that exposes the same
+interface as HOONode, so the HOO variants can use either backend.
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, List, Optional, Union
+
+import numpy as np
+import numpy.random as rnd
+
+from hoo.state_actions.action_space import HOOActionSpace
+
+if TYPE_CHECKING:
+    from hoo.utils.rng import BlockRNG
+
+
+class ArrayTree:
+    """
+    Binary HOO tree whose nodes are stored as rows of NumPy arrays
+
+    The two children of a node are always allocated together, so only the id
+    of the lower child is stored (the upper child is the next id).
+    """
+
+    def __init__(
+        self,
+        action_space: HOOActionSpace,
+        max_depth: Union[int, float] = float("inf"),
+        capacity: int = 1024,
+        rng: Optional[BlockRNG] = None,
+        cyclic_splits: bool = False,
+    ) -> None:
+        """
+        Initializes an ArrayTree with a single root node
+
+        Args:
+            action_space: the action space where the search will be done
+            max_depth: maximum depth of the tree search (used in LD-HOO and
+                Poly-HOO)
+            capacity: number of nodes initially allocated
+            rng: random generator of the search. If None, the global NumPy
+                RNG is used
+            cyclic_splits: if True the nodes at depth h are split along the
+                dimension h mod dim instead of a random one
+        """
+        self.dim = action_space.dim
+        self.rng = rng
+        self.cyclic_splits = cyclic_splits
+        self.max_depth = max_depth
+        self.capacity = capacity
+        self.size = 0
+
+        self.N = np.zeros(capacity, dtype=np.int64)
+        self.R = np.zeros(capacity, dtype=np.float64)
+        self.B = np.full(capacity, math.inf, dtype=np.float64)
+        self.depth = np.zeros(capacity, dtype=np.int32)
+        self.split_dimension = np.zeros(capacity, dtype=np.int32)
+        self.child = np.full(capacity, -1, dtype=np.int64)
+        self.parent = np.full(capacity, -1, dtype=np.int64)
+        self.low = np.zeros((capacity, self.dim), dtype=np.float64)
+        self.high = np.zeros((capacity, self.dim), dtype=np.float64)
+
+        # Node ids grouped by depth, used by the level-wise B-value update
+        self.levels: List[np.ndarray] = []
+        self.level_sizes: List[int] = []
+
+        self.add_node(action_space.low, action_space.high, 0, -1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the node arrays (in bytes)"""
+        arrays = [
+            self.N, self.R, self.B, self.depth, self.split_dimension,
+            self.child, self.parent, self.low, self.high, *self.levels,
+        ]
+        return sum(array.nbytes for array in arrays)
+
+    def node(self, index: int) -> ArrayHOONode:
+        return ArrayHOONode(self, index)
+
+    def grow(self) -> None:
+        """Doubles the capacity of the node arrays"""
+        capacity = 2 * self.capacity
+
+        def resize(array, fill):
+            new_array = np.full((capacity,) + array.shape[1:], fill,
+                                dtype=array.dtype)
+            new_array[:self.size] = array[:self.size]
+            return new_array
+
+        self.N = resize(self.N, 0)
+        self.R = resize(self.R, 0.)
+        self.B = resize(self.B, math.inf)
+        self.depth = resize(self.depth, 0)
+        self.split_dimension = resize(self.split_dimension, 0)
+        self.child = resize(self.child, -1)
+        self.parent = resize(self.parent, -1)
+        self.low = resize(self.low, 0.)
+        self.high = resize(self.high, 0.)
+        self.capacity = capacity
+
+    def add_node(self, low, high, depth: int, parent: int) -> int:
+        """
+        Allocates a new node
+
+        Args:
+            low: lower bounds of the node's cell
+            high: upper bounds of the node's cell
+            depth: depth of the node in the tree
+            parent: id of the parent node (-1 for the root)
+        Returns:
+            The id of the new node
+        """
+        if self.size == self.capacity:
+            self.grow()
+
+        index = self.size
+        self.size += 1
+
+        self.low[index] = low
+        self.high[index] = high
+        self.depth[index] = depth
+        self.parent[index] = parent
+        if self.cyclic_splits:
+            self.split_dimension[index] = depth % self.dim
+        else:
+            self.split_dimension[index] = (
+                rnd.choice(np.arange(self.dim)) if self.rng is None
+                else self.rng.integer(self.dim)
+            )
+
+        if depth == len(self.levels):
+            self.levels.append(np.empty(16, dtype=np.int64))
+            self.level_sizes.append(0)
+
+        if self.level_sizes[depth] == len(self.levels[depth]):
+            self.levels[depth] = np.concatenate(
+                [self.levels[depth], np.empty_like(self.levels[depth])]
+            )
+
+        self.levels[depth][self.level_sizes[depth]] = index
+        self.level_sizes[depth] += 1
+
+        return index
+
+    def level(self, depth: int) -> np.ndarray:
+        return self.levels[depth][:self.level_sizes[depth]]
+
+    def generate_children(self, index: int) -> None:
+        """
+        Generates the two children of a node by splitting its cell in half
+        along the node's split dimension
+
+        Args:
+            index: id of the node to be expanded
+        """
+        depth = self.depth.item(index)
+
+        if depth == self.max_depth:
+            return
+
+        dimension = self.split_dimension.item(index)
+        low = self.low[index]
+        high = self.high[index]
+        boundary = (low.item(dimension) + high.item(dimension)) / 2.0
+
+        lower_high = high.copy()
+        lower_high[dimension] = boundary
+        upper_low = low.copy()
+        upper_low[dimension] = boundary
+
+        self.child[index] = self.add_node(low, lower_high, depth + 1, index)
+        self.add_node(upper_low, high, depth + 1, index)
+
+    def depth_terms(self, v1: float, rho: float) -> np.ndarray:
+        """
+        Computes v1 * rho**h for every depth h of the tree
+
+        Returns:
+            An array indexed by depth
+        """
+        return np.array([v1 * (rho**h) for h in range(len(self.levels))])
+
+    def update_B(self, log_t: float, ce: float, v1: float, rho: float) -> None:
+        """
+        Updates the B-values of every node in the tree
+
+        The update is vectorized over the nodes of each depth, going from the
+        deepest level to the root, and gives the same values as the
+        recursive HOO.update_B.
+
+        Args:
+            log_t: logarithm of the time-step of the algorithm
+            ce: exploration constant
+            v1: parameter of the algorithm as defined in the paper
+            rho: parameter of the algorithm as defined in the paper
+        """
+        depth_terms = self.depth_terms(v1, rho)
+
+        for depth in reversed(range(len(self.levels))):
+            nodes = self.level(depth)
+            nodes = nodes[self.N[nodes] > 0]
+
+            if len(nodes) == 0:
+                continue
+
+            n = self.N[nodes]
+            u = (
+                self.R[nodes] / n
+                + ce * np.sqrt((2.0 * log_t) / n)
+                + depth_terms[depth]
+            )
+
+            children = self.child[nodes]
+            internal = children >= 0
+
+            self.B[nodes[~internal]] = u[~internal]
+
+            children = children[internal]
+            self.B[nodes[internal]] = np.minimum(
+                u[internal],
+                np.maximum(self.B[children], self.B[children + 1]),
+            )
+
+    def average_rewards(self, v1: float, rho: float) -> np.ndarray:
+        """
+        Computes the average reward of every node (-inf if never visited)
+
+        Returns:
+            An array indexed by node id
+        """
+        n = self.N[:self.size]
+        average = np.full(self.size, -math.inf)
+        visited = n > 0
+        average[visited] = (
+            self.R[:self.size][visited] / n[visited]
+            - self.depth_terms(v1, rho)[self.depth[:self.size][visited]]
+        )
+
+        return average
+
+    def path_code(self, index: int) -> List[int]:
+        """
+        Computes the sequence of child positions (0 or 1) from the root to
+        a node, which orders nodes in pre-order
+
+        Args:
+            index: id of the node
+        Returns:
+            The list of child positions
+        """
+        code = []
+        parent = self.parent.item(index)
+
+        while parent >= 0:
+            code.append(index - self.child.item(parent))
+            index = parent
+            parent = self.parent.item(index)
+
+        return code[::-1]
+
+    def best_node(self, v1: float, rho: float) -> int:
+        """
+        Finds the node with the highest average reward
+
+        Ties are broken as in HOO.choose_best_node, in favor of the node that
+        comes last in a pre-order traversal of the tree.
+
+        Returns:
+            The id of the best node
+        """
+        average = self.average_rewards(v1, rho)
+        candidates = np.flatnonzero(average == average.max())
+
+        if len(candidates) == 1:
+            return candidates.item(0)
+
+        return max(candidates.tolist(), key=self.path_code)
+
+
+class ArrayHOONode:
+    """
+    View of a node of an ArrayTree with the same interface as HOONode
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: ArrayTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, ArrayHOONode)
+            and self.tree is other.tree
+            and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    @property
+    def N(self) -> int:
+        return self.tree.N.item(self.index)
+
+    @N.setter
+    def N(self, value: int) -> None:
+        self.tree.N[self.index] = value
+
+    @property
+    def R(self) -> float:
+        return self.tree.R.item(self.index)
+
+    @R.setter
+    def R(self, value: float) -> None:
+        self.tree.R[self.index] = value
+
+    @property
+    def B(self) -> float:
+        return self.tree.B.item(self.index)
+
+    @B.setter
+    def B(self, value: float) -> None:
+        self.tree.B[self.index] = value
+
+    @property
+    def h(self) -> int:
+        return self.tree.depth.item(self.index)
+
+    @property
+    def max_depth(self) -> Union[int, float]:
+        return self.tree.max_depth
+
+    @property
+    def split_dimension(self) -> int:
+        return self.tree.split_dimension.item(self.index)
+
+    @property
+    def parent(self) -> Optional[ArrayHOONode]:
+        parent = self.tree.parent.item(self.index)
+        return ArrayHOONode(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List[ArrayHOONode]:
+        child = self.tree.child.item(self.index)
+
+        if child < 0:
+            return []
+
+        return [ArrayHOONode(self.tree, child),
+                ArrayHOONode(self.tree, child + 1)]
+
+    @property
+    def action_space(self) -> HOOActionSpace:
+        return HOOActionSpace.from_arrays(
+            self.tree.low[self.index].copy(),
+            self.tree.high[self.index].copy(),
+        )
+
+    @property
+    def dimension(self) -> int:
+        return self.tree.dim
+
+    @property
+    def low(self) -> List[float]:
+        return self.tree.low[self.index].tolist()
+
+    @property
+    def high(self) -> List[float]:
+        return self.tree.high[self.index].tolist()
+
+    @property
+    def center(self) -> List[float]:
+        return (
+            (self.tree.low[self.index] + self.tree.high[self.index]) / 2.0
+        ).tolist()
+
+    @property
+    def key(self) -> int:
+        return self.index
+
+    def is_max_depth(self) -> bool:
+        return self.h == self.max_depth
+
+    def leaf(self) -> bool:
+        return self.tree.child.item(self.index) < 0 or self.is_max_depth()
+
+    def root(self) -> bool:
+        return self.index == 0
+
+    def sample(self) -> List[float]:
+        low = self.tree.low[self.index]
+        high = self.tree.high[self.index]
+
+        if self.tree.rng is not None:
+            return self.tree.rng.uniform(low, high - low)
+
+        # Same draws and values as one rnd.uniform call per dimension
+        return (low + (high - low) * rnd.random_sample(len(low))).tolist()
+
+    def generate_children(self) -> None:
+        if self.tree.child.item(self.index) < 0:
+            self.tree.generate_children(self.index)
+
+    def choose_child(self) -> ArrayHOONode:
+        """
+        Randomly chooses from the children nodes that have the highest
+        B-value
+
+        Returns:
+            The selected children node
+        """
+        child = self.tree.child.item(self.index)
+        lower_B = self.tree.B.item(child)
+        upper_B = self.tree.B.item(child + 1)
+
+        if lower_B > upper_B:
+            best_children = [child]
+        elif upper_B > lower_B:
+            best_children = [child + 1]
+        else:
+            best_children = [child, child + 1]
+
+        if self.tree.rng is None:
+            choice = rnd.choice(len(best_children))
+        elif len(best_children) == 1:
+            choice = 0
+        else:
+            choice = self.tree.rng.integer(len(best_children))
+
+        return ArrayHOONode(self.tree, best_children[choice])
+
+    def average_reward(self, v1, rho) -> float:
+        """
+        Calculates the average reward of the node
+
+        Return:
+            Average reward
+        """
+        if self.N != 0:
+            return self.R / self.N - v1 * (rho**self.h)
+        else:
+            return -float("inf")
@@ -0,0 +1,104 @@
+"""
+Benchmark of the per-iteration cost of the B-value update of HOO as the tree
+grows, comparing the exact update with the path-only (lazy) update
+
+Usage:
+    python -m hoo.benchmarks.b_update -n 20000 -s 0.05
+"""
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from hoo.hoo import HOO
+from hoo.environments.test_function import TestFunction
+from hoo.state_actions.hoo_state import HOOState
+
+
+def time_iterations(
+    hoo: HOO,
+    n: int,
+    checkpoints: List[int],
+    window: int = 100,
+) -> Dict[int, float]:
+    """
+    Runs n iterations of HOO and measures the mean time of an iteration
+    around each checkpoint
+
+    Args:
+        hoo: an instance of HOO (or one of its variants)
+        n: total number of iterations
+        checkpoints: iterations at which the cost is measured
+        window: number of iterations averaged at each checkpoint
+    Returns:
+        A dictionary with the mean time (in seconds) of an iteration at each
+            checkpoint
+    """
+    costs = {}
+    start = None
+
+    for t in range(1, n + 1):
+        if t + window in checkpoints:
+            start = time.perf_counter()
+
+        selected_node = hoo.generate_path()
+        reward = hoo.state.simulate(selected_node.sample()).reward
+        hoo.backpropagate(reward, t)
+
+        if t in checkpoints and start is not None:
+            costs[t] = (time.perf_counter() - start) / window
+
+    return costs
+
+
+def run_benchmark(n: int, staleness: float, seed: int = 0) -> None:
+
+    state = HOOState(TestFunction())
+    checkpoints = [c for c in [500, 1000, 2000, 5000, 10000, 20000, 50000,
+                               100000] if c <= n]
+
+    print(f"{'iteration':>10} {'exact (ms)':>12} {'lazy (ms)':>12}")
+
+    np.random.seed(seed)
+    exact_costs = time_iterations(HOO(state), n, checkpoints)
+
+    np.random.seed(seed)
+    lazy_costs = time_iterations(HOO(state, staleness=staleness), n, checkpoints)
+
+    for t in checkpoints:
+        print(
+            f"{t:>10} {1e3 * exact_costs[t]:>12.4f} "
+            f"{1e3 * lazy_costs[t]:>12.4f}"
+        )
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the B-value update of HOO"
+    )
+
+    parser.add_argument(
+        "-n",
+        "--n_iter",
+        type=int,
+        default=10000,
+        help="Number of iterations of HOO. Default: 10000",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--staleness",
+        type=float,
+        default=0.05,
+        help="Staleness of the lazy update. Default: 0.05",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    run_benchmark(args.n_iter, args.staleness)
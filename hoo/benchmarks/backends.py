@@ -0,0 +1,118 @@
+"""
+Benchmark of the memory and throughput of the object and array backends of
+the HOO trees (and of the flat backend of tHOO)
+
+Usage:
+    python -m hoo.benchmarks.backends -n 1000 10000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Dict, List
+
+import numpy as np
+
+from hoo.hoo import HOO
+from hoo.ld_hoo import LDHOO
+from hoo.poly_hoo import PolyHOO
+from hoo.truncated_hoo import tHOO
+from hoo.environments.test_function import TestFunction
+from hoo.state_actions.hoo_state import HOOState
+
+
+ALGORITHMS = {
+    "hoo": lambda state, backend: HOO(state, backend=backend),
+    "t_hoo": lambda state, backend: tHOO(state, backend=backend),
+    "ld_hoo": lambda state, backend: LDHOO(state, 20, backend=backend),
+    "poly_hoo": lambda state, backend: PolyHOO(state, 20, backend=backend),
+}
+
+ALGORITHM_BACKENDS = {
+    "hoo": HOO.backends,
+    "t_hoo": tHOO.backends,
+    "ld_hoo": LDHOO.backends,
+    "poly_hoo": PolyHOO.backends,
+}
+
+
+def measure(algorithm: str, backend: str, n: int, seed: int = 0) -> Dict:
+    """
+    Runs an algorithm and measures its throughput and the memory of its tree
+
+    Args:
+        algorithm: name of the algorithm in ALGORITHMS
+        backend: backend of the tree
+        n: number of iterations
+        seed: random seed
+    Returns:
+        A dictionary with the iterations per second and the memory (in bytes)
+            allocated while running the algorithm
+    """
+    state = HOOState(TestFunction())
+    np.random.seed(seed)
+
+    tracemalloc.start()
+    hoo = ALGORITHMS[algorithm](state, backend)
+    hoo.run(n)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    np.random.seed(seed)
+    hoo = ALGORITHMS[algorithm](state, backend)
+    start = time.perf_counter()
+    hoo.run(n)
+    elapsed = time.perf_counter() - start
+
+    return {"iter_per_sec": n / elapsed, "memory": memory}
+
+
+def run_benchmark(algorithms: List[str], sizes: List[int]) -> None:
+
+    print(
+        f"{'algorithm':>10} {'iterations':>10} {'backend':>8} "
+        f"{'iter/s':>10} {'memory (MB)':>12}"
+    )
+
+    for algorithm in algorithms:
+        for n in sizes:
+            for backend in ALGORITHM_BACKENDS[algorithm]:
+                result = measure(algorithm, backend, n)
+                print(
+                    f"{algorithm:>10} {n:>10} {backend:>8} "
+                    f"{result['iter_per_sec']:>10.1f} "
+                    f"{result['memory'] / 2**20:>12.2f}"
+                )
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the backends of the HOO trees"
+    )
+
+    parser.add_argument(
+        "-a",
+        "--algorithms",
+        type=str,
+        nargs="+",
+        default=list(ALGORITHMS),
+        choices=list(ALGORITHMS),
+        help=f"Algorithms to be run. Default: {list(ALGORITHMS)}",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 5000],
+        help="Numbers of iterations (tree sizes). Default: [1000, 5000]",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    run_benchmark(args.algorithms, args.sizes)
@@ -0,0 +1,127 @@
+"""
+Benchmark of the throughput of the batched environment steps against the
+scalar steps, for several batch sizes
+
+The next states and rewards of both are also compared, to check that the
+batched dynamics match the scalar ones bit for bit.
+
+Usage:
+    python -m hoo.benchmarks.batch_step -b 1 10 100 1000
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from hoo.environments.environment import Environment
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT
+
+
+def random_states(env: Environment, batch_size: int) -> np.ndarray:
+    """
+    Generates states reachable by the environment by stepping it with random
+    actions from random resets
+    """
+    action_space = env.hoo_action_space
+    states = []
+
+    for i in range(batch_size):
+        env.reset(seed=i)
+
+        for _ in range(i % 20):
+            env.step([float(x) for x in action_space.sample()])
+
+        states.append(np.array(env.state))
+
+    return np.stack(states)
+
+
+def scalar_steps(env: Environment, states: np.ndarray, actions: np.ndarray):
+    """Steps each state with the scalar step of the environment"""
+    next_states = []
+    rewards = []
+    dones = []
+
+    for state, action in zip(states, actions):
+        env.state = state.copy()
+        output = env.step(action.tolist())
+        next_states.append(np.array(env.state))
+        rewards.append(output.reward)
+        dones.append(output.done)
+
+    return np.stack(next_states), np.array(rewards), np.array(dones)
+
+
+def run_benchmark(environments: List[str], batch_sizes: List[int]) -> None:
+
+    print(
+        f"{'environment':>22} {'batch':>6} {'scalar (steps/s)':>17} "
+        f"{'batch (steps/s)':>16} {'match':>6}"
+    )
+
+    for name in environments:
+        env = STR_TO_ENVIRONMENT[name](seed=0)
+
+        for batch_size in batch_sizes:
+            states = random_states(env, batch_size)
+            rng = np.random.default_rng(batch_size)
+            actions = rng.uniform(
+                env.hoo_action_space.low,
+                env.hoo_action_space.high,
+                size=(batch_size, env.hoo_action_space.dim),
+            )
+
+            start = time.perf_counter()
+            scalar_output = scalar_steps(env, states, actions)
+            scalar_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch_output = env.step_batch(states, actions)
+            batch_time = time.perf_counter() - start
+
+            match = (
+                np.array_equal(scalar_output[0], batch_output.next_states)
+                and np.array_equal(scalar_output[1], batch_output.rewards)
+                and np.array_equal(scalar_output[2], batch_output.dones)
+            )
+
+            print(
+                f"{name:>22} {batch_size:>6} "
+                f"{batch_size / scalar_time:>17.0f} "
+                f"{batch_size / batch_time:>16.0f} {str(match):>6}"
+            )
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the batched environment steps"
+    )
+
+    parser.add_argument(
+        "-e",
+        "--environments",
+        type=str,
+        nargs="+",
+        default=list(STR_TO_ENVIRONMENT),
+        choices=list(STR_TO_ENVIRONMENT),
+        help="Environments to be benchmarked. Default: all",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--batch_sizes",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100, 1000],
+        help="Batch sizes. Default: [1, 10, 100, 1000]",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    run_benchmark(args.environments, args.batch_sizes)
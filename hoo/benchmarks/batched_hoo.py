@@ -0,0 +1,127 @@
+"""
+Benchmark of the batched HOO iterations against the sequential ones, for
+several batch sizes
+
+For each batch size, HOO is run from the initial state of each environment
+(or on each benchmark function) and the running time and the reward of the
+recommended action are reported.
+
+Usage:
+    python -m hoo.benchmarks.batched_hoo -n 1000 -b 1 8 32
+    python -m hoo.benchmarks.batched_hoo -e -f branin hartmann6
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from hoo.hoo import HOO
+from hoo.environments.benchmark_functions import BENCHMARK_FUNCTIONS
+from hoo.environments.test_function import TestFunction
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT
+from hoo.state_actions.hoo_state import HOOState
+
+
+def run_benchmark(
+    environments: List[str],
+    functions: List[str],
+    n: int,
+    batch_sizes: List[int],
+    seed: int,
+) -> None:
+
+    print(
+        f"{'environment':>22} {'batch':>6} {'time (s)':>9} "
+        f"{'iterations/s':>13} {'reward':>10}"
+    )
+
+    for name in environments + functions:
+        for batch_size in [None] + batch_sizes:
+            np.random.seed(seed)
+            state = HOOState(
+                TestFunction.from_benchmark(name) if name in functions
+                else STR_TO_ENVIRONMENT[name](seed=seed)
+            )
+            hoo = HOO(state)
+
+            start = time.perf_counter()
+            if batch_size is None:
+                action = hoo.run(n, sample=False)
+            else:
+                action = hoo.run_batched(n, batch_size, sample=False)
+            elapsed = time.perf_counter() - start
+
+            reward = state.simulate(action).reward
+            label = "seq" if batch_size is None else str(batch_size)
+
+            print(
+                f"{name:>22} {label:>6} {elapsed:>9.3f} "
+                f"{n / elapsed:>13.0f} {reward:>10.4f}"
+            )
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark of the batched HOO iterations"
+    )
+
+    parser.add_argument(
+        "-e",
+        "--environments",
+        type=str,
+        nargs="*",
+        default=list(STR_TO_ENVIRONMENT),
+        choices=list(STR_TO_ENVIRONMENT),
+        help="Environments to be benchmarked. Default: all",
+    )
+
+    parser.add_argument(
+        "-f",
+        "--functions",
+        type=str,
+        nargs="*",
+        default=[],
+        choices=list(BENCHMARK_FUNCTIONS),
+        help="Benchmark functions to be benchmarked. Default: none",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--n_iterations",
+        type=int,
+        default=1000,
+        help="Number of HOO iterations. Default: 1000",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--batch_sizes",
+        type=int,
+        nargs="+",
+        default=[1, 8, 32],
+        help="Batch sizes. Default: [1, 8, 32]",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed. Default: 0",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    run_benchmark(
+        args.environments,
+        args.functions,
+        args.n_iterations,
+        args.batch_sizes,
+        args.seed,
+    )
@@ -0,0 +1,166 @@
+"""
+Benchmark of the decision quality and wall-time of root-parallel HOOT as a
+function of the number of worker processes
+
+Each configuration plays a short episode for several seeds. The quality is
+the mean (undiscounted) return of the episode and the wall-time is the mean
+time per decision. Every worker runs algorithm_iter iterations, so the total
+number of iterations per decision grows with the number of workers.
+
+Usage:
+    python -m hoo.benchmarks.root_parallel -e cartpole -w 1 2 4
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from hoo.experiments.run_configs import (HOOTRunConfigs,
+                                         LDHOOTRunConfigs,
+                                         PolyHOOTRunConfigs)
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT, generate_hoot_path
+
+
+CONFIGS = {
+    "hoot": HOOTRunConfigs,
+    "ld_hoot": LDHOOTRunConfigs,
+    "poly_hoot": PolyHOOTRunConfigs,
+}
+
+
+def run_benchmark(
+    algorithm: str,
+    environment: str,
+    workers: List[int],
+    seeds: int,
+    n_actions: int,
+    search_depth: int,
+    algorithm_iter: int,
+    hoo_max_depth: int,
+) -> None:
+
+    print(
+        f"{'workers':>8} {'mean return':>12} {'std return':>11} "
+        f"{'s/decision':>11}"
+    )
+
+    extra_configs = {} if algorithm == "hoot" else {
+        "hoo_max_depth": hoo_max_depth
+    }
+
+    for n_workers in workers:
+        returns = []
+        times = []
+
+        for seed in range(seeds):
+            configs = CONFIGS[algorithm](
+                environment=environment,
+                n_actions=n_actions,
+                search_depth=search_depth,
+                algorithm_iter=algorithm_iter,
+                seed=seed,
+                n_workers=n_workers,
+                **extra_configs,
+            )
+
+            start = time.perf_counter()
+            output = generate_hoot_path(configs)
+            times.append((time.perf_counter() - start) / n_actions)
+            returns.append(sum(output["rewards"]))
+
+        print(
+            f"{n_workers:>8} {np.mean(returns):>12.3f} "
+            f"{np.std(returns):>11.3f} {np.mean(times):>11.4f}"
+        )
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark of root-parallel HOOT"
+    )
+
+    parser.add_argument(
+        "-a",
+        "--algorithm",
+        type=str,
+        default="hoot",
+        choices=list(CONFIGS),
+        help="Algorithm to be run. Default: hoot",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--environment",
+        type=str,
+        default="cartpole",
+        choices=list(STR_TO_ENVIRONMENT),
+        help="Environment for the run. Default: cartpole",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="Numbers of worker processes. Default: [1, 2, 4]",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--seeds",
+        type=int,
+        default=3,
+        help="Number of random seeds. Default: 3",
+    )
+
+    parser.add_argument(
+        "-na",
+        "--n_actions",
+        type=int,
+        default=10,
+        help="Number of consecutive actions to run. Default: 10",
+    )
+
+    parser.add_argument(
+        "-sd",
+        "--search_depth",
+        type=int,
+        default=20,
+        help="Action search depth. Default: 20",
+    )
+
+    parser.add_argument(
+        "-it",
+        "--algorithm_iter",
+        type=int,
+        default=100,
+        help="Number of iterations per worker. Default: 100",
+    )
+
+    parser.add_argument(
+        "-hd",
+        "--hoo_max_depth",
+        type=int,
+        default=10,
+        help="Maximum depth of HOO (for LD-HOOT and Poly-HOOT). Default: 10",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    run_benchmark(
+        args.algorithm,
+        args.environment,
+        args.workers,
+        args.seeds,
+        args.n_actions,
+        args.search_depth,
+        args.algorithm_iter,
+        args.hoo_max_depth,
+    )
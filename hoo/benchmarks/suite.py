@@ -0,0 +1,438 @@
+"""
+Throughput benchmark suite of the HOO and HOOT variants
+
+The bandit cases run HOO, tHOO, LD-HOO and Poly-HOO on test functions of
+several dimensions for several numbers of iterations (tree sizes), and
+measure iterations per second and peak memory. The planning cases run HOOT,
+LD-HOOT and Poly-HOOT on every environment for several search depths and
+numbers of iterations, and measure wall-time per decision, iterations per
+second and peak memory.
+
+The results are written to a JSON file, which can be compared against a
+stored baseline: cases that got slower (or use more memory) by more than the
+tolerance are reported and the script exits with status 1.
+
+Timings are the best of --repeats runs, to reduce the noise. Peak memory is
+measured with tracemalloc in a separate run, as tracing slows down the
+allocations. Use --skip_memory to leave it out.
+
+Usage:
+    python -m hoo.benchmarks.suite -o baseline.json
+    python -m hoo.benchmarks.suite -o new.json -b baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from hoo.hoo import HOO
+from hoo.ld_hoo import LDHOO
+from hoo.poly_hoo import PolyHOO
+from hoo.truncated_hoo import tHOO
+from hoo.environments.test_function import TestFunction
+from hoo.experiments.run_configs import (HOOTRunConfigs,
+                                         LDHOOTRunConfigs,
+                                         PolyHOOTRunConfigs)
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT, generate_hoot_path
+from hoo.state_actions.hoo_state import HOOState
+
+
+BANDIT_ALGORITHMS = ["hoo", "thoo", "ld_hoo", "poly_hoo"]
+
+PLANNING_ALGORITHMS = ["hoot", "ld_hoot", "poly_hoot"]
+
+# Test function used for each dimension of the bandit cases
+DIMENSION_TO_FUNCTION = {
+    1: None,
+    2: "branin",
+    3: "hartmann3",
+    4: "rosenbrock",
+    6: "hartmann6",
+}
+
+HOO_MAX_DEPTH = 10
+
+CONFIGS = {
+    "hoot": HOOTRunConfigs,
+    "ld_hoot": LDHOOTRunConfigs,
+    "poly_hoot": PolyHOOTRunConfigs,
+}
+
+# Metrics compared against the baseline and whether higher is better
+METRICS = {
+    "iterations_per_second": True,
+    "seconds_per_decision": False,
+    "peak_memory_mb": False,
+}
+
+
+def new_bandit(algorithm: str, dimension: int) -> HOO:
+    """
+    Initializes a bandit algorithm on the test function of a dimension
+    """
+    function = DIMENSION_TO_FUNCTION[dimension]
+    state = HOOState(
+        TestFunction() if function is None
+        else TestFunction.from_benchmark(function)
+    )
+
+    if algorithm == "hoo":
+        return HOO(state)
+    if algorithm == "thoo":
+        return tHOO(state)
+    if algorithm == "ld_hoo":
+        return LDHOO(state, HOO_MAX_DEPTH)
+
+    return PolyHOO(state, HOO_MAX_DEPTH)
+
+
+def peak_memory(function: Callable) -> float:
+    """
+    Runs a function under tracemalloc
+
+    Returns:
+        The peak memory allocated during the run (in MB)
+    """
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 2**20
+
+
+def bandit_case(
+    algorithm: str,
+    dimension: int,
+    n: int,
+    seed: int,
+    repeats: int,
+    memory: bool,
+) -> Dict:
+    """
+    Measures a bandit algorithm running n iterations on the test function of
+    a dimension
+    """
+    def run():
+        np.random.seed(seed)
+        new_bandit(algorithm, dimension).run(n)
+
+    elapsed = float("inf")
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    return {
+        "name": f"{algorithm}/dim={dimension}/n={n}",
+        "iterations_per_second": n / elapsed,
+        "peak_memory_mb": peak_memory(run) if memory else None,
+    }
+
+
+def planning_case(
+    algorithm: str,
+    environment: str,
+    search_depth: int,
+    algorithm_iter: int,
+    n_actions: int,
+    seed: int,
+    repeats: int,
+    memory: bool,
+) -> Dict:
+    """
+    Measures a planning algorithm taking n_actions decisions in an
+    environment
+    """
+    extra_configs = {} if algorithm == "hoot" else {
+        "hoo_max_depth": HOO_MAX_DEPTH
+    }
+
+    def run(n_actions):
+        configs = CONFIGS[algorithm](
+            environment=environment,
+            n_actions=n_actions,
+            search_depth=search_depth,
+            algorithm_iter=algorithm_iter,
+            seed=seed,
+            **extra_configs,
+        )
+        return generate_hoot_path(configs, progress=False)
+
+    seconds_per_decision = min(
+        run(n_actions)["running_time"] / n_actions for _ in range(repeats)
+    )
+
+    return {
+        "name": (
+            f"{algorithm}/{environment}/depth={search_depth}"
+            f"/iter={algorithm_iter}"
+        ),
+        "iterations_per_second": algorithm_iter / seconds_per_decision,
+        "seconds_per_decision": seconds_per_decision,
+        "peak_memory_mb": peak_memory(lambda: run(1)) if memory else None,
+    }
+
+
+def run_suite(args: argparse.Namespace) -> Dict:
+
+    results = []
+
+    if args.suite in ["bandit", "all"]:
+        for algorithm in args.bandit_algorithms:
+            for dimension in args.dimensions:
+                for n in args.tree_sizes:
+                    result = bandit_case(
+                        algorithm, dimension, n, args.seed, args.repeats,
+                        not args.skip_memory,
+                    )
+                    print_result(result)
+                    results.append(result)
+
+    if args.suite in ["planning", "all"]:
+        for algorithm in args.planning_algorithms:
+            for environment in args.environments:
+                for search_depth in args.search_depths:
+                    for algorithm_iter in args.algorithm_iters:
+                        result = planning_case(
+                            algorithm, environment, search_depth,
+                            algorithm_iter, args.n_actions, args.seed,
+                            args.repeats, not args.skip_memory,
+                        )
+                        print_result(result)
+                        results.append(result)
+
+    return {
+        "metadata": {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+def print_result(result: Dict) -> None:
+
+    metrics = [
+        f"{metric}: {result[metric]:.4g}" for metric in METRICS
+        if result.get(metric) is not None
+    ]
+    print(f"{result['name']:<48} " + "; ".join(metrics))
+
+
+def compare(
+    output: Dict,
+    baseline: Dict,
+    tolerance: float,
+) -> List[str]:
+    """
+    Compares the results of a run against a baseline
+
+    Args:
+        output: the results of the run
+        baseline: the results of the baseline
+        tolerance: relative change of a metric that counts as a regression
+    Returns:
+        The list of regressions found
+    """
+    baseline_results = {
+        result["name"]: result for result in baseline["results"]
+    }
+    regressions = []
+
+    print(f"\n{'case':<48} {'metric':>22} {'baseline':>10} {'new':>10} "
+          f"{'change':>8}")
+
+    for result in output["results"]:
+        baseline_result = baseline_results.get(result["name"])
+
+        if baseline_result is None:
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            new = result.get(metric)
+            old = baseline_result.get(metric)
+
+            if new is None or old is None or old == 0:
+                continue
+
+            change = new / old - 1
+            regression = (
+                change < -tolerance if higher_is_better
+                else change > tolerance
+            )
+
+            print(
+                f"{result['name']:<48} {metric:>22} {old:>10.4g} "
+                f"{new:>10.4g} {100 * change:>7.1f}%"
+                + (" REGRESSION" if regression else "")
+            )
+
+            if regression:
+                regressions.append(f"{result['name']} {metric}")
+
+    return regressions
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Throughput benchmark suite of the HOO and HOOT variants"
+    )
+
+    parser.add_argument(
+        "-s",
+        "--suite",
+        type=str,
+        default="all",
+        choices=["bandit", "planning", "all"],
+        help="Cases to be run. Default: all",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="JSON file where the results are written. Default: None",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--baseline",
+        type=str,
+        default=None,
+        help="JSON file of a baseline to compare against. Default: None",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Relative change that counts as a regression. Default: 0.1",
+    )
+
+    parser.add_argument(
+        "--bandit_algorithms",
+        type=str,
+        nargs="+",
+        default=BANDIT_ALGORITHMS,
+        choices=BANDIT_ALGORITHMS,
+        help=f"Bandit algorithms. Default: {BANDIT_ALGORITHMS}",
+    )
+
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        nargs="+",
+        default=[1, 2, 6],
+        choices=list(DIMENSION_TO_FUNCTION),
+        help="Dimensions of the test functions. Default: [1, 2, 6]",
+    )
+
+    parser.add_argument(
+        "--tree_sizes",
+        type=int,
+        nargs="+",
+        default=[500, 2000],
+        help="Iterations of the bandit algorithms. Default: [500, 2000]",
+    )
+
+    parser.add_argument(
+        "--planning_algorithms",
+        type=str,
+        nargs="+",
+        default=PLANNING_ALGORITHMS,
+        choices=PLANNING_ALGORITHMS,
+        help=f"Planning algorithms. Default: {PLANNING_ALGORITHMS}",
+    )
+
+    parser.add_argument(
+        "--environments",
+        type=str,
+        nargs="+",
+        default=list(STR_TO_ENVIRONMENT),
+        choices=list(STR_TO_ENVIRONMENT),
+        help="Environments of the planning cases. Default: all",
+    )
+
+    parser.add_argument(
+        "--search_depths",
+        type=int,
+        nargs="+",
+        default=[10, 30],
+        help="Search depths of the planning cases. Default: [10, 30]",
+    )
+
+    parser.add_argument(
+        "--algorithm_iters",
+        type=int,
+        nargs="+",
+        default=[50, 200],
+        help=(
+            "Iterations per decision of the planning cases. "
+            "Default: [50, 200]"
+        ),
+    )
+
+    parser.add_argument(
+        "--n_actions",
+        type=int,
+        default=3,
+        help="Decisions timed in each planning case. Default: 3",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed. Default: 0",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=3,
+        help="Runs of each case whose best time is kept. Default: 3",
+    )
+
+    parser.add_argument(
+        "--skip_memory",
+        default=False,
+        action="store_true",
+        help="If True peak memory is not measured. Default: False",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+    output = run_suite(args)
+
+    if args.output is not None:
+        with open(args.output, "w") as jfile:
+            json.dump(output, jfile, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as jfile:
+            baseline = json.load(jfile)
+
+        regressions = compare(output, baseline, args.tolerance)
+
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) found")
+            sys.exit(1)
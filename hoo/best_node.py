@@ -0,0 +1,135 @@
+"""
+Module that implements an incremental tracker of the best node of a HOO tree
+
+HOO.choose_best_node walks the whole tree to find the node with the highest
+average reward. As the average reward of a node only changes when the node is
+in a backpropagated path, the tracker keeps the nodes in a max-heap that is
+updated with the nodes of each path. Entries whose node changed since they
+were pushed are discarded lazily, when they reach the top of the heap.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from hoo.hoo_node import HOONode
+
+
+class HeapEntry:
+    """
+    Entry of the max-heap of the tracker, ordered by average reward and then
+    by the position of the node in a pre-order traversal of the tree
+    """
+
+    __slots__ = ("average", "code", "node")
+
+    def __init__(
+        self,
+        average: float,
+        code: Tuple[int, ...],
+        node: HOONode,
+    ) -> None:
+        self.average = average
+        self.code = code
+        self.node = node
+
+    def __lt__(self, other: HeapEntry) -> bool:
+        # heapq is a min-heap, so the order is reversed
+        return (self.average, self.code) > (other.average, other.code)
+
+
+class BestNodeTracker:
+
+    def __init__(self, v1: float, rho: float) -> None:
+        """
+        Initializes an empty tracker
+
+        Args:
+            v1: parameter v1 of the HOO tree
+            rho: parameter rho of the HOO tree
+        """
+        self.v1 = v1
+        self.rho = rho
+
+        self.heap: List[HeapEntry] = []
+
+        # Child positions (0 or 1) from the root to each tracked node, which
+        # order the nodes in pre-order
+        self.codes: Dict[HOONode, Tuple[int, ...]] = {}
+
+    def code(self, node: HOONode) -> Tuple[int, ...]:
+        """
+        Computes the sequence of child positions from the root to a node
+
+        Args:
+            node: a node of the tree
+        Returns:
+            The tuple of child positions
+        """
+        # Walk up to the closest ancestor with a known code
+        missing = []
+
+        while node not in self.codes:
+            if node.parent is None:
+                self.codes[node] = ()
+                break
+
+            missing.append(node)
+            node = node.parent
+
+        code = self.codes[node]
+
+        for node in reversed(missing):
+            code = code + (node.parent.children.index(node),)
+            self.codes[node] = code
+
+        return code
+
+    def update(self, nodes: Iterable[HOONode]) -> None:
+        """
+        Pushes the current average reward of nodes whose statistics changed
+
+        Args:
+            nodes: the updated nodes (e.g. a backpropagated path)
+        """
+        for node in nodes:
+            if node.N > 0:
+                heapq.heappush(
+                    self.heap,
+                    HeapEntry(
+                        node.average_reward(self.v1, self.rho),
+                        self.code(node),
+                        node,
+                    ),
+                )
+
+        # Rebuild the heap when the stale entries outnumber the nodes
+        if len(self.heap) > 2 * len(self.codes) + 64:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        self.heap = [
+            HeapEntry(node.average_reward(self.v1, self.rho), code, node)
+            for node, code in self.codes.items() if node.N > 0
+        ]
+        heapq.heapify(self.heap)
+
+    def best(self) -> Optional[HOONode]:
+        """
+        Returns:
+            The visited node with the highest average reward (the last one in
+                pre-order among ties), or None if no node was visited
+        """
+        while self.heap:
+            entry = self.heap[0]
+            node = entry.node
+
+            if (
+                node.N > 0
+                and node.average_reward(self.v1, self.rho) == entry.average
+            ):
+                return node
+
+            heapq.heappop(self.heap)
+
+        return None
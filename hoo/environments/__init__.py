@@ -1,3 +1,5 @@
+from hoo.environments.benchmark_functions import (BENCHMARK_FUNCTIONS,
+                                                  BenchmarkFunction)
 from hoo.environments.environment import Environment
 from hoo.environments.cartpole import ContinuousCartPole
 from hoo.environments.inverted_pendulum import InvertedPendulum
@@ -5,6 +7,8 @@ from hoo.environments.test_function import TestFunction
 
 
 __all__ = [
+    "BENCHMARK_FUNCTIONS",
+    "BenchmarkFunction",
     "Environment",
     "ContinuousCartPole",
     "InvertedPendulum",
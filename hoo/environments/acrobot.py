@@ -16,12 +16,17 @@ from gym import spaces
 from gym.envs.classic_control import AcrobotEnv
 from gym.envs.classic_control.acrobot import bound, rk4, wrap
 
-from hoo.environments.environment import Environment, StepOutput
+from hoo.environments.environment import (BatchStepOutput,
+                                          Environment,
+                                          StepOutput)
 from hoo.state_actions.action_space import HOOActionSpace
 
 
 class ContinuousAcrobot(AcrobotEnv, Environment):
 
+    supports_snapshot = True
+    supports_batch = True
+
     def __init__(
         self,
         render_mode: Optional[str] = None,
@@ -71,9 +76,174 @@ class ContinuousAcrobot(AcrobotEnv, Environment):
             done=terminated,
         )
 
+    def _dsdt(self, s_augmented):
+        # Same derivatives as AcrobotEnv._dsdt, with the squares of the
+        # state computed as products, as in _dsdt_batch
+        m1 = self.LINK_MASS_1
+        m2 = self.LINK_MASS_2
+        l1 = self.LINK_LENGTH_1
+        lc1 = self.LINK_COM_POS_1
+        lc2 = self.LINK_COM_POS_2
+        I1 = self.LINK_MOI
+        I2 = self.LINK_MOI
+        g = 9.8
+        a = s_augmented[-1]
+        s = s_augmented[:-1]
+        theta1 = s[0]
+        theta2 = s[1]
+        dtheta1 = s[2]
+        dtheta2 = s[3]
+        d1 = (
+            m1 * lc1**2
+            + m2 * (l1**2 + lc2**2 + 2 * l1 * lc2 * np.cos(theta2))
+            + I1
+            + I2
+        )
+        d2 = m2 * (lc2**2 + l1 * lc2 * np.cos(theta2)) + I2
+        phi2 = m2 * lc2 * g * np.cos(theta1 + theta2 - np.pi / 2.0)
+        phi1 = (
+            -m2 * l1 * lc2 * (dtheta2 * dtheta2) * np.sin(theta2)
+            - 2 * m2 * l1 * lc2 * dtheta2 * dtheta1 * np.sin(theta2)
+            + (m1 * lc1 + m2 * l1) * g * np.cos(theta1 - np.pi / 2)
+            + phi2
+        )
+        if self.book_or_nips == "nips":
+            ddtheta2 = (a + d2 / d1 * phi1 - phi2) / (
+                m2 * lc2**2 + I2 - (d2 * d2) / d1
+            )
+        else:
+            ddtheta2 = (
+                a
+                + d2 / d1 * phi1
+                - m2 * l1 * lc2 * (dtheta1 * dtheta1) * np.sin(theta2)
+                - phi2
+            ) / (m2 * lc2**2 + I2 - (d2 * d2) / d1)
+        ddtheta1 = -(d2 * ddtheta2 + phi1) / d1
+
+        return dtheta1, dtheta2, ddtheta1, ddtheta2, 0.0
+
     @property
     def hoo_action_space(self):
         return HOOActionSpace([(-1.0, 1.0)])
+
+    @property
+    def deterministic(self):
+        return self.torque_noise_max == 0
     
     def get_state(self):
         return [float(s) for s in self.state]
+
+    def snapshot(self):
+        # The RNG is only used by step to add noise to the torque
+        if self.torque_noise_max > 0:
+            return self.state.copy(), self.np_random.bit_generator.state
+
+        return self.state.copy(), None
+
+    def restore(self, snapshot):
+        state, rng_state = snapshot
+        self.state = state.copy()
+
+        if rng_state is not None:
+            self.np_random.bit_generator.state = rng_state
+
+    def step_batch(self, states, actions):
+        """
+        Steps a batch of states with the same RK4 integration as step
+
+        If torque noise is enabled, one noise value per state is drawn from
+        the environment's RNG.
+        """
+        states = np.asarray(states, dtype=np.float64)
+        torque = np.asarray(actions, dtype=np.float64)[:, 0]
+
+        if self.torque_noise_max > 0:
+            torque = torque + self.np_random.uniform(
+                -self.torque_noise_max, self.torque_noise_max, size=len(torque)
+            )
+
+        s_augmented = np.concatenate([states, torque[:, None]], axis=1)
+
+        dt = self.dt
+        dt2 = dt / 2.0
+        k1 = self._dsdt_batch(s_augmented)
+        k2 = self._dsdt_batch(s_augmented + dt2 * k1)
+        k3 = self._dsdt_batch(s_augmented + dt2 * k2)
+        k4 = self._dsdt_batch(s_augmented + dt * k3)
+        ns = (s_augmented + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4))[:, :4]
+
+        ns[:, 0] = self._wrap_batch(ns[:, 0], -np.pi, np.pi)
+        ns[:, 1] = self._wrap_batch(ns[:, 1], -np.pi, np.pi)
+        ns[:, 2] = np.minimum(
+            np.maximum(ns[:, 2], -self.MAX_VEL_1), self.MAX_VEL_1
+        )
+        ns[:, 3] = np.minimum(
+            np.maximum(ns[:, 3], -self.MAX_VEL_2), self.MAX_VEL_2
+        )
+
+        terminated = -np.cos(ns[:, 0]) - np.cos(ns[:, 1] + ns[:, 0]) > 1.0
+
+        return BatchStepOutput(
+            next_states=ns,
+            rewards=np.where(terminated, 0.0, -1.0),
+            dones=terminated,
+        )
+
+    @staticmethod
+    def _wrap_batch(x, m, M):
+        # Same successive additions as gym's wrap, applied elementwise
+        x = x.copy()
+        diff = M - m
+
+        while np.any(x > M):
+            x = np.where(x > M, x - diff, x)
+
+        while np.any(x < m):
+            x = np.where(x < m, x + diff, x)
+
+        return x
+
+    def _dsdt_batch(self, s_augmented):
+        m1 = self.LINK_MASS_1
+        m2 = self.LINK_MASS_2
+        l1 = self.LINK_LENGTH_1
+        lc1 = self.LINK_COM_POS_1
+        lc2 = self.LINK_COM_POS_2
+        I1 = self.LINK_MOI
+        I2 = self.LINK_MOI
+        g = 9.8
+        a = s_augmented[:, -1]
+        theta1 = s_augmented[:, 0]
+        theta2 = s_augmented[:, 1]
+        dtheta1 = s_augmented[:, 2]
+        dtheta2 = s_augmented[:, 3]
+        d1 = (
+            m1 * lc1**2
+            + m2 * (l1**2 + lc2**2 + 2 * l1 * lc2 * np.cos(theta2))
+            + I1
+            + I2
+        )
+        d2 = m2 * (lc2**2 + l1 * lc2 * np.cos(theta2)) + I2
+        phi2 = m2 * lc2 * g * np.cos(theta1 + theta2 - np.pi / 2.0)
+        phi1 = (
+            -m2 * l1 * lc2 * (dtheta2 * dtheta2) * np.sin(theta2)
+            - 2 * m2 * l1 * lc2 * dtheta2 * dtheta1 * np.sin(theta2)
+            + (m1 * lc1 + m2 * l1) * g * np.cos(theta1 - np.pi / 2)
+            + phi2
+        )
+        if self.book_or_nips == "nips":
+            ddtheta2 = (a + d2 / d1 * phi1 - phi2) / (
+                m2 * lc2**2 + I2 - (d2 * d2) / d1
+            )
+        else:
+            ddtheta2 = (
+                a
+                + d2 / d1 * phi1
+                - m2 * l1 * lc2 * (dtheta1 * dtheta1) * np.sin(theta2)
+                - phi2
+            ) / (m2 * lc2**2 + I2 - (d2 * d2) / d1)
+        ddtheta1 = -(d2 * ddtheta2 + phi1) / d1
+
+        return np.stack(
+            (dtheta1, dtheta2, ddtheta1, ddtheta2, np.zeros_like(a)), axis=1
+        )
@@ -0,0 +1,206 @@
+"""
+Module with standard multi-dimensional benchmark functions for optimization
+
+The functions are written with NumPy ufuncs over the last axis of x, so they
+evaluate a single point of shape (dim,) or a batch of points of shape
+(B, dim) at once. As HOO maximizes rewards, each function is the negative of
+its usual (minimization) form, and the optimum is its maximum value.
+
+Sources of the definitions and optima:
+https://www.sfu.ca/~ssurjano/optimization.html
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class BenchmarkFunction:
+
+    function: Callable
+    domain: List[Tuple[float, float]]
+    optimum: float
+    maximizers: List[List[float]]
+
+    @property
+    def dim(self) -> int:
+        return len(self.domain)
+
+
+def branin(x):
+    x1 = x[..., 0]
+    x2 = x[..., 1]
+
+    b = 5.1 / (4 * np.pi**2)
+    c = 5 / np.pi
+    t = 1 / (8 * np.pi)
+
+    return -(
+        (x2 - b * x1 * x1 + c * x1 - 6)**2
+        + 10 * (1 - t) * np.cos(x1)
+        + 10
+    )
+
+
+def six_hump_camel(x):
+    x1 = x[..., 0]
+    x2 = x[..., 1]
+
+    return -(
+        (4 - 2.1 * x1**2 + x1**4 / 3) * x1**2
+        + x1 * x2
+        + (-4 + 4 * x2**2) * x2**2
+    )
+
+
+def goldstein_price(x):
+    x1 = x[..., 0]
+    x2 = x[..., 1]
+
+    a = 1 + (x1 + x2 + 1)**2 * (
+        19 - 14 * x1 + 3 * x1**2 - 14 * x2 + 6 * x1 * x2 + 3 * x2**2
+    )
+    b = 30 + (2 * x1 - 3 * x2)**2 * (
+        18 - 32 * x1 + 12 * x1**2 + 48 * x2 - 36 * x1 * x2 + 27 * x2**2
+    )
+
+    return -a * b
+
+
+HARTMANN_ALPHA = np.array([1.0, 1.2, 3.0, 3.2])
+
+HARTMANN3_A = np.array([
+    [3.0, 10, 30],
+    [0.1, 10, 35],
+    [3.0, 10, 30],
+    [0.1, 10, 35],
+])
+
+HARTMANN3_P = 1e-4 * np.array([
+    [3689, 1170, 2673],
+    [4699, 4387, 7470],
+    [1091, 8732, 5547],
+    [381, 5743, 8828],
+])
+
+HARTMANN6_A = np.array([
+    [10, 3, 17, 3.5, 1.7, 8],
+    [0.05, 10, 17, 0.1, 8, 14],
+    [3, 3.5, 1.7, 10, 17, 8],
+    [17, 8, 0.05, 10, 0.1, 14],
+])
+
+HARTMANN6_P = 1e-4 * np.array([
+    [1312, 1696, 5569, 124, 8283, 5886],
+    [2329, 4135, 8307, 3736, 1004, 9991],
+    [2348, 1451, 3522, 2883, 3047, 6650],
+    [4047, 8828, 8732, 5743, 1091, 381],
+])
+
+
+def hartmann(x, A, P):
+    x = np.asarray(x)[..., np.newaxis, :]
+    exponent = -np.sum(A * (x - P)**2, axis=-1)
+
+    return np.sum(HARTMANN_ALPHA * np.exp(exponent), axis=-1)
+
+
+def hartmann3(x):
+    return hartmann(x, HARTMANN3_A, HARTMANN3_P)
+
+
+def hartmann6(x):
+    return hartmann(x, HARTMANN6_A, HARTMANN6_P)
+
+
+def rosenbrock(x):
+    x = np.asarray(x)
+
+    return -np.sum(
+        100 * (x[..., 1:] - x[..., :-1]**2)**2 + (1 - x[..., :-1])**2,
+        axis=-1,
+    )
+
+
+def ackley(x):
+    x = np.asarray(x)
+    dim = x.shape[-1]
+
+    return -(
+        -20 * np.exp(-0.2 * np.sqrt(np.sum(x**2, axis=-1) / dim))
+        - np.exp(np.sum(np.cos(2 * np.pi * x), axis=-1) / dim)
+        + 20
+        + np.e
+    )
+
+
+def rastrigin(x):
+    x = np.asarray(x)
+    dim = x.shape[-1]
+
+    return -(
+        10 * dim + np.sum(x**2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+    )
+
+
+BENCHMARK_FUNCTIONS: Dict[str, BenchmarkFunction] = {
+    "branin": BenchmarkFunction(
+        function=branin,
+        domain=[(-5., 10.), (0., 15.)],
+        optimum=-0.39788735772973816,
+        maximizers=[
+            [-np.pi, 12.275],
+            [np.pi, 2.275],
+            [3 * np.pi, 2.475],
+        ],
+    ),
+    "six_hump_camel": BenchmarkFunction(
+        function=six_hump_camel,
+        domain=[(-3., 3.), (-2., 2.)],
+        optimum=1.0316284534898774,
+        maximizers=[
+            [0.08984201368301331, -0.7126564032704135],
+            [-0.08984201368301331, 0.7126564032704135],
+        ],
+    ),
+    "goldstein_price": BenchmarkFunction(
+        function=goldstein_price,
+        domain=[(-2., 2.), (-2., 2.)],
+        optimum=-3.,
+        maximizers=[[0., -1.]],
+    ),
+    "hartmann3": BenchmarkFunction(
+        function=hartmann3,
+        domain=[(0., 1.)] * 3,
+        optimum=3.8627797873327094,
+        maximizers=[[0.11461434, 0.55564885, 0.85254695]],
+    ),
+    "hartmann6": BenchmarkFunction(
+        function=hartmann6,
+        domain=[(0., 1.)] * 6,
+        optimum=3.3223680114155147,
+        maximizers=[[
+            0.20168952, 0.15001069, 0.47687398,
+            0.27533243, 0.31165162, 0.65730054,
+        ]],
+    ),
+    "rosenbrock": BenchmarkFunction(
+        function=rosenbrock,
+        domain=[(-2.048, 2.048)] * 4,
+        optimum=0.,
+        maximizers=[[1.] * 4],
+    ),
+    "ackley": BenchmarkFunction(
+        function=ackley,
+        domain=[(-32.768, 32.768)] * 4,
+        optimum=0.,
+        maximizers=[[0.] * 4],
+    ),
+    "rastrigin": BenchmarkFunction(
+        function=rastrigin,
+        domain=[(-5.12, 5.12)] * 4,
+        optimum=0.,
+        maximizers=[[0.] * 4],
+    ),
+}
@@ -1,13 +1,42 @@
 """Module that implements an Environment abstract class"""
 from __future__ import annotations
 
-from typing import List
+import math
+from itertools import repeat
+from typing import Any, List
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 from hoo.state_actions.action_space import HOOActionSpace
 
 
+def scalar_pow(x: np.ndarray, exponent: float) -> np.ndarray:
+    """
+    Elementwise power of a 1-dimensional array computed with the C library
+    pow, which is the one used by Python floats and NumPy scalars
+
+    NumPy's vectorized power can round differently in the last bit, so
+    batched dynamics use this function for non-integer exponents. Squares
+    and cubes are written as products (x * x and x * x * x) in both the
+    scalar and the batched dynamics instead, which round the same without
+    a Python loop (pow is not always correctly rounded, so x**2 and x * x
+    can differ in the last bit).
+
+    Args:
+        x: a 1-dimensional array
+        exponent: a non-integer exponent
+    Returns:
+        An array of float64 with x**exponent
+    """
+    return np.fromiter(
+        map(math.pow, x.tolist(), repeat(exponent)),
+        dtype=np.float64,
+        count=len(x),
+    )
+
+
 @dataclass
 class StepOutput:
 
@@ -15,8 +44,26 @@ class StepOutput:
     done: bool
 
 
+@dataclass
+class BatchStepOutput:
+
+    next_states: np.ndarray
+    rewards: np.ndarray
+    dones: np.ndarray
+
+
 class Environment(ABC):
 
+    # Whether the environment implements snapshot and restore
+    supports_snapshot: bool = False
+
+    # Whether the environment implements step_batch
+    supports_batch: bool = False
+
+    # Whether step always gives the same output from the same state and
+    # action, which allows caching the simulations
+    deterministic: bool = False
+
     @abstractmethod
     def step(self, action, clip_reward: bool) -> StepOutput:
         pass
@@ -29,3 +76,43 @@ class Environment(ABC):
     @abstractmethod
     def get_state(self) -> List:
         pass
+
+    def snapshot(self) -> Any:
+        """
+        Returns a copy of the part of the environment that changes when
+        stepping (physical state and, if used by step, the RNG state)
+
+        Restoring it brings the environment back to the same point, which is
+        much cheaper than deep copying the whole environment.
+        """
+        raise NotImplementedError
+
+    def restore(self, snapshot: Any) -> None:
+        """
+        Restores the environment to a snapshot returned by snapshot
+
+        Args:
+            snapshot: a snapshot of this environment
+        """
+        raise NotImplementedError
+
+    def step_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+    ) -> BatchStepOutput:
+        """
+        Steps a batch of states, each one with its own action, without
+        changing the state of the environment
+
+        The result matches calling step from each state bit for bit.
+
+        Args:
+            states: array of shape (B, state_dim) with the states to be
+                stepped, with the dtype of the environment's state
+            actions: array of shape (B, action_dim) with the actions
+        Returns:
+            An instance of BatchStepOutput with the next states (B, state_dim)
+                and the rewards (B,) and dones (B,) arrays
+        """
+        raise NotImplementedError
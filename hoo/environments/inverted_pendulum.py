@@ -1,39 +1,119 @@
-"""
-Module that implements a modified version of Open AI gym's Inverted
-Pendulum environment
-"""
-from copy import deepcopy
-from typing import Optional
-
-from gym.envs.classic_control import PendulumEnv
-
-from hoo.environments.environment import Environment, StepOutput
-from hoo.state_actions.action_space import HOOActionSpace
-
-
-class InvertedPendulum(PendulumEnv, Environment):
-    def __init__(
-            self,
-            seed: Optional[int] = None,
-            clip_reward = False,
-            render_mode: Optional[str] = None,
-        ):
-        super().__init__(render_mode=render_mode)
-        self.reset(seed=seed)
-        self.clip_reward = clip_reward
-
-    def step(self, action):
-
-        _, reward, done, _, _ = super().step(action)
-
-        if self.clip_reward:
-            reward = (reward + 16.2736044) / 16.2736044
-
-        return StepOutput(reward=reward, done=done)
-
-    @property
-    def hoo_action_space(self):
-        return HOOActionSpace([(-self.max_torque, self.max_torque)])
-    
-    def get_state(self):
-        return [float(s) for s in self.state]
+"""
+Module that implements a modified version of Open AI gym's Inverted
+Pendulum environment
+"""
+from copy import deepcopy
+from typing import Optional
+
+import numpy as np
+from gym.envs.classic_control import PendulumEnv
+from gym.envs.classic_control.pendulum import angle_normalize
+
+from hoo.environments.environment import (BatchStepOutput,
+                                          Environment,
+                                          StepOutput)
+from hoo.state_actions.action_space import HOOActionSpace
+
+
+class InvertedPendulum(PendulumEnv, Environment):
+
+    supports_snapshot = True
+    supports_batch = True
+    deterministic = True
+
+    def __init__(
+            self,
+            seed: Optional[int] = None,
+            clip_reward = False,
+            render_mode: Optional[str] = None,
+        ):
+        super().__init__(render_mode=render_mode)
+        self.reset(seed=seed)
+        self.clip_reward = clip_reward
+
+    def step(self, action):
+
+        # Same dynamics as PendulumEnv.step, with the squares of the cost
+        # computed as products, as in step_batch
+        th, thdot = self.state
+
+        g = self.g
+        m = self.m
+        l = self.l
+        dt = self.dt
+
+        u = np.clip(action, -self.max_torque, self.max_torque)[0]
+        self.last_u = u  # for rendering
+        angle = angle_normalize(th)
+        costs = angle * angle + 0.1 * (thdot * thdot) + 0.001 * (u * u)
+
+        newthdot = thdot + (
+            3 * g / (2 * l) * np.sin(th) + 3.0 / (m * l**2) * u
+        ) * dt
+        newthdot = np.clip(newthdot, -self.max_speed, self.max_speed)
+        newth = th + newthdot * dt
+
+        self.state = np.array([newth, newthdot])
+
+        if self.render_mode == "human":
+            self.render()
+
+        reward = -costs
+
+        if self.clip_reward:
+            reward = (reward + 16.2736044) / 16.2736044
+
+        return StepOutput(reward=reward, done=False)
+
+    @property
+    def hoo_action_space(self):
+        return HOOActionSpace([(-self.max_torque, self.max_torque)])
+    
+    def get_state(self):
+        return [float(s) for s in self.state]
+
+    def snapshot(self):
+        return self.state.copy(), self.last_u
+
+    def restore(self, snapshot):
+        state, self.last_u = snapshot
+        self.state = state.copy()
+
+    def step_batch(self, states, actions):
+
+        states = np.asarray(states, dtype=np.float64)
+        th, thdot = states.T
+
+        g = self.g
+        m = self.m
+        l = self.l
+        dt = self.dt
+
+        u = np.clip(
+            np.asarray(actions, dtype=np.float64)[:, 0],
+            -self.max_torque,
+            self.max_torque,
+        )
+        angle = ((th + np.pi) % (2 * np.pi)) - np.pi
+        costs = (
+            angle * angle
+            + 0.1 * (thdot * thdot)
+            + 0.001 * (u * u)
+        )
+
+        newthdot = thdot + (
+            3 * g / (2 * l) * np.sin(th) + 3.0 / (m * l**2) * u
+        ) * dt
+        newthdot = np.clip(newthdot, -self.max_speed, self.max_speed)
+        newth = th + newthdot * dt
+
+        rewards = -costs
+
+        if self.clip_reward:
+            rewards = (rewards + 16.2736044) / 16.2736044
+
+        return BatchStepOutput(
+            next_states=np.stack((newth, newthdot), axis=1),
+            rewards=rewards,
+            dones=np.zeros(len(states), dtype=bool),
+        )
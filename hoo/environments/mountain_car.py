@@ -2,19 +2,24 @@
 Module that implements a modified version of Open AI gym's Continuous
 Mountain Car environment
 """
-import math
 from copy import deepcopy
 from typing import List, Optional
 
 import numpy as np
 from gym.envs.classic_control import Continuous_MountainCarEnv
 
-from hoo.environments.environment import Environment, StepOutput
+from hoo.environments.environment import (BatchStepOutput,
+                                          Environment,
+                                          StepOutput)
 from hoo.state_actions.action_space import HOOActionSpace
 
 
 class MountainCar(Continuous_MountainCarEnv, Environment):
 
+    supports_snapshot = True
+    supports_batch = True
+    deterministic = True
+
     def __init__(
             self,
             render_mode: Optional[str] = None,
@@ -35,7 +40,11 @@ class MountainCar(Continuous_MountainCarEnv, Environment):
 
     def step(self, action):
 
-        _, reward, done, _, _ = super().step(action)
+        _, _, done, _, _ = super().step(action)
+
+        # Same reward as Continuous_MountainCarEnv.step, with the square of
+        # the action computed as a product, as in step_batch
+        reward = (100.0 if done else 0.) - action[0] * action[0] * 0.1
 
         if self.clip_reward:
             reward = (reward + 0.1) / 100.1
@@ -49,6 +58,61 @@ class MountainCar(Continuous_MountainCarEnv, Environment):
     def get_state(self):
         return [float(s) for s in self.state]
 
+    def snapshot(self):
+        return self.state.copy()
+
+    def restore(self, snapshot):
+        self.state = snapshot.copy()
+
+    def step_batch(self, states, actions):
+
+        # The scalar step does its arithmetic in float64 (the float32 state
+        # is promoted) and stores the next state as float32
+        states = np.asarray(states, dtype=np.float64)
+        actions = np.asarray(actions, dtype=np.float64)[:, 0]
+        position, velocity = states.T
+
+        force = np.minimum(
+            np.maximum(actions, self.min_action), self.max_action
+        )
+
+        velocity = velocity + (
+            force * self.power - 0.0025 * np.cos(3 * position)
+        )
+        velocity = np.where(
+            velocity > self.max_speed, self.max_speed, velocity
+        )
+        velocity = np.where(
+            velocity < -self.max_speed, -self.max_speed, velocity
+        )
+        position = position + velocity
+        position = np.where(
+            position > self.max_position, self.max_position, position
+        )
+        position = np.where(
+            position < self.min_position, self.min_position, position
+        )
+        velocity = np.where(
+            (position == self.min_position) & (velocity < 0), 0., velocity
+        )
+
+        terminated = (
+            (position >= self.goal_position)
+            & (velocity >= self.goal_velocity)
+        )
+        rewards = np.where(terminated, 100.0, 0.) - actions * actions * 0.1
+
+        if self.clip_reward:
+            rewards = (rewards + 0.1) / 100.1
+
+        return BatchStepOutput(
+            next_states=np.stack(
+                (position, velocity), axis=1
+            ).astype(np.float32),
+            rewards=rewards,
+            dones=terminated,
+        )
+
 
 class SmoothedMountainCar(MountainCar, Environment):
 
@@ -89,13 +153,39 @@ class SmoothedMountainCar(MountainCar, Environment):
         if done:
             reward = 100.0
         else:
-            reward = 1.66 + (position - self.goal_position) - math.pow(action[0], 2) * 0.1
+            reward = 1.66 + (position - self.goal_position) - action[0] * action[0] * 0.1
 
         if self.clip_reward:
             reward = reward / 100.1
 
         return StepOutput(reward=reward, done=done)
 
+    def step_batch(self, states, actions):
+
+        next_states = super().step_batch(states, actions).next_states
+        actions = np.asarray(actions, dtype=np.float64)[:, 0]
+        position, velocity = next_states.astype(np.float64).T
+
+        done = (
+            (position >= self.goal_position)
+            & (velocity >= self.goal_velocity)
+        )
+        rewards = np.where(
+            done,
+            100.0,
+            1.66 + (position - self.goal_position)
+            - actions * actions * 0.1,
+        )
+
+        if self.clip_reward:
+            rewards = rewards / 100.1
+
+        return BatchStepOutput(
+            next_states=next_states,
+            rewards=rewards,
+            dones=done,
+        )
+
     @property
     def hoo_action_space(self):
         return HOOActionSpace([(self.min_action, self.max_action)])
\ No newline at end of file
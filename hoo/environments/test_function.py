@@ -1,37 +1,140 @@
 """
 Module that implements an environment to test the optimization of a function
 """
-import math
-from typing import Callable, List, Tuple
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
+import numpy as np
 
-from hoo.environments.environment import Environment, StepOutput
+from hoo.environments.benchmark_functions import BENCHMARK_FUNCTIONS
+from hoo.environments.environment import (BatchStepOutput,
+                                          Environment,
+                                          StepOutput)
 from hoo.state_actions.action_space import HOOActionSpace
 
 
 def default_function(x):
-    return (math.sin(13*x)*math.sin(27*x) + 1) / 2
+    return (np.sin(13*x)*np.sin(27*x) + 1) / 2
 
 
 class TestFunction(Environment):
 
+    supports_snapshot = True
+
     def __init__(
         self,
         function: Callable = default_function,
         domain: List[Tuple[float, float]] = [(0, 1)],
+        vectorized: bool = False,
+        optimum: Optional[float] = None,
     ):
+        """
+        Initializes a TestFunction environment, where the reward of an action
+        is the value of the function at that point
 
+        A function of a 1-dimensional domain takes x as a number, while a
+        function of a multi-dimensional domain takes x as a point, with the
+        coordinates along the last axis.
+
+        Args:
+            function: the function to be optimized (maximized)
+            domain: list with the bounds of each dimension of the domain
+            vectorized: whether the function is written with NumPy ufuncs, so
+                it also evaluates an array of numbers (1-dimensional domain)
+                or of points (multi-dimensional domain) at once. Otherwise,
+                batches are evaluated one point at a time. It is always
+                True for the default function and the benchmark functions
+            optimum: the maximum of the function in the domain, if known
+        """
         self.function = function
         self.domain = domain
+        self.supports_batch = vectorized or function is default_function
+        self.optimum = optimum
+
+        # Evaluating the function does not depend on a state
+        self.state = np.empty(0)
+
+    @classmethod
+    def from_benchmark(cls, name: str) -> TestFunction:
+        """
+        Initializes a TestFunction with one of the benchmark functions
+
+        Args:
+            name: the name of the function in BENCHMARK_FUNCTIONS
+        Returns:
+            An instance of TestFunction with the function's domain and optimum
+        """
+        if name not in BENCHMARK_FUNCTIONS:
+            raise ValueError(
+                f"Benchmark function should be in {list(BENCHMARK_FUNCTIONS)}"
+            )
+
+        benchmark = BENCHMARK_FUNCTIONS[name]
+
+        return cls(
+            function=benchmark.function,
+            domain=benchmark.domain,
+            vectorized=True,
+            optimum=benchmark.optimum,
+        )
+
+    @property
+    def dim(self) -> int:
+        return len(self.domain)
 
     def step(self, action):
 
+        if self.dim == 1:
+            reward = self.function(action[0])
+        else:
+            reward = self.function(np.asarray(action, dtype=np.float64))
+
         return StepOutput(
-            reward=self.function(action[0]),
+            reward=float(reward),
             done=True,
         )
 
+    def evaluate(self, points) -> np.ndarray:
+        """
+        Evaluates the function at a batch of points
+
+        Args:
+            points: array of shape (B, dim) with the points
+        Returns:
+            An array of shape (B,) with the values of the function
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, self.dim)
+
+        if not self.supports_batch:
+            return np.array([self.step(point).reward for point in points])
+
+        if self.dim == 1:
+            return np.asarray(self.function(points[:, 0]), dtype=np.float64)
+
+        return np.asarray(self.function(points), dtype=np.float64)
+
+    def step_batch(self, states, actions):
+
+        rewards = self.evaluate(actions)
+
+        return BatchStepOutput(
+            next_states=np.asarray(states),
+            rewards=rewards,
+            dones=np.ones(len(rewards), dtype=bool),
+        )
+
+    def regret(self, action) -> float:
+        """
+        Computes the simple regret of an action (the difference between the
+        optimum and the value of the function at the action)
+        """
+        if self.optimum is None:
+            raise ValueError("The optimum of the function is not known")
+
+        return self.optimum - self.step(action).reward
+
     @property
     def hoo_action_space(self):
         return HOOActionSpace(self.domain)
@@ -39,14 +142,31 @@ class TestFunction(Environment):
     def get_state(self):
         return [float(s) for s in self.state]
 
+    def snapshot(self):
+        # Evaluating the function does not change the environment
+        return ()
+
+    def restore(self, snapshot):
+        pass
+
     def plot(self) -> None:
 
-        if len(self.domain) != 1:
-            print("Cannot plot a function that is not 1-dimensional")
-        else:
+        if self.dim == 1:
             a, b = self.domain[0]
-            xx = [a + (b - a)*i/500 for i in range(501)]
-            yy = [self.function(x) for x in xx]
+            xx = np.array([a + (b - a)*i/500 for i in range(501)])
+            yy = self.evaluate(xx)
 
             plt.plot(xx, yy)
             plt.show()
+        elif self.dim == 2:
+            (a1, b1), (a2, b2) = self.domain
+            xx1, xx2 = np.meshgrid(
+                np.linspace(a1, b1, 201), np.linspace(a2, b2, 201)
+            )
+            yy = self.evaluate(np.stack([xx1.ravel(), xx2.ravel()], axis=1))
+
+            plt.contourf(xx1, xx2, yy.reshape(xx1.shape), levels=50)
+            plt.colorbar()
+            plt.show()
+        else:
+            print("Cannot plot a function that is more than 2-dimensional")
@@ -1,4 +1,5 @@
 """Module with experiments"""
+from hoo.experiments.result_store import ResultStore
 from hoo.experiments.run_configs import (HOOTRunConfigs,
                                          LDHOOTRunConfigs,
                                          PolyHOOTRunConfigs)
@@ -8,4 +9,5 @@ __all__ = [
     "HOOTRunConfigs",
     "LDHOOTRunConfigs",
     "PolyHOOTRunConfigs",
+    "ResultStore",
 ]
@@ -0,0 +1,277 @@
+"""
+Module that implements an append-only columnar store of experiment results
+
+Each run is saved as one chunk, a directory with a .npy file per column
+(rewards, actions, states and the wall-clock time of each decision), and
+described by one line of a JSON lines index with its configs, seed, running
+time, date, and profiling, footprint and simulation cache summaries (if any).
+Runs with the same configs (apart from the seed) share a key, a hash of those
+configs. Chunks are memory-mapped when read, so aggregations go through the
+runs one at a time without loading every result into memory.
+"""
+import hashlib
+import json
+import math
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import (Dict, Iterator, List, Optional, Sequence, Set, Tuple,
+                    Union)
+
+import numpy as np
+
+
+COLUMNS = {
+    "rewards": "rewards",
+    "actions": "actions",
+    "states": "state",
+    "times": "times",
+}
+
+RUN_FIELDS = list(COLUMNS.values()) + [
+    "iterations", "running_time", "date", "profiling", "footprint",
+    "simulation_cache",
+]
+
+
+@dataclass
+class RewardCurve:
+
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    n_runs: int
+
+
+def config_key(configs: Dict) -> str:
+    """
+    Computes the key of a set of configs, which ignores the seed
+
+    Args:
+        configs: dictionary with the configs of a run
+    Returns:
+        A short hash of the configs
+    """
+    configs = {k: v for k, v in configs.items() if k != "seed"}
+    encoded = json.dumps(configs, sort_keys=True).encode()
+
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class ResultStore:
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Initializes a ResultStore in a directory, which is created if needed
+
+        Args:
+            path: directory of the store
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.path / "index.jsonl"
+
+    def append(self, run_output: Dict) -> Dict:
+        """
+        Appends the output of a run (as returned by generate_hoot_path) to
+        the store
+
+        The chunk is written before its index line, and the line is written
+        with a single append, so several processes can share a store and an
+        interrupted append leaves no entry.
+
+        Args:
+            run_output: the output of a run, with its configs
+        Returns:
+            The index entry of the run
+        """
+        configs = {
+            k: v for k, v in run_output.items() if k not in RUN_FIELDS
+        }
+        key = config_key(configs)
+        chunk = f"{key}/{configs.get('seed')}_{uuid.uuid4().hex[:8]}"
+
+        chunk_path = self.path / chunk
+        chunk_path.mkdir(parents=True)
+
+        for column, field in COLUMNS.items():
+            np.save(
+                chunk_path / f"{column}.npy",
+                np.asarray(run_output[field], dtype=np.float64),
+            )
+
+        entry = {
+            "key": key,
+            "chunk": chunk,
+            "configs": configs,
+            "n_actions": len(run_output["rewards"]),
+            "iterations": run_output.get("iterations"),
+            "running_time": run_output.get("running_time"),
+            "date": run_output.get("date"),
+            "profiling": run_output.get("profiling"),
+            "footprint": run_output.get("footprint"),
+            "simulation_cache": run_output.get("simulation_cache"),
+        }
+
+        line = (json.dumps(entry) + "\n").encode()
+        fd = os.open(self.index_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+        return entry
+
+    def runs(self, **filters) -> List[Dict]:
+        """
+        Lists the index entries of the runs whose configs match the filters
+
+        Args:
+            filters: values of configs (e.g. algorithm="hoot"), or lists of
+                accepted values
+        Returns:
+            The list of matching index entries
+        """
+        if not self.index_file.exists():
+            return []
+
+        entries = []
+
+        with open(self.index_file) as index:
+            for line in index:
+                entry = json.loads(line)
+                configs = entry["configs"]
+
+                if all(
+                    configs.get(k) in (v if isinstance(v, list) else [v])
+                    for k, v in filters.items()
+                ):
+                    entries.append(entry)
+
+        return entries
+
+    def stored_runs(self) -> Set[Tuple[str, Optional[int]]]:
+        """
+        Reads the index once, e.g. to check many runs with has_run
+
+        Returns:
+            The set of (key, seed) pairs of the stored runs
+        """
+        return {
+            (entry["key"], entry["configs"].get("seed"))
+            for entry in self.runs()
+        }
+
+    def has_run(
+        self,
+        configs: Dict,
+        stored_runs: Optional[Set[Tuple[str, Optional[int]]]] = None,
+    ) -> bool:
+        """
+        Checks if a run with the given configs (seed included) was stored
+
+        Args:
+            configs: dictionary with the configs of the run
+            stored_runs: the result of stored_runs. If None, the index is
+                read
+        """
+        if stored_runs is None:
+            stored_runs = self.stored_runs()
+
+        return (config_key(configs), configs.get("seed")) in stored_runs
+
+    def load(self, entry: Dict, column: str) -> np.ndarray:
+        """
+        Loads a column of a run as a read-only memory map
+
+        Args:
+            entry: the index entry of the run
+            column: one of "rewards", "actions", "states" or "times"
+        Returns:
+            The memory-mapped array
+        """
+        if column not in COLUMNS:
+            raise ValueError(f"Column should be in {list(COLUMNS)}")
+
+        return np.load(
+            self.path / entry["chunk"] / f"{column}.npy", mmap_mode="r"
+        )
+
+    def iterate(
+        self,
+        column: str,
+        **filters,
+    ) -> Iterator[Tuple[Dict, np.ndarray]]:
+        """
+        Iterates over a column of the runs that match the filters
+
+        Yields:
+            Tuples with the index entry and the memory-mapped column of a run
+        """
+        for entry in self.runs(**filters):
+            yield entry, self.load(entry, column)
+
+    def reward_curves(
+        self,
+        group_by: Sequence[str] = ("algorithm",),
+        confidence: float = 0.95,
+        cumulative: bool = False,
+        **filters,
+    ) -> Dict[Tuple, RewardCurve]:
+        """
+        Computes the mean reward curve of each group of runs, with a normal
+        confidence interval over the runs
+
+        The statistics are accumulated one run at a time (Welford's method),
+        so memory does not grow with the number of runs. Runs of a group are
+        truncated to the shortest one.
+
+        Args:
+            group_by: configs that define the groups
+            confidence: level of the confidence interval
+            cumulative: if True the curves are of the cumulative reward
+            filters: values of configs that the runs must match (see runs)
+        Returns:
+            A dictionary from the group's values of group_by to its curve
+        """
+        accumulators = {}
+
+        for entry, rewards in self.iterate("rewards", **filters):
+            group = tuple(entry["configs"].get(k) for k in group_by)
+            rewards = np.cumsum(rewards) if cumulative else np.array(rewards)
+
+            if group not in accumulators:
+                accumulators[group] = [
+                    0, np.zeros_like(rewards), np.zeros_like(rewards)
+                ]
+
+            n, mean, m2 = accumulators[group]
+            length = min(len(mean), len(rewards))
+            mean, m2, rewards = mean[:length], m2[:length], rewards[:length]
+
+            n += 1
+            delta = rewards - mean
+            mean = mean + delta / n
+            m2 = m2 + delta * (rewards - mean)
+
+            accumulators[group] = [n, mean, m2]
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        curves = {}
+
+        for group, (n, mean, m2) in accumulators.items():
+            if n > 1:
+                half_width = z * np.sqrt(m2 / (n - 1)) / math.sqrt(n)
+            else:
+                half_width = np.zeros_like(mean)
+
+            curves[group] = RewardCurve(
+                mean=mean,
+                lower=mean - half_width,
+                upper=mean + half_width,
+                n_runs=n,
+            )
+
+        return curves
@@ -12,6 +12,8 @@ LIST_OF_ENVIRONMENTS = [
     "lunar_lander",
 ]
 
+LIST_OF_SIMULATION_POOLS = ["thread", "process"]
+
 
 @dataclass(kw_only=True)
 class HOOTRunConfigs:
@@ -19,21 +21,44 @@ class HOOTRunConfigs:
     environment: str
     n_actions: int
     search_depth: int
-    algorithm_iter: int
+    algorithm_iter: Optional[int] = None
+    time_budget: Optional[float] = None
 
     clip_reward: bool = False
     gamma: float = 0.99
     v1: Optional[float] = None
     ce: float = 1.
+    staleness: float = 0.
 
     seed: Optional[int] = None
+    n_workers: int = 1
+    parallel: str = "root"
+    simulation_pool: str = "thread"
+    virtual_reward: float = 0.
+    profile: bool = False
+    max_nodes: Optional[int] = None
+    eviction_fraction: float = 0.1
+    transposition_resolution: Optional[float] = None
+    simulation_cache_size: Optional[int] = None
+    track_best: bool = True
+    block_rng: bool = False
 
     def __post_init__(self):
+        if self.algorithm_iter is None and self.time_budget is None:
+            raise ValueError(
+                "Either algorithm_iter or time_budget should be given"
+            )
+
         if self.environment not in LIST_OF_ENVIRONMENTS:
             raise ValueError(
                 f"Environment should be in {LIST_OF_ENVIRONMENTS}"
             )
 
+        if self.simulation_pool not in LIST_OF_SIMULATION_POOLS:
+            raise ValueError(
+                f"Simulation pool should be in {LIST_OF_SIMULATION_POOLS}"
+            )
+
     def to_dict(self):
         return {
             "algorithm": self.algorithm,
@@ -41,10 +66,23 @@ class HOOTRunConfigs:
             "search_depth": self.search_depth,
             "n_actions": self.n_actions,
             "algorithm_iter": self.algorithm_iter,
+            "time_budget": self.time_budget,
             "gamma": self.gamma,
             "v1": self.v1,
             "ce": self.ce,
+            "staleness": self.staleness,
             "seed": self.seed,
+            "n_workers": self.n_workers,
+            "parallel": self.parallel,
+            "simulation_pool": self.simulation_pool,
+            "virtual_reward": self.virtual_reward,
+            "profile": self.profile,
+            "max_nodes": self.max_nodes,
+            "eviction_fraction": self.eviction_fraction,
+            "transposition_resolution": self.transposition_resolution,
+            "simulation_cache_size": self.simulation_cache_size,
+            "track_best": self.track_best,
+            "block_rng": self.block_rng,
         }
 
 
@@ -1,6 +1,8 @@
 import json
+import os
 import time
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Union
@@ -8,15 +10,17 @@ from typing import Optional, Union
 import numpy as np
 from tqdm.auto import tqdm
 
-from hoo.hoot.hoot import HOOT
+from hoo.hoot.hoot import HOOT, simulation_pool
 from hoo.hoot.ld_hoot import LDHOOT
 from hoo.hoot.poly_hoot import PolyHOOT
 from hoo.state_actions.hoo_state import HOOState
+from hoo.experiments.result_store import ResultStore
 from hoo.experiments.run_configs import HOOTRunConfigs
 from hoo.environments.acrobot import ContinuousAcrobot
 from hoo.environments.inverted_pendulum import InvertedPendulum
 from hoo.environments.mountain_car import MountainCar, SmoothedMountainCar
 from hoo.environments.cartpole import ContinuousCartPole, IGContinuousCartPole
+from hoo.utils.profiler import Profiler
 
 
 
@@ -42,11 +46,13 @@ def set_seed(seed: int = 0):
     np.random.seed(seed)
 
 
-def generate_hoot_path(configs: HOOTRunConfigs):
+def generate_hoot_path(configs: HOOTRunConfigs, progress: bool = True):
     output = {
         "actions": [],
         "rewards": [],
         "state": [],
+        "iterations": [],
+        "times": [],
     }
 
     state = HOOState(
@@ -57,24 +63,74 @@ def generate_hoot_path(configs: HOOTRunConfigs):
     )
     output["state"].append(state.get_state())
 
+    # Pool shared by all the decisions of a root-parallel run, or by the
+    # simulations of a tree-parallel run that uses processes
+    executor = None
+    if configs.n_workers > 1 and configs.parallel == "root":
+        executor = ProcessPoolExecutor(configs.n_workers)
+    elif configs.n_workers > 1 and configs.simulation_pool == "process":
+        executor = simulation_pool(configs.n_workers, state.env_state)
+
     hoot_algorithm = STR_TO_ALGORITHM[configs.algorithm].from_configs(
         configs,
         state,
     )
+    hoot_algorithm.executor = executor
+
+    # Cache of simulations shared by all the decisions of the run
+    simulation_cache = hoot_algorithm.simulation_cache
+
+    # Per-decision summaries of the time of each phase
+    profiler = Profiler() if configs.profile else None
+    hoot_algorithm.profiler = profiler
+    if profiler is not None:
+        output["profiling"] = []
+    record_footprint = (
+        configs.max_nodes is not None
+        or configs.transposition_resolution is not None
+    )
+    if record_footprint:
+        output["footprint"] = []
     
     initial_time = time.time()
-    for _ in tqdm(range(configs.n_actions)):
+    for _ in tqdm(range(configs.n_actions), disable=not progress):
 
         if configs.seed is not None:
             set_seed(configs.seed)
 
-        action = hoot_algorithm.run(
-            configs.algorithm_iter,
-            sample=False,
+        decision_start = time.time()
+
+        if profiler is None:
+            action = hoot_algorithm.run(
+                configs.algorithm_iter,
+                sample=False,
+                time_budget=configs.time_budget,
+            )
+        else:
+            profiler.reset()
+            with profiler.timer("decision"):
+                action = hoot_algorithm.run(
+                    configs.algorithm_iter,
+                    sample=False,
+                    time_budget=configs.time_budget,
+                )
+            output["profiling"].append(profiler.summary())
+
+        # Wall-clock time of the decision
+        output["times"].append(time.time() - decision_start)
+        output["iterations"].append(hoot_algorithm.n_iterations)
+        if record_footprint:
+            output["footprint"].append(hoot_algorithm.footprint())
+
+        simulate_output = (
+            state.simulate(action) if simulation_cache is None
+            else simulation_cache.simulate(state, action)
         )
-        simulate_output = state.simulate(action)
 
-        root = hoot_algorithm.root.children[str(action)]
+        # Root-parallel runs do not grow the tree in this process
+        root = hoot_algorithm.best_child()
+        if root is None:
+            root = hoot_algorithm.root.new_root(simulate_output.next_state)
         root.reset()
 
         state = simulate_output.next_state
@@ -85,11 +141,27 @@ def generate_hoot_path(configs: HOOTRunConfigs):
         hoot_algorithm = STR_TO_ALGORITHM[configs.algorithm](
             configs.search_depth,
             root,
+            n_workers=configs.n_workers,
+            executor=executor,
+            parallel=configs.parallel,
+            virtual_reward=configs.virtual_reward,
+            profiler=profiler,
+            max_nodes=configs.max_nodes,
+            eviction_fraction=configs.eviction_fraction,
+            transposition_resolution=configs.transposition_resolution,
+            simulation_cache=simulation_cache,
+            track_best=configs.track_best,
         )
 
     final_time = time.time()
 
+    if executor is not None:
+        executor.shutdown()
+
     output["running_time"] = final_time - initial_time
+
+    if simulation_cache is not None:
+        output["simulation_cache"] = simulation_cache.statistics()
     
     return {
         **output,
@@ -101,9 +173,23 @@ def simulate_run(
     configs: HOOTRunConfigs,
     path: Optional[Union[str, Path]] = None,
     save: bool = True,
+    progress: bool = True,
+    store: Optional[ResultStore] = None,
 ):
+    """
+    Runs HOOT with the given configs and saves the result
 
-    run_output = generate_hoot_path(configs)
+    Args:
+        configs: a set of configurations for a HOOT run
+        path: directory where the result is saved as a JSON file
+        save: if False the result is not saved as a JSON file
+        progress: if True shows the progress of the run's actions
+        store: columnar store where the result is appended, if given
+    Returns:
+        The output of the run
+    """
+
+    run_output = generate_hoot_path(configs, progress=progress)
 
     now = str(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     if configs.seed is not None:
@@ -114,10 +200,18 @@ def simulate_run(
     run_output["date"] = now
 
     if path and save:
-        if not Path(path).exists():
-            Path(path).mkdir(parents=True)
+        # Several workers of a sweep can write to the same directory
+        Path(path).mkdir(parents=True, exist_ok=True)
 
-        with open(f"{path}/{filename}.json", "w") as jfile:
+        # Written to a temporary file first, so an interrupted run never
+        # leaves a partial result behind
+        temporary_file = f"{path}/{filename}.json.tmp"
+        with open(temporary_file, "w") as jfile:
             json.dump(run_output, jfile)
 
+        os.replace(temporary_file, f"{path}/{filename}.json")
+
+    if store is not None:
+        store.append(run_output)
+
     return run_output
@@ -1,6 +1,11 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import List, Optional, Tuple
 
+from tqdm.auto import tqdm
+
+from hoo.experiments.result_store import ResultStore
 from hoo.experiments.simulator import simulate_run
 from hoo.experiments.run_configs import (HOOTRunConfigs,
                                          LDHOOTRunConfigs,
@@ -10,9 +15,18 @@ from hoo.experiments.run_configs import (HOOTRunConfigs,
 AVAILABLE_ALGORITHMS = ["hoot", "ld_hoot", "poly_hoot"]
 
 
-def run_tests(args: argparse.Namespace):
+def build_jobs(args: argparse.Namespace) -> List[Tuple[HOOTRunConfigs, Path]]:
+    """
+    Builds the (configs, path) pair of every (algorithm, seed) run of the
+    sweep
 
+    Args:
+        args: the parsed command line arguments
+    Returns:
+        A list with the configs of each run and the directory of its result
+    """
     seeds = [i for i in range(args.seeds)]
+    jobs = []
 
     # HOOT
     if "hoot" in args.algorithms:
@@ -22,20 +36,13 @@ def run_tests(args: argparse.Namespace):
                 n_actions=args.n_actions,
                 search_depth=args.search_depth,
                 algorithm_iter=args.algorithm_iter,
+                time_budget=args.time_budget,
+                staleness=args.staleness,
                 seed=seed,
             )
-
-            print(f"Algorithm: {hoot_configs.algorithm}; Seed: {seed}")
-
             path = Path(f"{args.environment}/hoot")
-            if not path.exists():
-                path.mkdir(parents=True)
 
-            simulate_run(
-                hoot_configs,
-                path=path,
-                #save=True,
-            )
+            jobs.append((hoot_configs, path))
 
     # LD-HOOT
     if "ld_hoot" in args.algorithms:
@@ -45,21 +52,14 @@ def run_tests(args: argparse.Namespace):
                 n_actions=args.n_actions,
                 search_depth=args.search_depth,
                 algorithm_iter=args.algorithm_iter,
+                time_budget=args.time_budget,
+                staleness=args.staleness,
                 hoo_max_depth=args.hoo_max_depth,
                 seed=seed,
             )
-
-            print(f"Algorithm: {ldhoot_configs.algorithm}; Seed: {seed}")
-
             path = Path(f"{args.environment}/ld_hoot_h_{args.hoo_max_depth}")
-            if not path.exists():
-                path.mkdir(parents=True)
 
-            simulate_run(
-                ldhoot_configs,
-                path=path,
-                #save=True,
-            )
+            jobs.append((ldhoot_configs, path))
 
     # Poly-HOOT
     if "poly_hoot" in args.algorithms:
@@ -69,22 +69,132 @@ def run_tests(args: argparse.Namespace):
                 n_actions=args.n_actions,
                 search_depth=args.search_depth,
                 algorithm_iter=args.algorithm_iter,
+                time_budget=args.time_budget,
+                staleness=args.staleness,
                 hoo_max_depth=args.hoo_max_depth,
                 seed=seed,
             )
+            path = Path(f"{args.environment}/poly_hoot_h_{args.hoo_max_depth}")
 
-            print(f"Algorithm: {poly_hoot_configs.algorithm}; Seed: {seed}")
+            jobs.append((poly_hoot_configs, path))
+
+    return jobs
+
+
+def run_job(
+    configs: HOOTRunConfigs,
+    path: Path,
+    store: Optional[ResultStore] = None,
+    progress: bool = False,
+):
+    """
+    Runs one job of the sweep and saves its result
+
+    Args:
+        configs: the configs of the run
+        path: the directory where the result is saved as a JSON file
+        store: if given, the result is appended to this columnar store
+            instead of being saved as a JSON file
+        progress: if True shows the progress of the run's actions
+    """
+    simulate_run(
+        configs,
+        path=path,
+        save=store is None,
+        progress=progress,
+        store=store,
+    )
 
-            path = Path(f"{args.environment}/poly_hoot_h_{args.hoo_max_depth}")
-            if not path.exists():
-                path.mkdir(parents=True)
 
-            simulate_run(
-                poly_hoot_configs,
-                path=path,
-                #save=True,
+def select_pending_jobs(
+    jobs: List[Tuple[HOOTRunConfigs, Path]],
+    store: Optional[ResultStore] = None,
+) -> List[Tuple[HOOTRunConfigs, Path]]:
+    """
+    Selects the jobs whose result was not saved yet, so an interrupted sweep
+    can be resumed
+
+    Args:
+        jobs: the jobs of the sweep, as returned by build_jobs
+        store: the columnar store of the results. If None, the results are
+            looked up as JSON files
+    Returns:
+        The list of jobs to be run
+    """
+    if store is not None:
+        stored_runs = store.stored_runs()
+
+        return [
+            (configs, path) for configs, path in jobs
+            if not store.has_run(configs.to_dict(), stored_runs)
+        ]
+
+    return [
+        (configs, path) for configs, path in jobs
+        if not (path / f"{configs.seed}.json").exists()
+    ]
+
+
+def run_tests(
+    args: argparse.Namespace,
+) -> List[Tuple[HOOTRunConfigs, Exception]]:
+    """
+    Runs the jobs of a sweep that were not run yet and reports the failed
+    ones
+
+    Args:
+        args: the parsed command line arguments
+    Returns:
+        A list with the configs and the error of each failed job
+    """
+    jobs = build_jobs(args)
+    store = ResultStore(args.store) if args.store is not None else None
+    pending_jobs = select_pending_jobs(jobs, store)
+
+    # Output directories are created before the workers start
+    if store is None:
+        for path in {path for _, path in pending_jobs}:
+            path.mkdir(parents=True, exist_ok=True)
+
+    print(
+        f"Jobs: {len(jobs)}; Done: {len(jobs) - len(pending_jobs)}; "
+        f"Pending: {len(pending_jobs)}"
+    )
+
+    failed_jobs = []
+
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers) as executor:
+            futures = {
+                executor.submit(run_job, configs, path, store): configs
+                for configs, path in pending_jobs
+            }
+
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                configs = futures[future]
+
+                if future.exception() is not None:
+                    failed_jobs.append((configs, future.exception()))
+    else:
+        for i, (configs, path) in enumerate(pending_jobs):
+            print(
+                f"Job {i + 1}/{len(pending_jobs)}; "
+                f"Algorithm: {configs.algorithm}; Seed: {configs.seed}"
             )
 
+            try:
+                run_job(configs, path, store=store, progress=True)
+            except Exception as error:
+                failed_jobs.append((configs, error))
+
+    for configs, error in failed_jobs:
+        print(
+            f"Failed - Algorithm: {configs.algorithm}; Seed: {configs.seed}; "
+            f"Error: {error!r}"
+        )
+
+    return failed_jobs
+
 
 def parse_args():
 
@@ -158,6 +268,30 @@ def parse_args():
         help="Number of iterations of the HOOT-based algorithm. Default: 100",
     )
 
+    parser.add_argument(
+        "-tb",
+        "--time_budget",
+        type=float,
+        default=None,
+        help=(
+            "Wall-clock time per decision in seconds. If given, each decision "
+            "stops when either the budget or algorithm_iter is reached. "
+            "Default: None"
+        ),
+    )
+
+    parser.add_argument(
+        "-st",
+        "--staleness",
+        type=float,
+        default=0.,
+        help=(
+            "Relative staleness allowed on the B-values of the HOO trees. "
+            "With a positive value only the nodes in the path are updated "
+            "between full refreshes. Default: 0 (exact update)"
+        ),
+    )
+
     parser.add_argument(
         "-cr",
         "--clip_reward",
@@ -166,6 +300,24 @@ def parse_args():
         help="If True will clip rewards in [0,1]. Default: False",
     )
 
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes that run the jobs. Default: 1",
+    )
+
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        help=(
+            "Directory of a columnar result store where the results are "
+            "appended instead of being saved as JSON files. Default: None"
+        ),
+    )
+
     args = parser.parse_args()
 
     return args
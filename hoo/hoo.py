@@ -3,19 +3,178 @@ Module that implements Hierarchical Optimistic Optimization (HOO)
 https://arxiv.org/abs/1001.4475
 """
 import math
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import List, Optional, Union
 
+import numpy as np
+
+from hoo.array_tree import ArrayTree
+from hoo.best_node import BestNodeTracker
 from hoo.hoo_node import HOONode
+from hoo.state_actions.action_space import HOOActionSpace
 from hoo.state_actions.hoo_state import HOOState
+from hoo.utils.budget import time_steps
+from hoo.utils.profiler import Profiler
+from hoo.utils.rng import BlockRNG, Seed, as_block_rng
+
+
+BACKENDS = ["object", "array"]
+
+
+@dataclass
+class TreeStatistics:
+    """Cells and statistics of the visited nodes of a HOO tree"""
+
+    low: np.ndarray
+    high: np.ndarray
+    depth: np.ndarray
+    N: np.ndarray
+    R: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.N)
+
+    def average_rewards(self, v1: float, rho: float) -> np.ndarray:
+        return self.R / self.N - v1 * np.array([rho**h for h in self.depth])
+
+    def take(self, index: np.ndarray) -> "TreeStatistics":
+        """
+        Returns:
+            The statistics of the cells in index, in that order
+        """
+        return TreeStatistics(
+            low=self.low[index],
+            high=self.high[index],
+            depth=self.depth[index],
+            N=self.N[index],
+            R=self.R[index],
+        )
+
+
+@dataclass
+class RankedActions:
+    """
+    Actions of the best nodes of a HOO tree, ranked by average reward, with
+    the statistics of their nodes
+    """
+
+    actions: np.ndarray
+    average_reward: np.ndarray
+    N: np.ndarray
+    depth: np.ndarray
+    width: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.N)
+
+
+def rank_actions(
+    spaces: List[HOOActionSpace],
+    average_reward: np.ndarray,
+    N: np.ndarray,
+    depth: np.ndarray,
+    k: int,
+    ce: float,
+    sample: bool = True,
+    rng: Optional[BlockRNG] = None,
+) -> RankedActions:
+    """
+    Selects the k cells with the highest average reward
+
+    Ties keep the order of the input, so it should put first the cells that
+    win ties.
+
+    Args:
+        spaces: the action space of each cell
+        average_reward: average reward of each cell
+        N: number of visits of each cell
+        depth: depth of each cell
+        k: number of actions
+        ce: exploration constant of the tree
+        sample: if True the actions are sampled from the cells, otherwise
+            they are their centers
+        rng: random generator of the samples. If None, the global NumPy RNG
+            is used
+    Returns:
+        An instance of RankedActions with (at most) k actions
+    """
+    best = np.argsort(-average_reward, kind="stable")[:k]
+    n = N.max() if len(N) > 0 else 1
+
+    return RankedActions(
+        actions=np.array(
+            [
+                spaces[i].sample(rng=rng) if sample else spaces[i].center
+                for i in best.tolist()
+            ],
+            dtype=np.float64,
+        ).reshape(len(best), -1),
+        average_reward=average_reward[best],
+        N=N[best],
+        depth=depth[best],
+        # Exploration term of the U-values, with the visits of the root as
+        # the time-step
+        width=ce * np.sqrt(2.0 * math.log(n) / N[best]),
+    )
+
+
+def merge_tree_statistics(statistics: List[TreeStatistics]) -> TreeStatistics:
+    """
+    Merges the statistics of several HOO trees over the same action space
+
+    Nodes of different trees that cover exactly the same cell have their
+    counts and cumulative rewards summed. Cells that only overlap are not
+    merged, so the trees should split their nodes along the same dimension
+    at each depth (see cyclic_splits in HOO) to share their cells.
+
+    Args:
+        statistics: list with the statistics of each tree
+    Returns:
+        The statistics of the merged cells
+    """
+    low = np.concatenate([s.low for s in statistics])
+    high = np.concatenate([s.high for s in statistics])
+    depth = np.concatenate([s.depth for s in statistics])
+
+    cells, index, inverse = np.unique(
+        np.concatenate([low, high], axis=1),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+    )
+    inverse = inverse.reshape(-1)
+
+    return TreeStatistics(
+        low=low[index],
+        high=high[index],
+        depth=depth[index],
+        N=np.bincount(
+            inverse,
+            weights=np.concatenate([s.N for s in statistics]),
+            minlength=len(cells),
+        ).astype(np.int64),
+        R=np.bincount(
+            inverse,
+            weights=np.concatenate([s.R for s in statistics]),
+            minlength=len(cells),
+        ),
+    )
 
 
 class HOO:
 
+    # Storages of the tree supported by the algorithm
+    backends = BACKENDS
+
     def __init__(
         self,
         state: HOOState,
         v1: Optional[float] = None,
         ce: float = 1.,
+        staleness: float = 0.,
+        backend: str = "object",
+        rng: Union[BlockRNG, Seed, None] = None,
+        cyclic_splits: bool = False,
     ):
         """
         Initializes the HOO algorithm
@@ -25,35 +184,200 @@ class HOO:
             v1: parameter of the algorithm as defined in the paper
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
+            staleness: relative staleness allowed on the exploration term of
+                the nodes outside the current path. With 0 every node is
+                updated at every iteration (exact HOO). With a positive value
+                only the nodes in the path are updated and the whole tree is
+                refreshed once sqrt(log(t)) has grown by more than a factor of
+                (1 + staleness) since the last refresh
+            backend: storage of the tree, either "object" (one HOONode per
+                node) or "array" (an ArrayTree, which uses much less memory
+                and vectorizes the updates over the whole tree)
+            rng: a BlockRNG, or a numpy.random.Generator or seed to create
+                one, used for the split dimensions, tie-breaks and samples of
+                the search. If None, the global NumPy RNG is used
+            cyclic_splits: if True the nodes at depth h are split along the
+                dimension h mod m instead of a random one, so the trees of
+                different searches over the same action space have the same
+                cells (e.g. to merge their statistics)
         """
+        if backend not in self.backends:
+            raise ValueError(f"Backend should be in {self.backends}")
+
         self.state = state
-        self.root = HOONode(state.action_space)
+        self.backend = backend
+        self.rng = as_block_rng(rng)
+        self.cyclic_splits = cyclic_splits
+        self.root = self.new_root()
         self.m = self.root.dimension
 
         self.v1 = v1 if v1 is not None else 4 * self.m
         self.rho = 2**(-2 / self.m)  # 1.0 / (4**self.m)
         self.ce = ce
+        self.staleness = staleness
 
         self.path = []
+        self.refresh_log_t = None
+        self.n_iterations = 0
+
+        # Optional Profiler that records the time of each phase
+        self.profiler: Optional[Profiler] = None
+
+        # Optional BestNodeTracker that keeps the best node up to date (see
+        # track_best_node)
+        self.best_tracker: Optional[BestNodeTracker] = None
 
-    def run(self, n: int, sample: bool = True) -> List[float]:
+    def new_root(
+        self,
+        max_depth: Union[int, float] = float("inf"),
+    ) -> HOONode:
         """
-        Runs n iterations of HOO
+        Creates the root node of the tree in the selected backend
 
         Args:
-            n: number of iterations to run the algorithm
+            max_depth: maximum depth of the tree search
+        Returns:
+            The root node (an ArrayHOONode view for the array backend)
+        """
+        if self.backend == "array":
+            self.tree = ArrayTree(
+                self.state.action_space,
+                max_depth=max_depth,
+                rng=self.rng,
+                cyclic_splits=self.cyclic_splits,
+            )
+            return self.tree.node(0)
+
+        self.tree = None
+        return HOONode(
+            self.state.action_space,
+            max_depth=max_depth,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
+
+    def run(
+        self,
+        n: Optional[int] = None,
+        sample: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> List[float]:
+        """
+        Runs n iterations of HOO, or as many as fit in a time budget
+
+        Args:
+            n: number of iterations to run the algorithm (None for no limit)
             sample: a boolean that determines if the algorithm should sample
                 or choose the center of a node as the action to take
+            time_budget: wall-clock time of the run in seconds (None for no
+                limit). The run stops at the first iteration that ends after
+                the budget is spent, or after n iterations
         Returns:
             A recommended action sampled from the best node
         """
-        for t in range(1, n + 1):
+        if self.profiler is None:
+            iterate = self.iterate
+        else:
+            iterate = self.iterate_profiled
+
+        t = 0
+
+        for t in time_steps(n, time_budget):
+            iterate(t, sample=sample)
+
+        self.n_iterations = t
+
+        return self.choose_best_action(sample=sample)
+
+    def iterate(self, t: int, sample: bool = True) -> None:
+        """
+        Runs one iteration of HOO
+
+        Args:
+            t: time-step of the algorithm
+            sample: a boolean that determines if the algorithm should sample
+                or choose the center of a node as the action to take
+        """
+        selected_node = self.generate_path()
+        action = selected_node.sample() if sample else selected_node.center
+        reward = self.state.simulate(action).reward
+
+        self.backpropagate(reward, t)
+
+    def iterate_profiled(self, t: int, sample: bool = True) -> None:
+        """
+        Runs one iteration of HOO recording the time of each phase in the
+        profiler (same as iterate otherwise)
+
+        Args:
+            t: time-step of the algorithm
+            sample: a boolean that determines if the algorithm should sample
+                or choose the center of a node as the action to take
+        """
+        profiler = self.profiler
+
+        with profiler.timer("selection"):
             selected_node = self.generate_path()
             action = selected_node.sample() if sample else selected_node.center
+
+        with profiler.timer("simulation"):
             reward = self.state.simulate(action).reward
 
+        profiler.count("env_steps")
+        profiler.count("deepcopies", int(self.state.snapshot is None))
+
+        with profiler.timer("backpropagation"):
             self.backpropagate(reward, t)
 
+    def run_batched(
+        self,
+        n: int,
+        batch_size: int,
+        sample: bool = True,
+        virtual_reward: float = 0.,
+    ) -> List[float]:
+        """
+        Runs n iterations of HOO in rounds of batch_size iterations
+
+        In each round, batch_size paths are generated one after the other.
+        Each path gets a virtual visit with virtual_reward while the round is
+        pending, so the next paths are driven to other leaves. The actions of
+        the round are then evaluated with a single batched simulation and the
+        virtual visits are replaced by the real rewards. With batch_size 1
+        this is the same as run.
+
+        Args:
+            n: number of iterations to run the algorithm
+            batch_size: number of iterations per round
+            sample: a boolean that determines if the algorithm should sample
+                or choose the center of a node as the action to take
+            virtual_reward: reward of the virtual visits. It should be a
+                pessimistic reward for the objective
+        Returns:
+            A recommended action sampled from the best node
+        """
+        t = 0
+
+        while t < n:
+            paths = []
+            actions = []
+
+            for _ in range(min(batch_size, n - t)):
+                selected_node = self.generate_path()
+                paths.append(self.path)
+                actions.append(
+                    selected_node.sample() if sample else selected_node.center
+                )
+                self.add_virtual_loss(self.path, virtual_reward, max(t, 1))
+
+            rewards = self.state.simulate_batch(actions).rewards.tolist()
+
+            for path in paths:
+                self.remove_virtual_loss(path, virtual_reward)
+
+            t += len(paths)
+            self.backpropagate_batch(rewards, t, paths)
+
         return self.choose_best_action(sample=sample)
 
     def generate_path(self) -> None:
@@ -75,11 +399,23 @@ class HOO:
             node = node.choose_child()
             self.path += [node]
 
-        node.generate_children()
+        if self.profiler is None:
+            node.generate_children()
+        else:
+            n_children = len(node.children)
+            node.generate_children()
+            self.profiler.count(
+                "hoo_nodes_created", len(node.children) - n_children
+            )
 
         return node
 
-    def backpropagate(self, reward: float, t: int) -> None:
+    def backpropagate(
+        self,
+        reward: float,
+        t: int,
+        path: Optional[List[HOONode]] = None,
+    ) -> None:
         """
         Updates visited nodes information and all nodes' U and B-values
 
@@ -89,13 +425,198 @@ class HOO:
         Args:
             reward: reward to be backpropagated
             t: time-step of the algorithm
+            path: path of nodes to be updated. If None, the last path
+                generated is used
         """
+        if path is not None:
+            self.path = path
 
         for node in self.path:
             node.N += 1
             node.R += reward
 
-        self.update_B(self.root, t)
+        if self.best_tracker is not None:
+            self.best_tracker.update(self.path)
+
+        if self.profiler is None:
+            self.refresh_B(t)
+        else:
+            with self.profiler.timer("update_B"):
+                self.refresh_B(t)
+
+    def refresh_B(self, t: int) -> None:
+        """
+        Updates the U and B-values after a backpropagation, either of the
+        whole tree or lazily (see lazy_update_B)
+
+        Args:
+            t: time-step of the algorithm
+        """
+        if self.staleness > 0:
+            self.lazy_update_B(t)
+        else:
+            self.update_all_B(t)
+
+    def backpropagate_batch(
+        self,
+        rewards: List[float],
+        t: int,
+        paths: List[List[HOONode]],
+    ) -> None:
+        """
+        Updates the nodes of several paths and then the U and B-values once
+
+        Args:
+            rewards: rewards to be backpropagated, one per path
+            t: time-step of the algorithm after the last path
+            paths: paths of nodes to be updated
+        """
+        for path, reward in zip(paths, rewards):
+            for node in path:
+                node.N += 1
+                node.R += reward
+
+        if self.best_tracker is not None:
+            for path in paths:
+                self.best_tracker.update(path)
+
+        log_t = math.log(t)
+
+        if self.staleness > 0 and not (
+            self.refresh_log_t is None
+            or log_t > self.refresh_log_t * (1. + self.staleness)**2
+        ):
+            # Ancestors shared by several paths keep the values computed
+            # with the last one, which sees the updated children of all
+            for path in paths:
+                self.update_B_path(log_t, path=path)
+        else:
+            self.update_all_B(t)
+
+            if self.staleness > 0:
+                self.refresh_log_t = log_t
+
+        self.path = paths[-1]
+
+    def add_virtual_loss(
+        self,
+        path: List[HOONode],
+        reward: float,
+        t: int,
+    ) -> None:
+        """
+        Adds a virtual visit with a pessimistic reward to the nodes of a path
+        that is still being evaluated, so that concurrent searches are driven
+        to other nodes
+
+        Args:
+            path: path of nodes selected by generate_path
+            reward: reward of the virtual visit
+            t: time-step of the algorithm
+        """
+        for node in path:
+            node.N += 1
+            node.R += reward
+
+        if self.best_tracker is not None:
+            self.best_tracker.update(path)
+
+        self.update_B_path(math.log(t), path=path)
+
+    def remove_virtual_loss(self, path: List[HOONode], reward: float) -> None:
+        """
+        Removes a virtual visit added by add_virtual_loss
+
+        The B-values are updated by the backpropagation that follows.
+
+        Args:
+            path: path of nodes with the virtual visit
+            reward: reward of the virtual visit
+        """
+        for node in path:
+            node.N -= 1
+            node.R -= reward
+
+        if self.best_tracker is not None:
+            self.best_tracker.update(path)
+
+    def compute_U(self, node: HOONode, log_t: float) -> float:
+        """
+        Computes the U-value of a visited node
+
+        Args:
+            node: node with at least one visit
+            log_t: logarithm of the time-step of the algorithm
+        Returns:
+            The U-value of the node
+        """
+        return (
+            node.R / node.N
+            + self.ce * math.sqrt((2.0 * log_t) / node.N)
+            + self.v1 * (self.rho**node.h)
+        )
+
+    def lazy_update_B(self, t: int) -> None:
+        """
+        Updates the B-values of the nodes in the path, refreshing the whole
+        tree only when the exploration term got too stale
+
+        The nodes outside the path only see their exploration term change
+        through log(t). Their B-values are kept from the last refresh while
+        sqrt(log(t) / log(t_refresh)) stays below 1 + staleness, so the
+        exploration term they use is never smaller than 1 / (1 + staleness)
+        times the exact one. As log(t) grows slowly, the number of refreshes
+        is logarithmic in the number of iterations.
+
+        Args:
+            t: time-step of the algorithm
+        """
+        log_t = math.log(t)
+
+        if (
+            self.refresh_log_t is None
+            or log_t > self.refresh_log_t * (1. + self.staleness)**2
+        ):
+            self.update_all_B(t)
+            self.refresh_log_t = log_t
+        else:
+            self.update_B_path(log_t)
+
+    def update_B_path(
+        self,
+        log_t: float,
+        path: Optional[List[HOONode]] = None,
+    ) -> None:
+        """
+        Updates the U and B-values of the nodes in the current path
+
+        The update is done from bottom to top, so each node sees the
+        already updated B-value of its child in the path.
+
+        Args:
+            log_t: logarithm of the time-step of the algorithm
+            path: path of nodes to be updated. If None, the last path
+                generated is used
+        """
+        for node in reversed(path if path is not None else self.path):
+            u = self.compute_U(node, log_t)
+
+            if node.leaf():
+                node.B = u
+            else:
+                node.B = min(u, max([n.B for n in node.children]))
+
+    def update_all_B(self, t: int) -> None:
+        """
+        Updates the B-values of every node in the tree
+
+        Args:
+            t: time-step of the algorithm
+        """
+        if self.tree is not None:
+            self.tree.update_B(math.log(t), self.ce, self.v1, self.rho)
+        else:
+            self.update_B(self.root, t)
 
     def update_B(self, node: HOONode, t: int) -> None:
         """
@@ -112,22 +633,14 @@ class HOO:
         """
         if node.leaf():
             if node.N > 0:
-                node.B = (
-                    node.R / node.N
-                    + self.ce * math.sqrt((2.0 * math.log(t)) / node.N)
-                    + self.v1 * (self.rho**node.h)
-                )
+                node.B = self.compute_U(node, math.log(t))
 
             return
 
         for child in node.children:
             self.update_B(child, t)
 
-        u = (
-            node.R / node.N
-            + self.ce * math.sqrt((2.0 * math.log(t)) / node.N)
-            + self.v1 * (self.rho**node.h)
-        )
+        u = self.compute_U(node, math.log(t))
 
         node.B = min(u, max([n.B for n in node.children]))
 
@@ -159,6 +672,149 @@ class HOO:
             else:
                 return node"""
 
+    def count_nodes(self) -> int:
+        """
+        Counts the nodes of the tree
+
+        Returns:
+            The number of nodes
+        """
+        if self.tree is not None:
+            return len(self.tree)
+
+        count = 0
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack += node.children
+
+        return count
+
+    def tree_statistics(self) -> TreeStatistics:
+        """
+        Collects the cells and statistics of the visited nodes of the tree
+
+        Returns:
+            An instance of TreeStatistics
+        """
+        if self.tree is not None:
+            visited = self.tree.N[:self.tree.size] > 0
+
+            return TreeStatistics(
+                low=self.tree.low[:self.tree.size][visited],
+                high=self.tree.high[:self.tree.size][visited],
+                depth=self.tree.depth[:self.tree.size][visited],
+                N=self.tree.N[:self.tree.size][visited],
+                R=self.tree.R[:self.tree.size][visited],
+            )
+
+        nodes = []
+        stack = [self.root]
+
+        # Nodes that were never visited have no visited descendants
+        while stack:
+            node = stack.pop()
+
+            if node.N > 0:
+                nodes.append(node)
+                stack += node.children
+
+        return TreeStatistics(
+            low=np.array([node.low for node in nodes]).reshape(-1, self.m),
+            high=np.array([node.high for node in nodes]).reshape(-1, self.m),
+            depth=np.array([node.h for node in nodes], dtype=np.int32),
+            N=np.array([node.N for node in nodes], dtype=np.int64),
+            R=np.array([node.R for node in nodes], dtype=np.float64),
+        )
+
+    def track_best_node(self) -> None:
+        """
+        Starts keeping the node with the highest average reward up to date
+        during the backpropagation, so best_node does not search the tree
+
+        The nodes visited so far are added to the tracker.
+        """
+        self.best_tracker = BestNodeTracker(self.v1, self.rho)
+
+        visited = []
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+
+            if node.N > 0:
+                visited.append(node)
+                stack += node.children
+
+        self.best_tracker.update(visited)
+
+    def best_node(self) -> HOONode:
+        """
+        Finds the node with the highest average reward
+
+        Ties are broken in favor of the node that comes last in a pre-order
+        traversal of the tree, as in choose_best_node.
+
+        Returns:
+            The best node
+        """
+        if self.best_tracker is not None:
+            best_node = self.best_tracker.best()
+
+            if best_node is not None:
+                return best_node
+
+        if self.tree is not None:
+            return self.tree.node(self.tree.best_node(self.v1, self.rho))
+
+        return self.choose_best_node(self.root)
+
+    def top_k_actions(self, k: int, sample: bool = True) -> RankedActions:
+        """
+        Returns the actions of the k visited nodes with the highest average
+        reward, found in one traversal of the tree
+
+        The first action comes from the same node as choose_best_action
+        (ties are broken in favor of the node that comes last in pre-order).
+
+        Args:
+            k: number of actions
+            sample: if True the actions are sampled from the nodes' action
+                spaces, otherwise they are the centers
+        Returns:
+            An instance of RankedActions with the actions, average rewards,
+                visits, depths and confidence widths of (at most) k nodes
+        """
+        nodes = []
+        stack = [self.root]
+
+        # Pre-order traversal of the visited nodes
+        while stack:
+            node = stack.pop()
+
+            if node.N > 0:
+                nodes.append(node)
+                stack += reversed(node.children)
+
+        # Reversed so that ties are won by the last node in pre-order
+        nodes.reverse()
+
+        return rank_actions(
+            [node.action_space for node in nodes],
+            np.array(
+                [node.average_reward(self.v1, self.rho) for node in nodes],
+                dtype=np.float64,
+            ),
+            np.array([node.N for node in nodes], dtype=np.int64),
+            np.array([node.h for node in nodes], dtype=np.int64),
+            k,
+            self.ce,
+            sample=sample,
+            rng=self.rng,
+        )
+
     def choose_best_action(self, sample: bool = True):
         """
         Returns an action sampled from the best node
@@ -170,7 +826,8 @@ class HOO:
             An action sampled from the node with the current highest
                 average reward
         """
-        best_node = self.choose_best_node(self.root)
+        best_node = self.best_node()
+
         if sample:
             return best_node.sample()
         else:
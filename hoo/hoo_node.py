@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 import math
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
 import numpy as np
 import numpy.random as rnd
 
 from hoo.state_actions.action_space import HOOActionSpace
 
+if TYPE_CHECKING:
+    from hoo.utils.rng import BlockRNG
+
 
 class HOONode:
     """
@@ -22,6 +25,9 @@ class HOONode:
         max_depth: Union[int, float] = float("inf"),
         depth: int = 0,
         parent: Optional[HOONode] = None,
+        code: int = 1,
+        rng: Optional[BlockRNG] = None,
+        cyclic_splits: bool = False,
     ) -> None:
         """
         Initializes a HOONode
@@ -32,19 +38,34 @@ class HOONode:
                 Poly-HOO)
             depth: depth of the node in the HOO tree
             parent: node that is above in the HOO tree
+            code: integer id of the node's cell in the tree, given by its
+                path of splits: 1 for the root and 2 * code and 2 * code + 1
+                for the lower and upper children of a node
+            rng: random generator of the search. If None, the global NumPy
+                RNG is used
+            cyclic_splits: if True the node is split along the dimension
+                depth mod m instead of a random one
         """
         self.h = depth
         self.action_space = action_space
 
         self.parent = parent
         self.children = []
+        self.code = code
+        self.rng = rng
+        self.cyclic_splits = cyclic_splits
 
         self.R = 0
         self.N = 0
         self.B = math.inf
         self.max_depth = max_depth
 
-        self.split_dimension = rnd.choice(np.arange(self.dimension))
+        if cyclic_splits:
+            self.split_dimension = depth % self.dimension
+        elif rng is None:
+            self.split_dimension = rnd.choice(np.arange(self.dimension))
+        else:
+            self.split_dimension = rng.integer(self.dimension)
 
     @property
     def dimension(self) -> int:
@@ -62,6 +83,10 @@ class HOONode:
     def center(self) -> List[float]:
         return self.action_space.center
 
+    @property
+    def key(self) -> int:
+        return self.code
+
     def is_max_depth(self) -> bool:
         return self.h == self.max_depth
 
@@ -72,7 +97,7 @@ class HOONode:
         return self.h == 0
 
     def sample(self) -> List[float]:
-        return self.action_space.sample()
+        return self.action_space.sample(rng=self.rng)
 
     def generate_children(self) -> None:
         """
@@ -90,6 +115,9 @@ class HOONode:
                     max_depth=self.max_depth,
                     depth=self.h + 1,
                     parent=self,
+                    code=2 * self.code,
+                    rng=self.rng,
+                    cyclic_splits=self.cyclic_splits,
                 )
             )
 
@@ -99,6 +127,9 @@ class HOONode:
                     max_depth=self.max_depth,
                     depth=self.h + 1,
                     parent=self,
+                    code=2 * self.code + 1,
+                    rng=self.rng,
+                    cyclic_splits=self.cyclic_splits,
                 )
             )
 
@@ -122,6 +153,12 @@ class HOONode:
             elif child.B == B_max:
                 best_children.append(child)
 
+        if self.rng is not None:
+            if len(best_children) == 1:
+                return best_children[0]
+
+            return best_children[self.rng.integer(len(best_children))]
+
         return rnd.choice(best_children)
 
     def average_reward(self, v1, rho) -> float:
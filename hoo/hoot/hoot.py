@@ -2,21 +2,156 @@
 Module that implements Hierarchical Optimistic Optimization
 applied to Trees (HOOT)
 """
-from typing import List
+import copy
+import threading
+import time
+from concurrent.futures import (Executor,
+                                Future,
+                                ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Any, Dict, List, Optional, Tuple
 
-from hoo.hoot.hoot_node import HOOTNode
-from hoo.state_actions.hoo_state import HOOState
+import numpy as np
+
+from hoo.environments.environment import Environment
+from hoo.hoo import (RankedActions,
+                     TreeStatistics,
+                     merge_tree_statistics,
+                     rank_actions)
+from hoo.hoot.hoot_node import HOOTNode, normalized_returns
+from hoo.hoot.transposition import TranspositionTable
+from hoo.state_actions.action_space import HOOActionSpace
+from hoo.state_actions.hoo_state import HOOState, SimulateOutput
+from hoo.state_actions.simulation_cache import SimulationCache
 from hoo.experiments.run_configs import HOOTRunConfigs
+from hoo.utils.budget import time_steps
+from hoo.utils.profiler import Profiler
+from hoo.utils.rng import BlockRNG
+
+
+PARALLEL_MODES = ["root", "tree"]
+
+# Staleness of the HOO trees of a tree-parallel search whose nodes do not set
+# one, so a backpropagation only updates the B-values of its path
+TREE_PARALLEL_STALENESS = 0.1
 
 
 class HOOT:
 
-    def __init__(self, search_depth: int, root: HOOTNode):
+    def __init__(
+        self,
+        search_depth: int,
+        root: HOOTNode,
+        n_workers: int = 1,
+        executor: Optional[Executor] = None,
+        parallel: str = "root",
+        virtual_reward: float = 0.,
+        profiler: Optional[Profiler] = None,
+        max_nodes: Optional[int] = None,
+        eviction_fraction: float = 0.1,
+        transposition_resolution: Optional[float] = None,
+        simulation_cache: Optional[SimulationCache] = None,
+        track_best: bool = True,
+    ):
         """
         Initializes the HOOT algorithm
+
+        Args:
+            search_depth: maximum depth of each search in the HOOT tree
+            root: root node of the HOOT tree
+            n_workers: number of workers. With more than one worker, HOOT runs
+                in the parallel mode given by parallel
+            executor: in the root-parallel mode, the process pool that runs
+                the workers (if None, a pool is created at each run). In the
+                tree-parallel mode, an optional pool created by
+                simulation_pool (for environments that hold the GIL) that
+                runs the simulations, which otherwise run in the worker
+                threads
+            parallel: "root" to have each worker process grow an independent
+                tree from the root state and merge the statistics of their root
+                HOO trees, or "tree" to have worker threads search the same tree
+                at once, spread by virtual loss
+            virtual_reward: reward of the virtual visits added to the HOO paths
+                under evaluation in the tree-parallel mode. It should be a
+                pessimistic normalized reward for the environment
+            profiler: if given, records the time of each phase (selection,
+                simulation, backpropagation and update_B, which is part of
+                backpropagation) and counts the created nodes, environment
+                steps and deep copies. Only the sequential mode is profiled
+            max_nodes: maximum number of HOOT nodes in the tree (None for no
+                limit). When the tree grows past it, the subtrees with the
+                fewest visits (the least recently visited among ties) are
+                evicted. The HOO tree of the parent of an evicted node keeps
+                its statistics, so selection is unchanged and the node is
+                simulated again if its action is selected later
+            eviction_fraction: fraction of max_nodes freed by each eviction
+            transposition_resolution: if given, the nodes whose states (and
+                rewards) fall in the same cell of a grid of this size at the
+                same depth are merged, so they share their HOO tree and
+                children. Only the sequential mode uses the transposition
+                table, and it cannot be combined with max_nodes
+            simulation_cache: if given, the simulations of the sequential mode
+                go through this cache (which can be shared by the runs of
+                consecutive decisions). It is bypassed by stochastic
+                environments
+            track_best: if True, the root HOO tree keeps its best node up to
+                date during the backpropagation, so recommending an action
+                does not search the whole tree. The root-parallel mode, which
+                recommends from the merged statistics, does not track it
         """
+        if parallel not in PARALLEL_MODES:
+            raise ValueError(f"Parallel mode should be in {PARALLEL_MODES}")
+
+        if max_nodes is not None and transposition_resolution is not None:
+            raise ValueError(
+                "max_nodes cannot be combined with a transposition table"
+            )
+
         self.search_depth = search_depth
         self.root = root
+        self.n_workers = n_workers
+        self.executor = executor
+        self.parallel = parallel
+        self.virtual_reward = virtual_reward
+
+        self.profiler = profiler
+
+        self.max_nodes = max_nodes
+        self.eviction_fraction = eviction_fraction
+        self.n_nodes = self.count_nodes() if max_nodes is not None else None
+        self.n_evictions = 0
+        self.n_evicted_nodes = 0
+
+        self.transpositions = None
+        if transposition_resolution is not None:
+            self.transpositions = TranspositionTable(transposition_resolution)
+            self.transpositions.index(root)
+
+        self.simulation_cache = simulation_cache
+
+        # Each HOO tree is locked by the worker that updates it, which should
+        # not hold it for a pass over the whole tree
+        if n_workers > 1 and parallel == "tree" and root.staleness == 0:
+            root.staleness = TREE_PARALLEL_STALENESS
+
+            if root.expanded():
+                root.hoo.staleness = TREE_PARALLEL_STALENESS
+
+        # Futures of the nodes being created by the workers of a
+        # tree-parallel run, indexed by parent and child index
+        self.pending: Dict = {}
+
+        # The root HOO tree starts tracking its best node at the start of a
+        # run, so it is still built by the run's random stream
+        self.track_best = track_best and not (
+            n_workers > 1 and parallel == "root"
+        )
+
+        # Nodes of the last search, from the root down
+        self.path = []
+
+        self.root_statistics = None
+        self.n_iterations = 0
 
     @classmethod
     def from_configs(cls, configs: HOOTRunConfigs, initial_state: HOOState):
@@ -35,30 +170,426 @@ class HOOT:
             gamma=configs.gamma,
             v1=configs.v1,
             ce=configs.ce,
+            staleness=configs.staleness,
+            rng=BlockRNG(configs.seed) if configs.block_rng else None,
         )
 
         return cls(
             configs.search_depth,
             root,
+            n_workers=configs.n_workers,
+            parallel=configs.parallel,
+            virtual_reward=configs.virtual_reward,
+            max_nodes=configs.max_nodes,
+            eviction_fraction=configs.eviction_fraction,
+            transposition_resolution=configs.transposition_resolution,
+            simulation_cache=(
+                SimulationCache(configs.simulation_cache_size)
+                if configs.simulation_cache_size is not None else None
+            ),
+            track_best=configs.track_best,
         )
 
-    def run(self, n: int, sample: bool = True) -> List[float]:
+    def run(
+        self,
+        n: Optional[int] = None,
+        sample: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> List[float]:
         """
-        Runs n iterations of HOOT
+        Runs n iterations of HOOT, or as many as fit in a time budget
 
         Args:
-            n: number of iterations to run the algorithm
+            n: number of iterations to run the algorithm (per worker in the
+                root-parallel mode). None for no limit
             sample: if True will sample an action from node's actions space,
                 otherwise returns the center
+            time_budget: wall-clock time of the run in seconds (None for no
+                limit). The run stops at the first iteration that ends after
+                the budget is spent, or after n iterations
         Returns:
             A recommended action sampled from the best node
         """
-        for t in range(1, n + 1):
+        if self.n_workers > 1 and self.parallel == "root":
+            return self.run_root_parallel(
+                n, sample=sample, time_budget=time_budget
+            )
+
+        if self.track_best and self.root.hoo.best_tracker is None:
+            self.root.hoo.track_best_node()
+
+        if self.n_workers > 1 and self.parallel == "tree":
+            return self.run_tree_parallel(
+                n, sample=sample, time_budget=time_budget
+            )
+
+        t = 0
+
+        for t in time_steps(n, time_budget):
             last_node, rewards = self.search(sample=sample)
             self.backpropagate(last_node, rewards, t)
 
+            if self.max_nodes is not None and self.n_nodes > self.max_nodes:
+                self.evict()
+
+        self.n_iterations = t
+
         return self.root.choose_best_action(sample=sample)
 
+    def run_root_parallel(
+        self,
+        n: Optional[int],
+        sample: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> List[float]:
+        """
+        Runs n iterations of HOOT in each worker process
+
+        Each worker grows its own tree from a fresh copy of the root, with an
+        independent random stream, and sends back only the statistics of its
+        root HOO tree, which are merged into root_statistics. Only the cells
+        that match exactly are merged, so the workers split the nodes of
+        their HOO trees along a fixed dimension per depth (see cyclic_splits
+        in HOO): with random split dimensions, trees grown from different
+        streams rarely share a cell below the first split.
+
+        Args:
+            n: number of iterations run by each worker
+            sample: if True will sample an action from node's actions space,
+                otherwise returns the center
+            time_budget: wall-clock time of each worker's run in seconds
+        Returns:
+            A recommended action sampled from the best merged node
+        """
+        roots = [
+            self.root.new_root(self.root.state) for _ in range(self.n_workers)
+        ]
+
+        for root in roots:
+            root.cyclic_splits = True
+
+        if self.root.rng is None:
+            seed_sequences = np.random.SeedSequence(
+                np.random.randint(2**31)
+            ).spawn(self.n_workers)
+        else:
+            # Each worker searches with its own child stream of the root's
+            # generator, so the run is reproducible from its seed
+            seed_sequences = [None] * self.n_workers
+
+            for root, rng in zip(roots, self.root.rng.spawn(self.n_workers)):
+                root.rng = rng
+
+        jobs = [
+            roots,
+            [self.search_depth] * self.n_workers,
+            [n] * self.n_workers,
+            [sample] * self.n_workers,
+            seed_sequences,
+            [time_budget] * self.n_workers,
+        ]
+
+        if self.executor is not None:
+            statistics = list(self.executor.map(grow_root_tree, *jobs))
+        else:
+            with ProcessPoolExecutor(self.n_workers) as executor:
+                statistics = list(executor.map(grow_root_tree, *jobs))
+
+        self.n_iterations = int(sum(
+            worker.N[worker.depth == 0].sum() for worker in statistics
+        ))
+
+        # The merged cells come sorted by their bounds, and many of them
+        # tie on the average reward. They are shuffled so that the ties of
+        # choose_best_action and top_k_actions are broken at random, instead
+        # of always in favor of the lowest cell
+        merged = merge_tree_statistics(statistics)
+        self.root_statistics = merged.take(
+            np.random.permutation(len(merged)) if self.root.rng is None
+            else self.root.rng.generator.permutation(len(merged))
+        )
+
+        return self.choose_best_action(sample=sample)
+
+    def run_tree_parallel(
+        self,
+        n: Optional[int],
+        sample: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> List[float]:
+        """
+        Runs n iterations of HOOT with several worker threads that search the
+        same tree at once
+
+        Each HOOT node has a lock that guards its HOO tree and children, so
+        the workers only wait for each other on the nodes they share, and the
+        simulations of new nodes run concurrently. During its descent, a
+        worker adds a virtual visit to every HOO path it selects, so the other
+        workers are driven to different leaves. The virtual visits are
+        removed before the real backpropagation.
+
+        Args:
+            n: total number of iterations
+            sample: if True will sample an action from node's actions space,
+                otherwise returns the center
+            time_budget: wall-clock time of the run in seconds. No iteration
+                starts after the budget is spent
+        Returns:
+            A recommended action sampled from the best node
+        """
+        if n is None and time_budget is None:
+            raise ValueError("Either n or time_budget should be given")
+
+        deadline = (
+            time.perf_counter() + time_budget if time_budget is not None
+            else None
+        )
+        locks = {}
+        local = threading.local()
+        iterations = {"started": 0, "finished": 0}
+        counter_lock = threading.Lock()
+
+        def worker():
+            while True:
+                with counter_lock:
+                    if iterations["started"] == n or (
+                        deadline is not None
+                        and iterations["started"] > 0
+                        and time.perf_counter() >= deadline
+                    ):
+                        return
+                    iterations["started"] += 1
+
+                self.tree_parallel_iteration(
+                    locks, counter_lock, local, iterations, sample
+                )
+
+        with ThreadPoolExecutor(self.n_workers) as threads:
+            futures = [threads.submit(worker) for _ in range(self.n_workers)]
+
+            for future in futures:
+                future.result()
+
+        self.n_iterations = iterations["finished"]
+
+        if self.max_nodes is not None:
+            self.n_nodes = self.count_nodes()
+
+            if self.n_nodes > self.max_nodes:
+                self.evict()
+
+        return self.root.choose_best_action(sample=sample)
+
+    def tree_parallel_iteration(
+        self,
+        locks: Dict[int, threading.Lock],
+        counter_lock: threading.Lock,
+        local: threading.local,
+        iterations: Dict,
+        sample: bool,
+    ) -> None:
+        """
+        Runs one search and backpropagation of the tree-parallel mode
+
+        Args:
+            locks: locks of the HOOT nodes, indexed by their ids
+            counter_lock: lock that guards the iteration counters
+            local: thread-local data (the worker's copy of the environment)
+            iterations: counters of started and finished iterations
+            sample: if True will sample an action from node's actions space,
+                otherwise uses the center
+        """
+        node = self.root
+        visited = []
+        rewards = []
+
+        def node_lock(hoot_node: HOOTNode) -> threading.Lock:
+            # setdefault is atomic, so the workers agree on the lock of a
+            # node even if they reach it at once
+            return locks.setdefault(id(hoot_node), threading.Lock())
+
+        for _ in range(self.search_depth):
+            creating = False
+            lock = node_lock(node)
+
+            with lock:
+                hoo_node = node.hoo.generate_path()
+                path = node.hoo.path
+                node.hoo.add_virtual_loss(
+                    path, self.virtual_reward, max(iterations["finished"], 1)
+                )
+
+                action = hoo_node.sample() if sample else hoo_node.center
+                child_index = hoo_node.key
+                next_node = node.children.get(child_index)
+
+                if next_node is None:
+                    key = (id(node), child_index)
+
+                    if key not in self.pending:
+                        self.pending[key] = Future()
+                        creating = True
+
+                    next_node_future = self.pending[key]
+
+            visited.append((node, path))
+
+            if creating:
+                try:
+                    simulation_output = self.simulate(node.state, action, local)
+                except Exception as error:
+                    with lock:
+                        self.pending.pop(key).set_exception(error)
+                    raise
+
+                with lock:
+                    next_node = node.new_child(simulation_output, action)
+                    node.children[child_index] = next_node
+                    self.pending.pop(key).set_result(next_node)
+
+            elif next_node is None:
+                next_node = next_node_future.result()
+
+            node = next_node
+            rewards.append(node.reward)
+
+            if node.done:
+                break
+
+        rewards = rewards + [node.reward] * (self.search_depth - len(rewards)) + [0.]
+        returns = normalized_returns(rewards, self.root.gamma)
+
+        with counter_lock:
+            iterations["finished"] += 1
+            t = iterations["finished"]
+
+        for hoot_node, path in visited:
+            with node_lock(hoot_node):
+                hoot_node.hoo.remove_virtual_loss(path, self.virtual_reward)
+                hoot_node.hoo.backpropagate(
+                    returns[hoot_node.depth], t, path=path
+                )
+
+    def simulate(
+        self,
+        state: HOOState,
+        action: List[float],
+        local: threading.local,
+    ) -> SimulateOutput:
+        """
+        Simulates an action for the tree-parallel mode, in the executor if
+        there is one or else in the calling thread, with its own copy of the
+        environment
+
+        Args:
+            state: the state where the action is taken
+            action: the action to be simulated
+            local: thread-local data of the calling worker
+        Returns:
+            An instance of SimulateOutput
+        """
+        if self.executor is not None:
+            if state.snapshot is None:
+                return self.executor.submit(state.simulate, action).result()
+
+            # Only the snapshot goes to the worker process, whose own
+            # environment steps it, and the next state is bound back to the
+            # shared environment
+            snapshot, reward, done = self.executor.submit(
+                simulate_snapshot, state.snapshot, action
+            ).result()
+
+            return SimulateOutput(
+                next_state=HOOState(
+                    state.env_state,
+                    snapshot=snapshot,
+                    action_space=state.action_space,
+                ),
+                reward=reward,
+                done=done,
+            )
+
+        if not hasattr(local, "env"):
+            local.env = copy.deepcopy(state.env_state)
+
+        return state.simulate(action, env=local.env)
+
+    def choose_best_action(self, sample: bool = True) -> List[float]:
+        """
+        Returns an action from the node with the highest average reward of
+        the root HOO tree, or of the merged root statistics after a
+        root-parallel run
+
+        Args:
+            sample: if True will sample an action from node's actions space,
+                otherwise returns the center
+        Returns:
+            The recommended action
+        """
+        if self.root_statistics is None:
+            return self.root.choose_best_action(sample=sample)
+
+        hoo = self.root.hoo
+        best = np.argmax(self.root_statistics.average_rewards(hoo.v1, hoo.rho))
+        best_space = HOOActionSpace.from_arrays(
+            self.root_statistics.low[best].copy(),
+            self.root_statistics.high[best].copy(),
+        )
+
+        if sample:
+            return best_space.sample(rng=self.root.rng)
+
+        return best_space.center
+
+    def best_child(self) -> Optional[HOOTNode]:
+        """
+        Returns the child of the root reached by the center of the best node
+        of the root HOO tree, i.e. by the action of
+        choose_best_action(sample=False)
+
+        Returns:
+            The child, or None if it was not created in this process (e.g.
+                after a root-parallel run)
+        """
+        if self.root_statistics is not None:
+            return None
+
+        return self.root.children.get(self.root.hoo.best_node().key)
+
+    def top_k_actions(self, k: int, sample: bool = True) -> RankedActions:
+        """
+        Returns the actions of the k nodes with the highest average reward of
+        the root HOO tree, or of the merged root statistics after a
+        root-parallel run
+
+        Args:
+            k: number of actions
+            sample: if True will sample the actions from the nodes' action
+                spaces, otherwise returns the centers
+        Returns:
+            An instance of RankedActions with the actions, average rewards,
+                visits, depths and confidence widths of (at most) k nodes
+        """
+        if self.root_statistics is None:
+            return self.root.hoo.top_k_actions(k, sample=sample)
+
+        hoo = self.root.hoo
+        statistics = self.root_statistics
+
+        return rank_actions(
+            [
+                HOOActionSpace.from_arrays(low.copy(), high.copy())
+                for low, high in zip(statistics.low, statistics.high)
+            ],
+            statistics.average_rewards(hoo.v1, hoo.rho),
+            statistics.N,
+            statistics.depth.astype(np.int64),
+            k,
+            hoo.ce,
+            sample=sample,
+            rng=self.root.rng,
+        )
+
     def search(self, sample: bool = True):
         """
         Performs a search in the HOOT tree
@@ -76,12 +607,27 @@ class HOOT:
         """
         node = self.root
         rewards = []
+        self.path = [node]
+
+        if self.max_nodes is not None:
+            visit_time = time.perf_counter()
 
         for _ in range(self.search_depth):
-            node = node.select_action(
+            n_children = len(node.children)
+            next_node = node.select_action(
                 sample=sample,
+                profiler=self.profiler,
+                transpositions=self.transpositions,
+                cache=self.simulation_cache,
             )
+
+            if self.max_nodes is not None:
+                self.n_nodes += len(node.children) - n_children
+                next_node.last_visit = visit_time
+
+            node = next_node
             rewards.append(node.reward)
+            self.path.append(node)
 
             if node.done:
                 break
@@ -89,6 +635,127 @@ class HOOT:
         rewards = rewards + [node.reward] * (self.search_depth - len(rewards)) + [0.]
         return node, rewards
 
+    def count_nodes(self) -> int:
+        """
+        Counts the nodes of the HOOT tree
+
+        Returns:
+            The number of nodes
+        """
+        count = 0
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack += node.children.values()
+
+        return count
+
+    def evict(self) -> None:
+        """
+        Evicts subtrees until the tree has at most (1 - eviction_fraction)
+        times max_nodes nodes
+
+        Nodes are evicted in increasing order of visits (the count of the root
+        of their HOO tree) and then of the time of their last visit. Evicting
+        a node removes its whole subtree. The root and the child reached by
+        the recommended action, whose subtree the next decision reuses, are
+        never evicted.
+        """
+        target = int(self.max_nodes * (1. - self.eviction_fraction))
+        protected = self.best_child() if self.root.expanded() else None
+
+        # Nodes in pre-order, so the subtree sizes are summed in reverse
+        nodes = []
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack += node.children.values()
+
+        sizes = {}
+        for node in reversed(nodes):
+            sizes[node] = 1 + sum(
+                sizes[child] for child in node.children.values()
+            )
+
+        candidates = sorted(
+            nodes[1:], key=lambda node: (node.visits(), node.last_visit)
+        )
+        evicted = set()
+
+        for node in candidates:
+            if self.n_nodes <= target:
+                break
+
+            if node is protected:
+                continue
+
+            # Skip the nodes that were removed with an evicted ancestor
+            ancestor = node.parent
+            while ancestor is not None and ancestor not in evicted:
+                ancestor = ancestor.parent
+
+            if ancestor is not None:
+                continue
+
+            for child_index, child in list(node.parent.children.items()):
+                if child is node:
+                    del node.parent.children[child_index]
+
+            evicted.add(node)
+            self.n_nodes -= sizes[node]
+            self.n_evicted_nodes += sizes[node]
+
+            ancestor = node.parent
+            while ancestor is not None:
+                sizes[ancestor] -= sizes[node]
+                ancestor = ancestor.parent
+
+        self.n_evictions += 1
+
+    def footprint(self) -> Dict[str, int]:
+        """
+        Measures the size of the tree
+
+        Returns:
+            A dictionary with the number of HOOT nodes, the number of HOO
+                trees built, their total number of nodes, the eviction
+                counters and the statistics of the transposition table
+        """
+        hoot_nodes = 0
+        hoo_trees = 0
+        hoo_nodes = 0
+        stack = [self.root]
+        seen = {id(self.root)}
+
+        while stack:
+            node = stack.pop()
+            hoot_nodes += 1
+
+            if node.expanded():
+                hoo_trees += 1
+                hoo_nodes += node.hoo.count_nodes()
+
+            for child in node.children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+
+        return {
+            "hoot_nodes": hoot_nodes,
+            "hoo_trees": hoo_trees,
+            "hoo_nodes": hoo_nodes,
+            "evictions": self.n_evictions,
+            "evicted_nodes": self.n_evicted_nodes,
+            "transpositions": (
+                self.transpositions.statistics()
+                if self.transpositions is not None else None
+            ),
+        }
+
     def backpropagate(
         self,
         last_node: HOOTNode,
@@ -103,4 +770,104 @@ class HOOT:
             rewards: the list of the collected rewards
             t: current time-step
         """
-        last_node.backpropagate(rewards, t)
+        # With transpositions a node can have several parents, so the
+        # rewards follow the path of the search
+        path = self.path if self.transpositions is not None else None
+
+        if self.profiler is None:
+            last_node.backpropagate(rewards, t, path=path)
+        else:
+            with self.profiler.timer("backpropagation"):
+                last_node.backpropagate(
+                    rewards, t, profiler=self.profiler, path=path
+                )
+
+
+def grow_root_tree(
+    root: HOOTNode,
+    search_depth: int,
+    n: int,
+    sample: bool,
+    seed_sequence: Optional[np.random.SeedSequence],
+    time_budget: Optional[float] = None,
+) -> TreeStatistics:
+    """
+    Grows a HOOT tree in a worker process of the root-parallel mode
+
+    Args:
+        root: root of the tree to be grown
+        search_depth: maximum depth of each search in the HOOT tree
+        n: number of iterations
+        sample: if True will sample an action from node's actions space,
+            otherwise uses the center
+        seed_sequence: seed of the worker's global random stream, or None
+            if the root has its own generator
+        time_budget: wall-clock time of the run in seconds
+    Returns:
+        The statistics of the root HOO tree
+    """
+    if seed_sequence is not None:
+        np.random.seed(seed_sequence.generate_state(1))
+
+    hoot = HOOT(search_depth, root)
+
+    for t in time_steps(n, time_budget):
+        last_node, rewards = hoot.search(sample=sample)
+        hoot.backpropagate(last_node, rewards, t)
+
+    return root.hoo.tree_statistics()
+
+
+# Environment of a simulation worker process (see simulation_pool)
+_worker_env: Optional[Environment] = None
+
+
+def init_simulation_worker(env: Environment) -> None:
+    """
+    Keeps the environment that a simulation worker process steps
+
+    Args:
+        env: a copy of the environment of the search
+    """
+    global _worker_env
+    _worker_env = env
+
+
+def simulate_snapshot(
+    snapshot: Any,
+    action: List[float],
+) -> Tuple[Any, float, bool]:
+    """
+    Simulates an action from a snapshot in the environment of a simulation
+    worker process
+
+    Args:
+        snapshot: snapshot of the state where the action is taken
+        action: the action to be simulated
+    Returns:
+        A tuple with the snapshot of the next state, the reward and a boolean
+            that informs if the next state is terminal
+    """
+    _worker_env.restore(snapshot)
+    action_output = _worker_env.step(action)
+
+    return _worker_env.snapshot(), action_output.reward, action_output.done
+
+
+def simulation_pool(n_workers: int, env: Environment) -> ProcessPoolExecutor:
+    """
+    Creates the process pool that runs the simulations of a tree-parallel
+    HOOT search, where each process gets its own copy of the environment
+    once
+
+    Args:
+        n_workers: number of worker processes
+        env: environment of the search
+    Returns:
+        A ProcessPoolExecutor whose processes can run simulate_snapshot
+    """
+    return ProcessPoolExecutor(
+        n_workers,
+        initializer=init_simulation_worker,
+        initargs=(env,),
+    )
@@ -1,11 +1,62 @@
 """Module that implements a HOOT Node"""
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import time
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 
 from hoo.hoo import HOO
+from hoo.hoot.transposition import TranspositionTable
 from hoo.state_actions.hoo_state import HOOState
 from hoo.state_actions.hoo_state import SimulateOutput
+from hoo.state_actions.simulation_cache import SimulationCache
+from hoo.utils.profiler import Profiler
+from hoo.utils.rng import BlockRNG
+
+
+@lru_cache(maxsize=None)
+def discount_table(gamma: float, length: int) -> Tuple[float, ...]:
+    """
+    Computes the normalizers of the discounted returns of a search
+
+    Args:
+        gamma: discount factor
+        length: number of rewards collected by a search
+    Returns:
+        A tuple whose k-th entry is the sum of gamma**i for i < k
+    """
+    normalizers = [0.]
+
+    for i in range(length):
+        normalizers.append(normalizers[-1] + gamma**i)
+
+    return tuple(normalizers)
+
+
+def normalized_returns(rewards: List[float], gamma: float) -> List[float]:
+    """
+    Computes the normalized discounted return from every depth of a search
+    with one reverse scan of the rewards
+
+    Args:
+        rewards: a list with the rewards obtained after one iteration of
+            the HOOT tree search
+        gamma: discount factor
+    Returns:
+        A list whose d-th entry is the discounted return from depth d,
+            normalized by the sum of the discounts
+    """
+    normalizers = discount_table(gamma, len(rewards))
+    returns = [0.] * len(rewards)
+    cumulative_reward = 0.
+
+    for depth in range(len(rewards) - 1, -1, -1):
+        cumulative_reward = rewards[depth] + gamma * cumulative_reward
+        returns[depth] = (
+            cumulative_reward / normalizers[len(rewards) - depth]
+        )
+
+    return returns
 
 
 class HOOTNode:
@@ -21,6 +72,9 @@ class HOOTNode:
         depth: int = 0,
         v1: Optional[float] = None,
         ce: float = 1.,
+        staleness: float = 0.,
+        rng: Optional[BlockRNG] = None,
+        cyclic_splits: bool = False,
     ) -> None:
         """
         Initializes and instance of a HOOTNode
@@ -33,6 +87,12 @@ class HOOTNode:
             v1: constant used in HOO
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
+            staleness: relative staleness allowed on the B-values of the HOO
+                trees (see HOO)
+            rng: random generator shared by the HOO trees of the search. If
+                None, the global NumPy RNG is used
+            cyclic_splits: if True the HOO trees split the nodes at depth h
+                along the dimension h mod m instead of a random one (see HOO)
         """
         self.state = state
         self.parent = parent
@@ -44,14 +104,64 @@ class HOOTNode:
 
         self.v1 = v1
         self.ce = ce
+        self.staleness = staleness
+        self.rng = rng
+        self.cyclic_splits = cyclic_splits
 
-        self.hoo = HOO(self.state, v1=v1, ce=ce)
+        # HOO tree over the actions of this node. It is only built on the
+        # first selection, so terminal nodes and nodes that are never
+        # expanded do not pay for it
+        self._hoo: Optional[HOO] = None
 
+        # Children indexed by the key (an integer cell id) of the HOO node
+        # whose action leads to them
         self.children = {}
 
+        # Time of the last search that went through this node (only kept
+        # by HOOT runs with a node cap)
+        self.last_visit = 0.
+
+    @property
+    def hoo(self) -> HOO:
+        if self._hoo is None:
+            self._hoo = self.new_hoo()
+
+        return self._hoo
+
+    def new_hoo(self) -> HOO:
+        """
+        Creates the HOO tree over the actions of this node
+        """
+        return HOO(
+            self.state,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
+
+    def expanded(self) -> bool:
+        """
+        Returns:
+            True if the HOO tree of this node was already built
+        """
+        return self._hoo is not None
+
+    def visits(self) -> int:
+        """
+        Returns:
+            The number of searches backpropagated through this node's HOO
+                tree
+        """
+        return self._hoo.root.N if self._hoo is not None else 0
+
     def select_action(
         self,
         sample: bool = True,
+        profiler: Optional[Profiler] = None,
+        transpositions: Optional[TranspositionTable] = None,
+        cache: Optional[SimulationCache] = None,
     ) -> HOOTNode:
         """
         Selects an action using HOO
@@ -60,12 +170,22 @@ class HOOTNode:
             sample: if True the action that leads to the following state
                 is randomly sampled from a HOO node. If False the selected
                 action is the center of the action space
+            profiler: if given, records the time of the selection and
+                simulation phases
+            transpositions: if given, a new child is replaced by the node
+                already stored for an equivalent state at the same depth
+            cache: if given, the simulations go through this cache
         Returns:
             A tuple with the node that follows from taking the selected action
                 and an instance of SimulateOutput, which contains the next
                 HOOState, the reward and a boolean that informs whether the
                 next state is terminal or not.
         """
+        if profiler is not None:
+            start = time.perf_counter()
+            profiler.count("hoo_trees_created", int(self._hoo is None))
+
+        self.hoo.profiler = profiler
         hoo_node = self.hoo.generate_path()
 
         if sample:
@@ -73,52 +193,141 @@ class HOOTNode:
         else:
             action = hoo_node.center
 
-        child_index = str(hoo_node.center)
+        child_index = hoo_node.key
+
+        if profiler is not None:
+            profiler.add("selection", time.perf_counter() - start)
 
         if child_index not in self.children:
-            simulation_output = self.state.simulate(action)
-            next_node = HOOTNode(
-                simulation_output.next_state,
-                reward=simulation_output.reward,
-                done=simulation_output.done,
-                parent=self,
-                action=action,
-                gamma=self.gamma,
-                depth=self.depth + 1,
-                v1=self.v1,
-                ce=self.ce,
-            )
+            if profiler is None:
+                simulation_output = self.simulate(action, cache)
+            else:
+                hits = cache.hits if cache is not None else 0
+
+                with profiler.timer("simulation"):
+                    simulation_output = self.simulate(action, cache)
+
+                stepped = int(cache is None or cache.hits == hits)
+                profiler.count("env_steps", stepped)
+                profiler.count(
+                    "deepcopies", stepped * int(self.state.snapshot is None)
+                )
+                profiler.count("hoot_nodes_created")
+
+            if transpositions is None:
+                next_node = self.new_child(simulation_output, action)
+            else:
+                key = transpositions.key(
+                    simulation_output.next_state,
+                    simulation_output.reward,
+                    simulation_output.done,
+                    self.depth + 1,
+                )
+                next_node = transpositions.lookup(key)
+
+                if next_node is None:
+                    next_node = self.new_child(simulation_output, action)
+                    transpositions.insert(key, next_node)
+
             self.children[child_index] = next_node
         else:
             next_node = self.children[child_index]
 
         return next_node
 
+    def simulate(
+        self,
+        action: List[float],
+        cache: Optional[SimulationCache] = None,
+    ) -> SimulateOutput:
+        if cache is None:
+            return self.state.simulate(action)
+
+        return cache.simulate(self.state, action)
+
+    def new_child(
+        self,
+        simulation_output: SimulateOutput,
+        action: List[float],
+    ) -> HOOTNode:
+        """
+        Creates the node that follows from taking an action in this node
+
+        Args:
+            simulation_output: the output of simulating the action
+            action: the simulated action
+        Returns:
+            The new child node (not yet added to children)
+        """
+        return HOOTNode(
+            simulation_output.next_state,
+            reward=simulation_output.reward,
+            done=simulation_output.done,
+            parent=self,
+            action=action,
+            gamma=self.gamma,
+            depth=self.depth + 1,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
+
     def backpropagate(
         self,
         rewards: List[float],
         t: int,
+        profiler: Optional[Profiler] = None,
+        path: Optional[List[HOOTNode]] = None,
     ) -> None:
         """
-        Backpropagates the rewards through the HOOT tree
+        Backpropagates the rewards through the HOOT tree, from this node up
+        to the root
+
+        The nodes whose HOO tree was not built yet are skipped, as their tree
+        has no path to update.
 
         Args:
             rewards: a list with the rewards obtained after one iteration of
                 the HOOT tree search
             t: time-step
+            profiler: if given, records the time of the B-value updates
+            path: the nodes of the search, from the root down to this node.
+                If None, the parent links are followed (which is only valid
+                in a tree without transpositions)
         """
-        cumulative_reward = sum(
-            [r*self.gamma**i for i, r in enumerate(rewards[self.depth:])]
-        )
-        max_reward = sum(
-            [self.gamma**i for i, r in enumerate(rewards[self.depth:])]
-        )
-        normalized_reward = cumulative_reward / max_reward
-        
-        self.hoo.backpropagate(normalized_reward, t)
+        returns = normalized_returns(rewards, self.gamma)
+
+        for node in reversed(path) if path is not None else self.lineage():
+            if node.expanded():
+                node.hoo.profiler = profiler
+                node.hoo.backpropagate(returns[node.depth], t)
+
+    def lineage(self) -> Iterator[HOOTNode]:
+        """
+        Yields:
+            This node and its ancestors, up to the root
+        """
+        node = self
+        yield node
 
-        if not self.root():
-            self.parent.backpropagate(rewards, t)
+        while not node.root():
+            node = node.parent
+            yield node
+
+    def normalized_reward(self, rewards: List[float]) -> float:
+        """
+        Computes the discounted return from this node's depth, normalized by
+        the sum of the discounts
+
+        Args:
+            rewards: a list with the rewards obtained after one iteration of
+                the HOOT tree search
+        Returns:
+            The normalized discounted return
+        """
+        return normalized_returns(rewards[self.depth:], self.gamma)[0]
 
     def choose_best_action(self, sample: bool = True):
         """
@@ -133,6 +342,26 @@ class HOOTNode:
         """
         return self.hoo.choose_best_action(sample=sample)
 
+    def new_root(self, state: HOOState) -> HOOTNode:
+        """
+        Creates a root node of the same kind and with the same parameters as
+        this node
+
+        Args:
+            state: the state of the new root
+        Returns:
+            A new HOOTNode without children
+        """
+        return HOOTNode(
+            state,
+            gamma=self.gamma,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
+
     def root(self) -> bool:
         return self.depth == 0
 
@@ -145,9 +374,15 @@ class HOOTNode:
 
     def reset_depth(self, depth=0) -> None:
         self.depth = depth
+        stack = [self]
+        seen = {id(self)}
 
-        if self.children == {}:
-            return
-        else:
-            for child in self.children.values():
-                child.reset_depth(depth=depth + 1)
+        # Nodes shared through a transposition table are reset only once
+        while stack:
+            node = stack.pop()
+
+            for child in node.children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    child.depth = node.depth + 1
+                    stack.append(child)
@@ -3,9 +3,10 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from hoo.state_actions.hoo_state import HOOState
+from hoo.state_actions.hoo_state import HOOState, SimulateOutput
 from hoo.ld_hoo import LDHOO
 from hoo.hoot.hoot_node import HOOTNode
+from hoo.utils.rng import BlockRNG
 
 
 class LDHOOTNode(HOOTNode):
@@ -22,6 +23,9 @@ class LDHOOTNode(HOOTNode):
         depth: int = 0,
         v1: Optional[float] = None,
         ce: float = 1.,
+        staleness: float = 0.,
+        rng: Optional[BlockRNG] = None,
+        cyclic_splits: bool = False,
     ):
         """
         Initializes and instance of a LDHOOTNode
@@ -35,6 +39,11 @@ class LDHOOTNode(HOOTNode):
             v1: constant used in LD-HOO
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
+            staleness: relative staleness allowed on the B-values of the HOO
+                trees (see HOO)
+            rng: random generator shared by the HOO trees of the search
+            cyclic_splits: if True the HOO trees split their nodes along a
+                fixed dimension per depth (see HOO)
         """
         super().__init__(
             state,
@@ -46,60 +55,55 @@ class LDHOOTNode(HOOTNode):
             depth=depth,
             v1=v1,
             ce=ce,
+            staleness=staleness,
+            rng=rng,
+            cyclic_splits=cyclic_splits,
         )
 
         self.ldhoo_max_depth = ldhoo_max_depth
 
         self.vars = vars
-        self.hoo = LDHOO(
-            state,
-            ldhoo_max_depth,
-            v1=v1,
-            ce=ce,
+
+    def new_hoo(self) -> LDHOO:
+        return LDHOO(
+            self.state,
+            self.ldhoo_max_depth,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
         )
 
-    def select_action(
+    def new_child(
         self,
-        sample: bool = True,
+        simulation_output: SimulateOutput,
+        action: List[float],
     ) -> LDHOOTNode:
-        """
-        Selects an action using HOO
-
-        Args:
-            sample: if True the action that leads to the following state
-                is randomly sampled from a HOO node. If False the selected
-                action is the center of the action space
-        Returns:
-            A tuple with the node that follows from taking the selected action
-                and an instance of SimulateOutput, which contains the next
-                HOOState, the reward and a boolean that informs whether the
-                next state is terminal or not.
-        """
-        hoo_node = self.hoo.generate_path()
-
-        if sample:
-            action = hoo_node.sample()
-        else:
-            action = hoo_node.center
-
-        child_index = str(hoo_node.center)
-
-        if child_index not in self.children:
-            simulation_output = self.state.simulate(action)
-            next_node = LDHOOTNode(
-                simulation_output.next_state,
-                self.ldhoo_max_depth,
-                reward=simulation_output.reward,
-                done=simulation_output.done,
-                parent=self,
-                action=action,
-                gamma=self.gamma,
-                depth=self.depth + 1,
-                v1=self.v1,
-                ce=self.ce,
-            )
-            self.children[child_index] = next_node
-        else:
-            next_node = self.children[child_index]
+        return LDHOOTNode(
+            simulation_output.next_state,
+            self.ldhoo_max_depth,
+            reward=simulation_output.reward,
+            done=simulation_output.done,
+            parent=self,
+            action=action,
+            gamma=self.gamma,
+            depth=self.depth + 1,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
 
-        return next_node
\ No newline at end of file
+    def new_root(self, state: HOOState) -> LDHOOTNode:
+        return LDHOOTNode(
+            state,
+            self.ldhoo_max_depth,
+            gamma=self.gamma,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+        )
\ No newline at end of file
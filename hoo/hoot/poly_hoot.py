@@ -10,6 +10,8 @@ from hoo.hoot.hoot import HOOT
 from hoo.hoot.poly_hoot_node import PolyHOOTNode
 from hoo.poly_hoo import PolyHOOConstants
 from hoo.state_actions.hoo_state import HOOState
+from hoo.state_actions.simulation_cache import SimulationCache
+from hoo.utils.rng import BlockRNG
 from hoo.experiments.run_configs import PolyHOOTRunConfigs
 
 
@@ -42,10 +44,23 @@ class PolyHOOT(HOOT):
             gamma=configs.gamma,
             v1=configs.v1,
             ce=configs.ce,
+            staleness=configs.staleness,
+            rng=BlockRNG(configs.seed) if configs.block_rng else None,
             polyhoo_constants=polyhoo_constants,
         )
 
         return cls(
             configs.search_depth,
             root,
+            n_workers=configs.n_workers,
+            parallel=configs.parallel,
+            virtual_reward=configs.virtual_reward,
+            max_nodes=configs.max_nodes,
+            eviction_fraction=configs.eviction_fraction,
+            transposition_resolution=configs.transposition_resolution,
+            simulation_cache=(
+                SimulationCache(configs.simulation_cache_size)
+                if configs.simulation_cache_size is not None else None
+            ),
+            track_best=configs.track_best,
         )
@@ -3,9 +3,10 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from hoo.state_actions.hoo_state import HOOState
+from hoo.state_actions.hoo_state import HOOState, SimulateOutput
 from hoo.poly_hoo import PolyHOO, PolyHOOConstants
 from hoo.hoot.hoot_node import HOOTNode
+from hoo.utils.rng import BlockRNG
 
 
 class PolyHOOTNode(HOOTNode):
@@ -14,12 +15,17 @@ class PolyHOOTNode(HOOTNode):
         self,
         state: HOOState,
         polyhoo_max_depth,
+        reward: Optional[float] = None,
+        done: bool = False,
         parent: Optional[PolyHOOTNode] = None,
         action: Optional[List] = None,
         gamma: float = 0.99,
         depth: int = 0,
         v1: Optional[float] = None,
         ce: float = 1.,
+        staleness: float = 0.,
+        rng: Optional[BlockRNG] = None,
+        cyclic_splits: bool = False,
         polyhoo_constants: PolyHOOConstants = PolyHOOConstants(),
     ):
         """
@@ -34,71 +40,76 @@ class PolyHOOTNode(HOOTNode):
             v1: constant used in Poly-HOO
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
+            staleness: relative staleness allowed on the B-values of the HOO
+                trees (see HOO)
+            rng: random generator shared by the HOO trees of the search
+            cyclic_splits: if True the HOO trees split their nodes along a
+                fixed dimension per depth (see HOO)
             polyhoo_constans: constants alpha, xi and eta used in Poly-HOO
         """
         super().__init__(
             state,
+            reward=reward,
+            done=done,
             parent=parent,
             action=action,
             gamma=gamma,
             depth=depth,
             v1=v1,
             ce=ce,
+            staleness=staleness,
+            rng=rng,
+            cyclic_splits=cyclic_splits,
         )
 
-        self.polyhoo_max_depth
+        self.polyhoo_max_depth = polyhoo_max_depth
+        self.polyhoo_constants = polyhoo_constants
 
         self.vars = vars
-        self.hoo = PolyHOO(
-            state,
-            polyhoo_max_depth,
-            v1=v1,
-            ce=ce,
-            polyhoo_constants=polyhoo_constants,
+
+    def new_hoo(self) -> PolyHOO:
+        return PolyHOO(
+            self.state,
+            self.polyhoo_max_depth,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+            polyhoo_constants=self.polyhoo_constants,
         )
 
-    def select_action(
+    def new_child(
         self,
-        sample: bool = True,
+        simulation_output: SimulateOutput,
+        action: List[float],
     ) -> PolyHOOTNode:
-        """
-        Selects an action using HOO
-
-        Args:
-            sample: if True the action that leads to the following state
-                is randomly sampled from a HOO node. If False the selected
-                action is the center of the action space
-        Returns:
-            A tuple with the node that follows from taking the selected action
-                and an instance of SimulateOutput, which contains the next
-                HOOState, the reward and a boolean that informs whether the
-                next state is terminal or not.
-        """
-        hoo_node = self.hoo.generate_path()
-
-        if sample:
-            action = hoo_node.sample()
-        else:
-            action = hoo_node.center
-
-        child_index = str(hoo_node.center)
-
-        if child_index not in self.children:
-            simulation_output = self.state.simulate(action)
-            next_node = PolyHOOTNode(
-                simulation_output.next_state,
-                self.polyhoo_max_depth,
-                reward=simulation_output.reward,
-                done=simulation_output.done,
-                parent=self,
-                action=action,
-                gamma=self.gamma,
-                depth=self.depth + 1,
-                v1=self.v1,
-                ce=self.ce,
-            )
-            self.children[child_index] = next_node
-        else:
-            next_node = self.children[child_index]
+        return PolyHOOTNode(
+            simulation_output.next_state,
+            self.polyhoo_max_depth,
+            reward=simulation_output.reward,
+            done=simulation_output.done,
+            parent=self,
+            action=action,
+            gamma=self.gamma,
+            depth=self.depth + 1,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+            polyhoo_constants=self.polyhoo_constants,
+        )
 
-        return next_node
+    def new_root(self, state: HOOState) -> PolyHOOTNode:
+        return PolyHOOTNode(
+            state,
+            self.polyhoo_max_depth,
+            gamma=self.gamma,
+            v1=self.v1,
+            ce=self.ce,
+            staleness=self.staleness,
+            rng=self.rng,
+            cyclic_splits=self.cyclic_splits,
+            polyhoo_constants=self.polyhoo_constants,
+        )
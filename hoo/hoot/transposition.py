@@ -0,0 +1,132 @@
+"""
+Module that implements a transposition table of HOOT nodes
+
+Different action sequences can reach (numerically) the same state of the
+environment. With a transposition table, the HOOT nodes created for the same
+quantized state at the same depth are merged into one, so they share their
+HOO tree and children. The tree becomes a directed acyclic graph, so the
+rewards are backpropagated along the path of each search instead of the
+parent links.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from hoo.state_actions.hoo_state import HOOState
+
+if TYPE_CHECKING:
+    from hoo.hoot.hoot_node import HOOTNode
+
+
+class TranspositionTable:
+
+    def __init__(self, resolution: float) -> None:
+        """
+        Initializes an empty transposition table
+
+        Args:
+            resolution: size of the cells of the grid where the states (and
+                rewards) are quantized. States in the same cell are considered
+                equivalent
+        """
+        if resolution <= 0:
+            raise ValueError("The resolution should be positive")
+
+        self.resolution = resolution
+        self.nodes: Dict[Hashable, HOOTNode] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        state: HOOState,
+        reward: float,
+        done: bool,
+        depth: int,
+    ) -> Tuple:
+        """
+        Computes the key of a node
+
+        The reward and done flag are part of the key, as they are stored in
+        the node and shared by every path that reaches it.
+
+        Args:
+            state: state of the node
+            reward: reward of the transition into the node
+            done: whether the state is terminal
+            depth: depth of the node in the HOOT tree
+        Returns:
+            A hashable key
+        """
+        return (
+            depth,
+            done,
+            self.quantize(reward),
+            self.quantize(state.get_state()),
+        )
+
+    def quantize(self, values) -> Tuple[int, ...]:
+        cells = np.round(
+            np.asarray(values, dtype=np.float64).ravel() / self.resolution
+        )
+
+        return tuple(cells.astype(np.int64).tolist())
+
+    def lookup(self, key: Hashable) -> Optional[HOOTNode]:
+        """
+        Returns:
+            The node stored with a key, or None if there is none
+        """
+        node = self.nodes.get(key)
+
+        if node is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return node
+
+    def insert(self, key: Hashable, node: HOOTNode) -> None:
+        self.nodes[key] = node
+
+    def statistics(self) -> Dict[str, float]:
+        """
+        Returns:
+            A dictionary with the number of stored nodes, the hits and misses
+                of the lookups and the hit rate
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "nodes": len(self.nodes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.,
+        }
+
+    def index(self, root: HOOTNode) -> None:
+        """
+        Stores every node below a root (e.g. of a tree kept from the previous
+        decision)
+
+        Args:
+            root: root of the HOOT tree
+        """
+        stack = [root]
+        seen = {id(root)}
+
+        while stack:
+            node = stack.pop()
+
+            for child in node.children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+                    self.insert(
+                        self.key(child.state, child.reward, child.done,
+                                 child.depth),
+                        child,
+                    )
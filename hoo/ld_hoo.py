@@ -5,8 +5,8 @@ Module that implements Limited Depth Hierarchical Optimistic Optimization
 from typing import Optional, Union
 
 from hoo.hoo import HOO
-from hoo.hoo_node import HOONode
 from hoo.state_actions.hoo_state import HOOState
+from hoo.utils.rng import BlockRNG, Seed
 
 
 class LDHOO(HOO):
@@ -17,6 +17,10 @@ class LDHOO(HOO):
         max_depth: Union[int, float],
         v1: Optional[float] = None,
         ce: float = 1.,
+        staleness: float = 0.,
+        backend: str = "object",
+        rng: Union[BlockRNG, Seed, None] = None,
+        cyclic_splits: bool = False,
     ):
         """
         Initializes LD-HOO algorithm
@@ -28,7 +32,15 @@ class LDHOO(HOO):
             v1: parameter of the algorithm as defined in the paper
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
+            staleness: relative staleness allowed on the exploration term of
+                the nodes outside the current path (see HOO)
+            backend: storage of the tree, either "object" or "array"
+            rng: random generator of the search (see HOO)
+            cyclic_splits: if True the nodes at depth h are split along the
+                dimension h mod m instead of a random one (see HOO)
         """
-        super().__init__(state, v1=v1, ce=ce)
+        super().__init__(state, v1=v1, ce=ce, staleness=staleness,
+                         backend=backend, rng=rng,
+                         cyclic_splits=cyclic_splits)
 
-        self.root = HOONode(state.action_space, max_depth=max_depth)
+        self.root = self.new_root(max_depth=max_depth)
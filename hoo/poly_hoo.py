@@ -13,6 +13,7 @@ from pydantic import BaseModel
 from hoo.hoo import HOO
 from hoo.hoo_node import HOONode
 from hoo.state_actions.hoo_state import HOOState
+from hoo.utils.rng import BlockRNG, Seed
 
 
 class PolyHOOConstants(BaseModel):
@@ -30,6 +31,10 @@ class PolyHOO(HOO):
         v1: Optional[float] = None,
         ce: float = 1.,
         polyhoo_constants: PolyHOOConstants = PolyHOOConstants(),
+        staleness: float = 0.,
+        backend: str = "object",
+        rng: Union[BlockRNG, Seed, None] = None,
+        cyclic_splits: bool = False,
     ):
         """
         Initializes the Poly-HOO algorithm
@@ -41,10 +46,18 @@ class PolyHOO(HOO):
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it is
             polyhoo_constants: constants alpha, xi and eta used in Poly-HOO
+            staleness: relative staleness allowed on the exploration term of
+                the nodes outside the current path (see HOO)
+            backend: storage of the tree, either "object" or "array"
+            rng: random generator of the search (see HOO)
+            cyclic_splits: if True the nodes at depth h are split along the
+                dimension h mod m instead of a random one (see HOO)
         """
-        super().__init__(state, v1=v1, ce=ce)
+        super().__init__(state, v1=v1, ce=ce, staleness=staleness,
+                         backend=backend, rng=rng,
+                         cyclic_splits=cyclic_splits)
 
-        self.root = HOONode(state.action_space, max_depth=max_depth)
+        self.root = self.new_root(max_depth=max_depth)
         self.constants = polyhoo_constants
 
     def update_U_B(self, node: HOONode, t: int) -> None:
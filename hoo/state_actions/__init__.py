@@ -1,6 +1,8 @@
 from hoo.state_actions.hoo_state import HOOState
+from hoo.state_actions.simulation_cache import SimulationCache
 
 
 __all__ = [
     "HOOState",
+    "SimulationCache",
 ]
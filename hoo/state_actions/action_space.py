@@ -1,37 +1,135 @@
 """Module that implements a HOO action space"""
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import List, Tuple
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+import numpy as np
 import numpy.random as rnd
 
+if TYPE_CHECKING:
+    from hoo.utils.rng import BlockRNG
+
+
 
 class HOOActionSpace:
+    """
+    Immutable box of actions, stored as read-only arrays of lower and upper
+    bounds
+
+    The center and width are computed once. Splitting shares the bounds that
+    do not change with the new spaces and only copies the one that is cut.
+
+    The halves of each split are interned: while they are alive, splitting
+    the space again along the same dimension returns the same objects. As
+    every HOO tree of a HOOT search starts from the environment's action
+    space, the trees share one copy of each cell (a cell is identified by its
+    path of splits from the root space), and only their statistics are kept
+    per tree.
+    """
+
+    __slots__ = (
+        "_low", "_high", "_center", "_width", "_halves",
+        "__weakref__",
+    )
+
+    def __init__(self, space: List[Tuple[float, float]]):
+        """
+        Initializes an action space
+
+        Args:
+            space: a list with the (lower, upper) bounds of each dimension
+        """
+        bounds = np.array(space, dtype=np.float64).reshape(-1, 2)
 
-    space: List[Tuple(float, float)]
+        self.set_bounds(bounds[:, 0].copy(), bounds[:, 1].copy())
 
-    def __init__(self, space: List[Tuple(float, float)]):
-        self.space = space
+    @classmethod
+    def from_arrays(cls, low: np.ndarray, high: np.ndarray) -> HOOActionSpace:
+        """
+        Creates an action space from arrays of bounds without copying them
+
+        Args:
+            low: read-only array of float64 with the lower bounds
+            high: read-only array of float64 with the upper bounds
+        Returns:
+            A new HOOActionSpace
+        """
+        action_space = cls.__new__(cls)
+        action_space.set_bounds(low, high)
+
+        return action_space
+
+    def set_bounds(self, low: np.ndarray, high: np.ndarray) -> None:
+        low.flags.writeable = False
+        high.flags.writeable = False
+
+        self._low = low
+        self._high = high
+        self._center = tuple(((low + high) / 2.0).tolist())
+        self._width = high - low
+        self._width.flags.writeable = False
+
+        # Weak references to the halves of each split dimension, so the
+        # cells are freed with the last tree that uses them
+        self._halves: Dict[int, Tuple[weakref.ref, weakref.ref]] = {}
+
+    def __getstate__(self):
+        return self._low, self._high
+
+    def __setstate__(self, state) -> None:
+        low, high = state
+        self.set_bounds(low.copy(), high.copy())
+
+    @property
+    def space(self) -> List[Tuple[float, float]]:
+        return list(zip(self._low.tolist(), self._high.tolist()))
 
     @property
     def dim(self) -> int:
-        return len(self.space)
+        return len(self._low)
 
     @property
     def center(self) -> List[float]:
-        return [(a + b) / 2.0 for a, b in self.space]
+        # Cached as a tuple, so the callers get their own list
+        return list(self._center)
 
     @property
     def low(self) -> List[float]:
-        return [a for a, _ in self.space]
+        return self._low.tolist()
 
     @property
     def high(self) -> List[float]:
-        return [b for _, b in self.space]
+        return self._high.tolist()
 
-    def sample(self) -> List[float]:
-        return [rnd.uniform(a, b) for a, b in self.space]
+    @property
+    def low_array(self) -> np.ndarray:
+        return self._low
+
+    @property
+    def high_array(self) -> np.ndarray:
+        return self._high
+
+    @property
+    def width(self) -> np.ndarray:
+        return self._width
+
+    def sample(self, rng: Optional[BlockRNG] = None) -> List[float]:
+        """
+        Samples an action uniformly from the space
+
+        Args:
+            rng: random generator. If None, the global NumPy RNG is used
+        Returns:
+            The sampled action
+        """
+        if rng is not None:
+            return rng.uniform(self._low, self._width)
+
+        # Same draws and values as one rnd.uniform call per dimension
+        draws = rnd.random_sample(len(self._low))
+
+        return (self._low + self._width * draws).tolist()
 
     def split(self, split_dimension) -> Tuple[HOOActionSpace]:
         """
@@ -40,16 +138,28 @@ class HOOActionSpace:
         Returns:
             A tuple with the two halfway partitions of the space
         """
+        halves = self._halves.get(split_dimension)
+
+        if halves is not None:
+            lower_space, upper_space = halves[0](), halves[1]()
+
+            if lower_space is not None and upper_space is not None:
+                return lower_space, upper_space
+
         boundary = (
-            self.low[split_dimension] + self.high[split_dimension]
+            self._low.item(split_dimension) + self._high.item(split_dimension)
         ) / 2.0
 
-        lower = deepcopy(self.space)
-        lower[split_dimension] = (lower[split_dimension][0], boundary)
-        lower_space = HOOActionSpace(lower)
+        lower_high = self._high.copy()
+        lower_high[split_dimension] = boundary
+        lower_space = HOOActionSpace.from_arrays(self._low, lower_high)
+
+        upper_low = self._low.copy()
+        upper_low[split_dimension] = boundary
+        upper_space = HOOActionSpace.from_arrays(upper_low, self._high)
 
-        upper = deepcopy(self.space)
-        upper[split_dimension] = (boundary, upper[split_dimension][1])
-        upper_space = HOOActionSpace(upper)
+        self._halves[split_dimension] = (
+            weakref.ref(lower_space), weakref.ref(upper_space)
+        )
 
         return lower_space, upper_space
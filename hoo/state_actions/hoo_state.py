@@ -3,8 +3,12 @@ from __future__ import annotations
 
 from copy import deepcopy
 from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import numpy as np
 
 from hoo.environments.environment import Environment
+from hoo.state_actions.action_space import HOOActionSpace
 
 
 @dataclass
@@ -15,31 +19,78 @@ class SimulateOutput:
     done: bool
 
 
+@dataclass
+class BatchSimulateOutput:
+
+    rewards: np.ndarray
+    dones: np.ndarray
+
+
 class HOOState:
 
-    def __init__(self, env_state: Environment) -> None:
+    def __init__(
+        self,
+        env_state: Environment,
+        snapshot: Optional[Any] = None,
+        action_space: Optional[HOOActionSpace] = None,
+    ) -> None:
         """
         Initializes a HOOState instance
 
+        When the environment supports snapshots, the states that follow from
+        simulating actions share the same environment instance and each one
+        only keeps a snapshot of the environment's physical state.
+
         Args:
             env_state: an instance of an Environment
+            snapshot: snapshot of env_state that defines this state. If None
+                and the environment supports snapshots, one is taken from the
+                current environment state
+            action_space: the HOO action space of the environment. If None,
+                it is taken from env_state
         """
         self.env_state = env_state
-        self.action_space = env_state.hoo_action_space
+        self.action_space = (
+            action_space if action_space is not None
+            else env_state.hoo_action_space
+        )
+
+        if snapshot is None and env_state.supports_snapshot:
+            snapshot = env_state.snapshot()
+
+        self.snapshot = snapshot
 
-    def simulate(self, action) -> SimulateOutput:
+    def simulate(
+        self,
+        action,
+        env: Optional[Environment] = None,
+    ) -> SimulateOutput:
         """
         Simulates an action in this state
 
         Args:
             action: an action to be simulated
+            env: environment used to do the step when snapshots are supported,
+                e.g. a copy owned by a thread. The next state is still bound to
+                this state's environment. If None, this state's environment is
+                used
         Returns:
             An instance of SimulateOutput which contains the next state,
                 the reward of doing the input action and a boolean (done)
                 that informs if the action leads to a terminal state
         """
-        next_env_state = deepcopy(self)
-        action_output = next_env_state.env_state.step(action)
+        if self.snapshot is None:
+            next_env_state = deepcopy(self)
+            action_output = next_env_state.env_state.step(action)
+        else:
+            step_env = env if env is not None else self.env_state
+            step_env.restore(self.snapshot)
+            action_output = step_env.step(action)
+            next_env_state = HOOState(
+                self.env_state,
+                snapshot=step_env.snapshot(),
+                action_space=self.action_space,
+            )
 
         return SimulateOutput(
             next_state=next_env_state,
@@ -47,6 +98,41 @@ class HOOState:
             done=action_output.done,
         )
 
+    def simulate_batch(self, actions: List) -> BatchSimulateOutput:
+        """
+        Simulates a batch of actions, each one from this state
+
+        When the environment supports snapshots and batched steps, all the
+        actions are evaluated with a single call to step_batch. Otherwise they
+        are simulated one at a time. The next states are not kept.
+
+        Args:
+            actions: a list of actions to be simulated
+        Returns:
+            An instance of BatchSimulateOutput with the rewards and dones of
+                the actions
+        """
+        if self.snapshot is None or not self.env_state.supports_batch:
+            outputs = [self.simulate(action) for action in actions]
+
+            return BatchSimulateOutput(
+                rewards=np.array([output.reward for output in outputs]),
+                dones=np.array([output.done for output in outputs]),
+            )
+
+        self.env_state.restore(self.snapshot)
+        states = np.repeat(
+            np.asarray(self.env_state.state)[np.newaxis], len(actions), axis=0
+        )
+        batch_output = self.env_state.step_batch(
+            states, np.asarray(actions, dtype=np.float64)
+        )
+
+        return BatchSimulateOutput(
+            rewards=batch_output.rewards,
+            dones=batch_output.dones,
+        )
+
     @property
     def dimension(self) -> int:
         return self.action_space.dim
@@ -56,4 +142,7 @@ class HOOState:
         return self.env_state.max_reward
     
     def get_state(self):
+        if self.snapshot is not None:
+            self.env_state.restore(self.snapshot)
+
         return self.env_state.get_state()
@@ -0,0 +1,91 @@
+"""
+Module that implements an LRU cache of simulations
+
+In deterministic environments, simulating the same action from the same state
+always gives the same output. HOOT simulates the same (state, action) pairs
+many times, e.g. when the tree of the previous decision is rebuilt or when
+the actions are the centers of the HOO nodes, so the outputs are cached by
+the state vector and the action. The simulations of stochastic environments
+bypass the cache.
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+import numpy as np
+
+from hoo.state_actions.hoo_state import HOOState, SimulateOutput
+
+
+class SimulationCache:
+
+    def __init__(self, max_size: int = 10000) -> None:
+        """
+        Initializes an empty cache
+
+        Args:
+            max_size: maximum number of cached simulations. When it is
+                exceeded, the least recently used one is evicted
+        """
+        if max_size < 1:
+            raise ValueError("The size of the cache should be positive")
+
+        self.max_size = max_size
+        self.outputs: OrderedDict[Hashable, SimulateOutput] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def simulate(self, state: HOOState, action) -> SimulateOutput:
+        """
+        Simulates an action in a state, or returns the cached output
+
+        Args:
+            state: the state where the action is simulated
+            action: an action to be simulated
+        Returns:
+            An instance of SimulateOutput. Cached outputs are shared, so
+                their next states should not be modified
+        """
+        if not state.env_state.deterministic:
+            self.bypasses += 1
+            return state.simulate(action)
+
+        key = (
+            tuple(state.get_state()),
+            tuple(np.asarray(action, dtype=np.float64).ravel().tolist()),
+        )
+        simulation_output = self.outputs.get(key)
+
+        if simulation_output is not None:
+            self.hits += 1
+            self.outputs.move_to_end(key)
+            return simulation_output
+
+        self.misses += 1
+        simulation_output = state.simulate(action)
+        self.outputs[key] = simulation_output
+
+        if len(self.outputs) > self.max_size:
+            self.outputs.popitem(last=False)
+
+        return simulation_output
+
+    def clear(self) -> None:
+        self.outputs.clear()
+
+    def statistics(self) -> Dict[str, float]:
+        """
+        Returns:
+            A dictionary with the number of cached simulations, the hits,
+                misses and bypasses of the lookups and the hit rate
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self.outputs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.,
+        }
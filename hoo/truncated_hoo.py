@@ -3,19 +3,28 @@ Module that implements Truncated Hierarchical Optimistic Optimization (t-HOO)
 https://arxiv.org/abs/1001.4475
 """
 import math
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from hoo.hoo import HOO
+from hoo.hoo import BACKENDS, HOO, TreeStatistics
+from hoo.hoo_node import HOONode
 from hoo.state_actions.hoo_state import HOOState
+from hoo.truncated_tree import TruncatedTree
+from hoo.utils.budget import time_steps
+from hoo.utils.rng import BlockRNG, Seed
 
 
 class tHOO(HOO):
 
+    backends = BACKENDS + ["flat"]
+
     def __init__(
         self,
         state: HOOState,
         v1: Optional[float] = None,
         ce: float = 1.,
+        backend: str = "object",
+        rng: Union[BlockRNG, Seed, None] = None,
+        doubling: bool = False,
     ):
         """
         Initializes Truncated HOO algorithm
@@ -25,21 +34,152 @@ class tHOO(HOO):
             v1: parameter of the algorithm as defined in the paper
             ce: exploration constant that gives more emphasis to exploring
                 less appealing nodes the higher it its
+            backend: storage of the tree, either "object", "array" or "flat"
+                (a TruncatedTree, whose runs only do scalar updates along
+                the path and are several times faster)
+            rng: random generator of the search (see HOO)
+            doubling: if True the horizon n0 does not need to be known. It
+                starts at 1 and is doubled whenever the time-step, counted
+                over all the runs, reaches it, recomputing the B-values of
+                the tree with the new exploration term (the tree is kept)
         """
-        super().__init__(state, v1=v1, ce=ce)
+        super().__init__(state, v1=v1, ce=ce, backend=backend, rng=rng)
+
+        self.doubling = doubling
+        self.n0 = 1 if doubling else None
+
+        # Iterations backpropagated by all the runs
+        self.time_step = 0
+
+        if backend == "flat" and doubling:
+            self.tree.set_horizon(self.n0, self.ce, self.v1, self.rho)
+
+    def new_root(
+        self,
+        max_depth: Union[int, float] = float("inf"),
+    ) -> HOONode:
+        if self.backend == "flat":
+            self.tree = TruncatedTree(self.state.action_space, rng=self.rng)
+            return self.tree.node(0)
 
-    def run(self, n: int, sample: bool = True) -> List[float]:
+        return super().new_root(max_depth)
+
+    def run(
+        self,
+        n: Optional[int],
+        sample: bool = True,
+        time_budget: Optional[float] = None,
+    ) -> List[float]:
         """
         Runs n iterations of tHOO
 
+        tHOO needs the horizon n in its U-values, so a time budget can only
+        stop the run earlier, unless the horizon is doubled (see doubling).
+
+        Args:
+            n: number of iterations to run the algorithm (None for no limit,
+                only with doubling)
+            time_budget: wall-clock time of the run in seconds (see HOO.run)
+        Returns:
+            A recommended action sampled from the best node
+        """
+        if not self.doubling:
+            if n is None:
+                raise ValueError("tHOO needs the number of iterations n")
+
+            self.set_horizon(n)
+
+        if (
+            self.backend != "flat"
+            or self.profiler is not None
+            or self.best_tracker is not None
+        ):
+            return super().run(n, sample=sample, time_budget=time_budget)
+
+        self.n_iterations = self.tree.run(
+            self.state,
+            time_steps(n, time_budget),
+            sample=sample,
+            doubling=self.doubling,
+            previous_steps=self.time_step,
+        )
+        self.time_step += self.n_iterations
+        self.n0 = self.tree.horizon
+
+        return self.choose_best_action(sample=sample)
+
+    def run_batched(
+        self,
+        n: int,
+        batch_size: int,
+        sample: bool = True,
+        virtual_reward: float = 0.,
+    ) -> List[float]:
+        """
+        Runs n iterations of tHOO in rounds of batch_size iterations (see
+        HOO.run_batched)
+
         Args:
             n: number of iterations to run the algorithm
+            batch_size: number of iterations per round
         Returns:
             A recommended action sampled from the best node
         """
-        self.n0 = n
+        if not self.doubling:
+            self.set_horizon(n)
+
+        return super().run_batched(
+            n, batch_size, sample=sample, virtual_reward=virtual_reward
+        )
+
+    def set_horizon(self, n0: int) -> None:
+        """
+        Sets the horizon n0 used in the exploration term of the U-values
 
-        return super().run(n, sample=sample)
+        As in the original algorithm, the B-values of a node are only
+        recomputed with the new horizon when it is in a path again.
+        """
+        self.n0 = n0
+
+        if self.backend == "flat":
+            self.tree.set_horizon(n0, self.ce, self.v1, self.rho)
+
+    def double_horizon(self) -> None:
+        """
+        Doubles the horizon n0 and recomputes the B-values of the whole tree
+        with the new exploration term
+        """
+        if self.backend == "flat":
+            self.set_horizon(2 * self.n0)
+            self.tree.refresh_B()
+            return
+
+        self.n0 *= 2
+        log_n0 = math.log(self.n0)
+
+        if self.tree is not None:
+            self.tree.update_B(log_n0, self.ce, self.v1, self.rho)
+            return
+
+        nodes = []
+        stack = [self.root]
+
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack += node.children
+
+        # Children come after their parent, so they are updated first
+        for node in reversed(nodes):
+            if node.N == 0:
+                continue
+
+            u = self.compute_U(node, log_n0)
+
+            if node.leaf():
+                node.B = u
+            else:
+                node.B = min(u, max([x.B for x in node.children]))
 
     def update_B(self):
         """
@@ -60,7 +200,12 @@ class tHOO(HOO):
             node.B = min(u, max([x.B for x in node.children]))
             node = node.parent
 
-    def backpropagate(self, reward: float, t: int) -> None:
+    def backpropagate(
+        self,
+        reward: float,
+        t: int,
+        path: Optional[List[HOONode]] = None,
+    ) -> None:
         """
         Updates visited nodes information and all nodes' U and B-values
 
@@ -70,10 +215,49 @@ class tHOO(HOO):
         Args:
             reward: reward to be backpropagated
             t: time-step of the algorithm
+            path: path of nodes to be updated. If None, the last path
+                generated is used
         """
+        if path is not None:
+            self.path = path
 
         for node in self.path:
             node.N += 1
             node.R += reward
 
-        self.update_B()
+        if self.best_tracker is not None:
+            self.best_tracker.update(self.path)
+
+        if self.profiler is None:
+            self.update_B()
+        else:
+            with self.profiler.timer("update_B"):
+                self.update_B()
+
+        self.time_step += 1
+
+        if self.doubling and self.time_step >= self.n0:
+            self.double_horizon()
+
+    def backpropagate_batch(
+        self,
+        rewards: List[float],
+        t: int,
+        paths: List[List[HOONode]],
+    ) -> None:
+        """
+        Updates the nodes and the B-values of several paths
+
+        Args:
+            rewards: rewards to be backpropagated, one per path
+            t: time-step of the algorithm after the last path
+            paths: paths of nodes to be updated
+        """
+        for path, reward in zip(paths, rewards):
+            self.backpropagate(reward, t, path=path)
+
+    def tree_statistics(self) -> TreeStatistics:
+        if self.backend == "flat":
+            return self.tree.statistics()
+
+        return super().tree_statistics()
@@ -0,0 +1,591 @@
+"""
+Module that implements a flat, incremental tree for Truncated HOO (t-HOO)
+
+t-HOO only updates the B-values of the nodes in the current path, with the
+exploration term of the fixed horizon n0. The statistics of the nodes are
+kept in flat lists indexed by node id, and the exploration term of each
+number of visits and the term v1 * rho**h of each depth are computed once, so
+an iteration only does scalar list operations along its path. The cells of
+the nodes are not stored: the cell of the selected leaf is computed while
+descending from the root, and the cell of any other node is rebuilt from its
+path of splits.
+
+Nodes are accessed through TruncatedHOONode, a lightweight view with the same
+interface as HOONode, so the rest of HOO (best node, top-k actions, tree
+statistics) also works with this tree.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+import numpy as np
+import numpy.random as rnd
+
+from hoo.hoo import TreeStatistics
+from hoo.state_actions.action_space import HOOActionSpace
+from hoo.state_actions.hoo_state import HOOState
+
+if TYPE_CHECKING:
+    from hoo.utils.rng import BlockRNG
+
+
+# Number of visits whose exploration term is kept in the table. Only the
+# nodes closest to the root get more visits, and they use the formula
+MAX_BONUS_TABLE = 2**16
+
+
+class TruncatedTree:
+    """
+    Binary t-HOO tree whose nodes are stored as entries of flat lists
+
+    The two children of a node are always allocated together, so only the id
+    of the lower child is stored (the upper child is the next id).
+    """
+
+    def __init__(
+        self,
+        action_space: HOOActionSpace,
+        rng: Optional[BlockRNG] = None,
+    ) -> None:
+        """
+        Initializes a TruncatedTree with a single root node
+
+        Args:
+            action_space: the action space where the search will be done
+            rng: random generator of the search. If None, the global NumPy
+                RNG is used
+        """
+        self.dim = action_space.dim
+        self.rng = rng
+        self.root_low = action_space.low
+        self.root_high = action_space.high
+
+        self.N: List[int] = []
+        self.R: List[float] = []
+        self.B: List[float] = []
+        self.depth = array("i")
+        self.split_dimension = array("i")
+        self.child = array("q")
+        self.parent = array("q")
+
+        # Set by set_horizon
+        self.horizon = None
+        self.ce = None
+        self.two_log_horizon = None
+        self.bonus: List[float] = []
+        self.v1 = None
+        self.rho = None
+        self.depth_terms: List[float] = []
+
+        self.add_node(0, -1)
+
+    def __len__(self) -> int:
+        return len(self.N)
+
+    def node(self, index: int) -> TruncatedHOONode:
+        return TruncatedHOONode(self, index)
+
+    def draw_dimension(self) -> int:
+        # Same draw as rnd.choice(np.arange(self.dim))
+        if self.rng is None:
+            return rnd.randint(self.dim)
+
+        return self.rng.integer(self.dim)
+
+    def add_node(self, depth: int, parent: int) -> int:
+        """
+        Allocates a new node
+
+        Args:
+            depth: depth of the node in the tree
+            parent: id of the parent node (-1 for the root)
+        Returns:
+            The id of the new node
+        """
+        self.N.append(0)
+        self.R.append(0.)
+        self.B.append(math.inf)
+        self.depth.append(depth)
+        self.split_dimension.append(self.draw_dimension())
+        self.child.append(-1)
+        self.parent.append(parent)
+
+        return len(self.N) - 1
+
+    def generate_children(self, index: int) -> None:
+        """
+        Generates the two children of a node
+
+        Args:
+            index: id of the node to be expanded
+        """
+        depth = self.depth[index] + 1
+
+        self.child[index] = self.add_node(depth, index)
+        self.add_node(depth, index)
+
+    def cell(self, index: int) -> Tuple[List[float], List[float]]:
+        """
+        Rebuilds the cell of a node by replaying the splits from the root
+
+        Returns:
+            The lists of lower and upper bounds of the cell
+        """
+        path = [index]
+
+        while self.parent[path[-1]] >= 0:
+            path.append(self.parent[path[-1]])
+
+        low = list(self.root_low)
+        high = list(self.root_high)
+
+        for node, next_node in zip(reversed(path), reversed(path[:-1])):
+            dimension = self.split_dimension[node]
+            boundary = (low[dimension] + high[dimension]) / 2.0
+
+            if next_node == self.child[node]:
+                high[dimension] = boundary
+            else:
+                low[dimension] = boundary
+
+        return low, high
+
+    def set_horizon(
+        self,
+        horizon: int,
+        ce: float,
+        v1: float,
+        rho: float,
+    ) -> None:
+        """
+        Sets the horizon n0 of the exploration term
+
+        The B-values are not recomputed (see refresh_B), so the nodes keep
+        the ones of the previous horizon until they are in a path again. The
+        table of exploration terms has one entry per number of visits up to
+        the horizon (at most MAX_BONUS_TABLE), as no node is visited more
+        often within it. It is kept while the horizon and ce do not change,
+        e.g. over the runs of consecutive decisions.
+
+        Args:
+            horizon: number of iterations n0
+            ce: exploration constant
+            v1: parameter of the algorithm as defined in the paper
+            rho: parameter of the algorithm as defined in the paper
+        """
+        if (horizon, ce) != (self.horizon, self.ce):
+            self.horizon = horizon
+            self.ce = ce
+            self.two_log_horizon = 2.0 * math.log(horizon)
+            self.bonus = [math.inf] + [
+                ce * math.sqrt(self.two_log_horizon / n)
+                for n in range(1, min(horizon, MAX_BONUS_TABLE) + 1)
+            ]
+
+        if (v1, rho) != (self.v1, self.rho):
+            self.v1 = v1
+            self.rho = rho
+            self.depth_terms = []
+
+        self.extend_depth_terms(max(self.depth) + 1)
+
+    def extend_depth_terms(self, length: int) -> None:
+        while len(self.depth_terms) < length:
+            self.depth_terms.append(
+                self.v1 * (self.rho**len(self.depth_terms))
+            )
+
+    def compute_U(self, index: int) -> float:
+        """
+        Computes the U-value of a visited node
+        """
+        n = self.N[index]
+        bonus = (
+            self.bonus[n] if n < len(self.bonus)
+            else self.ce * math.sqrt(self.two_log_horizon / n)
+        )
+
+        return self.R[index] / n + bonus + self.depth_terms[self.depth[index]]
+
+    def refresh_B(self) -> None:
+        """
+        Recomputes the B-values of every visited node (but the root, whose
+        B-value is never used), e.g. after the horizon changed
+
+        A child always has a larger id than its parent, so going through the
+        ids in decreasing order updates the children first.
+        """
+        for index in range(len(self.N) - 1, 0, -1):
+            if self.N[index] == 0:
+                continue
+
+            u = self.compute_U(index)
+            child = self.child[index]
+
+            if child < 0:
+                self.B[index] = u
+            else:
+                self.B[index] = min(
+                    u, max(self.B[child], self.B[child + 1])
+                )
+
+    def run(
+        self,
+        state: HOOState,
+        time_steps: Iterable[int],
+        sample: bool = True,
+        doubling: bool = False,
+        previous_steps: int = 0,
+    ) -> int:
+        """
+        Runs t-HOO iterations on a state
+
+        Each iteration descends from the root to a leaf following the
+        children with the highest B-value (ties are broken at random), keeping
+        the cell of the current node, expands the leaf, simulates an action
+        of its cell and updates the statistics and B-values of the path from
+        the bottom up. It is the same as HOO.iterate on a tHOO tree, with the
+        same random draws.
+
+        Args:
+            state: the state whose actions are searched
+            time_steps: time-steps of the iterations (see
+                hoo.utils.budget.time_steps)
+            sample: if True the actions are sampled from the leaves' cells,
+                otherwise they are their centers
+            doubling: if True the horizon is doubled (and the B-values
+                recomputed) whenever the running time-step reaches it
+            previous_steps: number of iterations of the previous runs on this
+                tree, which the running time-step starts from
+        Returns:
+            The last time-step of this run
+        """
+        N, R, B = self.N, self.R, self.B
+        child = self.child
+        split_dimension = self.split_dimension
+        depth_terms = self.depth_terms
+        rng = self.rng
+        dim = self.dim
+        root_low = self.root_low
+        root_high = self.root_high
+        sqrt = math.sqrt
+
+        if rng is None:
+            draw_tie = rnd.randint
+            draw_uniform = rnd.random_sample
+        else:
+            draw_tie = rng.integer
+
+            def draw_uniform(n):
+                return rng.random(n)
+
+        ce = self.ce
+        two_log_horizon = self.two_log_horizon
+        bonus = self.bonus
+        n_bonus = len(bonus)
+        t = 0
+
+        for t in time_steps:
+            # Selection
+            node = 0
+            path = [0]
+            low = list(root_low)
+            high = list(root_high)
+            lower = child[0]
+
+            while lower >= 0:
+                lower_B = B[lower]
+                upper_B = B[lower + 1]
+                dimension = split_dimension[node]
+                boundary = (low[dimension] + high[dimension]) / 2.0
+
+                if lower_B > upper_B or (
+                    lower_B == upper_B and draw_tie(2) == 0
+                ):
+                    node = lower
+                    high[dimension] = boundary
+                else:
+                    node = lower + 1
+                    low[dimension] = boundary
+
+                path.append(node)
+                lower = child[node]
+
+            self.generate_children(node)
+
+            if len(depth_terms) < len(path):
+                self.extend_depth_terms(len(path))
+
+            # Simulation
+            if sample:
+                draws = draw_uniform(dim).tolist()
+                action = [
+                    l + (h - l) * u for l, h, u in zip(low, high, draws)
+                ]
+            else:
+                action = [(l + h) / 2.0 for l, h in zip(low, high)]
+
+            reward = state.simulate(action).reward
+
+            # Backpropagation, from the leaf up to the root's children
+            for h in range(len(path) - 1, 0, -1):
+                node = path[h]
+                n = N[node] + 1
+                N[node] = n
+                r = R[node] + reward
+                R[node] = r
+
+                u = (
+                    r / n
+                    + (bonus[n] if n < n_bonus
+                       else ce * sqrt(two_log_horizon / n))
+                    + depth_terms[h]
+                )
+
+                lower = child[node]
+                lower_B = B[lower]
+                upper_B = B[lower + 1]
+                b = upper_B if upper_B > lower_B else lower_B
+                B[node] = b if b < u else u
+
+            N[0] += 1
+            R[0] += reward
+
+            if doubling and previous_steps + t >= self.horizon:
+                self.set_horizon(2 * self.horizon, ce, self.v1, self.rho)
+                self.refresh_B()
+                two_log_horizon = self.two_log_horizon
+                bonus = self.bonus
+                n_bonus = len(bonus)
+                depth_terms = self.depth_terms
+
+        return t
+
+    def average_rewards(self, v1: float, rho: float) -> np.ndarray:
+        """
+        Computes the average reward of every node (-inf if never visited)
+
+        Returns:
+            An array indexed by node id
+        """
+        n = np.array(self.N, dtype=np.int64)
+        average = np.full(len(n), -math.inf)
+        visited = n > 0
+        depth_terms = np.array(
+            [v1 * (rho**h) for h in range(max(self.depth) + 1)]
+        )
+        average[visited] = (
+            np.array(self.R)[visited] / n[visited]
+            - depth_terms[np.frombuffer(self.depth, dtype=np.int32)[visited]]
+        )
+
+        return average
+
+    def path_code(self, index: int) -> List[int]:
+        """
+        Computes the sequence of child positions (0 or 1) from the root to
+        a node, which orders nodes in pre-order
+        """
+        code = []
+        parent = self.parent[index]
+
+        while parent >= 0:
+            code.append(index - self.child[parent])
+            index = parent
+            parent = self.parent[index]
+
+        return code[::-1]
+
+    def best_node(self, v1: float, rho: float) -> int:
+        """
+        Finds the node with the highest average reward
+
+        Ties are broken as in HOO.choose_best_node, in favor of the node that
+        comes last in a pre-order traversal of the tree.
+
+        Returns:
+            The id of the best node
+        """
+        average = self.average_rewards(v1, rho)
+        candidates = np.flatnonzero(average == average.max())
+
+        if len(candidates) == 1:
+            return candidates.item(0)
+
+        return max(candidates.tolist(), key=self.path_code)
+
+    def statistics(self) -> TreeStatistics:
+        """
+        Collects the cells and statistics of the visited nodes of the tree
+
+        Returns:
+            An instance of TreeStatistics
+        """
+        visited = [index for index, n in enumerate(self.N) if n > 0]
+        cells = [self.cell(index) for index in visited]
+
+        return TreeStatistics(
+            low=np.array([low for low, _ in cells]).reshape(-1, self.dim),
+            high=np.array([high for _, high in cells]).reshape(-1, self.dim),
+            depth=np.array(
+                [self.depth[index] for index in visited], dtype=np.int32
+            ),
+            N=np.array([self.N[index] for index in visited], dtype=np.int64),
+            R=np.array(
+                [self.R[index] for index in visited], dtype=np.float64
+            ),
+        )
+
+
+class TruncatedHOONode:
+    """
+    View of a node of a TruncatedTree with the same interface as HOONode
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: TruncatedTree, index: int) -> None:
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, TruncatedHOONode)
+            and self.tree is other.tree
+            and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    @property
+    def N(self) -> int:
+        return self.tree.N[self.index]
+
+    @N.setter
+    def N(self, value: int) -> None:
+        self.tree.N[self.index] = value
+
+    @property
+    def R(self) -> float:
+        return self.tree.R[self.index]
+
+    @R.setter
+    def R(self, value: float) -> None:
+        self.tree.R[self.index] = value
+
+    @property
+    def B(self) -> float:
+        return self.tree.B[self.index]
+
+    @B.setter
+    def B(self, value: float) -> None:
+        self.tree.B[self.index] = value
+
+    @property
+    def h(self) -> int:
+        return self.tree.depth[self.index]
+
+    @property
+    def max_depth(self) -> float:
+        return float("inf")
+
+    @property
+    def split_dimension(self) -> int:
+        return self.tree.split_dimension[self.index]
+
+    @property
+    def parent(self) -> Optional[TruncatedHOONode]:
+        parent = self.tree.parent[self.index]
+        return TruncatedHOONode(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List[TruncatedHOONode]:
+        child = self.tree.child[self.index]
+
+        if child < 0:
+            return []
+
+        return [TruncatedHOONode(self.tree, child),
+                TruncatedHOONode(self.tree, child + 1)]
+
+    @property
+    def action_space(self) -> HOOActionSpace:
+        low, high = self.tree.cell(self.index)
+
+        return HOOActionSpace.from_arrays(np.array(low), np.array(high))
+
+    @property
+    def dimension(self) -> int:
+        return self.tree.dim
+
+    @property
+    def low(self) -> List[float]:
+        return self.tree.cell(self.index)[0]
+
+    @property
+    def high(self) -> List[float]:
+        return self.tree.cell(self.index)[1]
+
+    @property
+    def center(self) -> List[float]:
+        low, high = self.tree.cell(self.index)
+        return [(l + h) / 2.0 for l, h in zip(low, high)]
+
+    @property
+    def key(self) -> int:
+        return self.index
+
+    def is_max_depth(self) -> bool:
+        return False
+
+    def leaf(self) -> bool:
+        return self.tree.child[self.index] < 0
+
+    def root(self) -> bool:
+        return self.index == 0
+
+    def sample(self) -> List[float]:
+        return self.action_space.sample(rng=self.tree.rng)
+
+    def generate_children(self) -> None:
+        if self.tree.child[self.index] < 0:
+            self.tree.generate_children(self.index)
+
+    def choose_child(self) -> TruncatedHOONode:
+        """
+        Randomly chooses from the children nodes that have the highest
+        B-value
+
+        Returns:
+            The selected children node
+        """
+        child = self.tree.child[self.index]
+        lower_B = self.tree.B[child]
+        upper_B = self.tree.B[child + 1]
+
+        if lower_B > upper_B:
+            return TruncatedHOONode(self.tree, child)
+        if upper_B > lower_B:
+            return TruncatedHOONode(self.tree, child + 1)
+
+        choice = (
+            rnd.randint(2) if self.tree.rng is None
+            else self.tree.rng.integer(2)
+        )
+
+        return TruncatedHOONode(self.tree, child + choice)
+
+    def average_reward(self, v1, rho) -> float:
+        """
+        Calculates the average reward of the node
+
+        Return:
+            Average reward
+        """
+        if self.N != 0:
+            return self.R / self.N - v1 * (rho**self.h)
+        else:
+            return -float("inf")
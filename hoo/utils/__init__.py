@@ -1,8 +1,10 @@
 from hoo.utils.tree import get_tree_info
 from hoo.utils.plot import plot_function_tree
+from hoo.utils.profiler import Profiler
 
 
 __all__ = [
     "get_tree_info",
     "plot_function_tree",
+    "Profiler",
 ]
@@ -0,0 +1,41 @@
+"""
+Module with the iteration budget of the anytime runs of HOO and HOOT
+"""
+import time
+from typing import Iterator, Optional
+
+
+def time_steps(
+    n: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> Iterator[int]:
+    """
+    Generates the time-steps 1, 2, ... of a run that stops after n iterations
+    or once time_budget seconds have passed, whichever comes first
+
+    The clock is checked after each iteration, so at least one iteration is
+    run (if n is not 0) and the budget can be exceeded by one iteration.
+
+    Args:
+        n: maximum number of iterations (None for no limit)
+        time_budget: maximum wall-clock time of the run in seconds (None for
+            no limit)
+    Yields:
+        The time-step of each iteration
+    """
+    if n is None and time_budget is None:
+        raise ValueError("Either n or time_budget should be given")
+
+    deadline = (
+        time.perf_counter() + time_budget if time_budget is not None
+        else None
+    )
+    t = 1
+
+    while n is None or t <= n:
+        yield t
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            return
+
+        t += 1
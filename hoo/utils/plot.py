@@ -1,12 +1,14 @@
 from typing import Callable, Dict, Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 def plot_function_tree(
     tree_info: Dict,
     f: Callable,
-    max_depth: Optional[int] = None
+    max_depth: Optional[int] = None,
+    vectorized: bool = False,
 ):
     """
     Plots a function and HOO-based algorithm search tree
@@ -16,10 +18,13 @@ def plot_function_tree(
             N, h, R and B-value after running the algorithm
         f: function used to run the algorithm
         max_depth: maximum depth of the tree (LDHOO and PolyHOO)
+        vectorized: whether f evaluates an array of points at once (e.g.
+            if it is written with NumPy ufuncs). Otherwise, it is evaluated
+            one point at a time
     """
     
-    xx = [i/1000 for i in range(1001)]
-    y = [f(x) for x in xx]
+    xx = np.array([i/1000 for i in range(1001)])
+    y = f(xx) if vectorized else [f(x) for x in xx.tolist()]
     
     fig, ax1 = plt.subplots()
     
@@ -0,0 +1,75 @@
+"""
+Module that implements a profiler of the phases of HOO and HOOT
+
+The algorithms hold an optional Profiler (None by default). When it is set,
+they record the cumulative time and number of calls of each phase (selection,
+simulation, backpropagation and update_B) and count events such as created
+nodes, environment steps and deep copies. When it is None, the instrumented
+code is skipped with a single check.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class Profiler:
+
+    def __init__(self) -> None:
+        self.times: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """
+        Times the code run inside the context as one call of a phase
+
+        Args:
+            phase: name of the phase
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        Records one call of a phase
+
+        Args:
+            phase: name of the phase
+            seconds: duration of the call
+        """
+        self.times[phase] = self.times.get(phase, 0.) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(self, counter: str, n: int = 1) -> None:
+        """
+        Increments a counter
+
+        Args:
+            counter: name of the counter
+            n: increment
+        """
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def reset(self) -> None:
+        self.times = {}
+        self.calls = {}
+        self.counters = {}
+
+    def summary(self) -> Dict:
+        """
+        Returns:
+            A dictionary with the cumulative time and calls of each phase and
+                the value of each counter
+        """
+        return {
+            "phases": {
+                phase: {"time": self.times[phase], "calls": self.calls[phase]}
+                for phase in self.times
+            },
+            "counters": dict(self.counters),
+        }
@@ -0,0 +1,114 @@
+"""
+Module that implements a block random number generator for the HOO search
+
+By default, HOO and HOOT draw their random numbers (split dimensions,
+tie-breaks and action samples) one at a time from the global legacy NumPy
+RNG. A BlockRNG wraps a numpy.random.Generator owned by one search instead:
+the uniform numbers are drawn in blocks, which removes most of the per-call
+overhead, and parallel workers can get independent, reproducible streams by
+spawning child generators.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Union
+
+import numpy as np
+
+
+# Generators or seeds accepted by numpy.random.default_rng
+Seed = Union[np.random.Generator, np.random.SeedSequence, int]
+
+
+class BlockRNG:
+
+    def __init__(
+        self,
+        seed: Optional[Seed] = None,
+        block_size: int = 4096,
+    ) -> None:
+        """
+        Initializes a block RNG
+
+        Args:
+            seed: a Generator, or a seed of a new one (see
+                numpy.random.default_rng)
+            block_size: number of uniform numbers drawn at once
+        """
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+
+        self.block = self.generator.random(block_size)
+        self.position = 0
+
+    def refill(self, n: int) -> None:
+        """
+        Draws a new block with at least n numbers, keeping the ones that
+        were not used yet
+        """
+        self.block = np.concatenate([
+            self.block[self.position:],
+            self.generator.random(max(self.block_size, n)),
+        ])
+        self.position = 0
+
+    def random(self, n: int) -> np.ndarray:
+        """
+        Returns:
+            An array of n uniform numbers in [0, 1)
+        """
+        if self.position + n > len(self.block):
+            self.refill(n)
+
+        draws = self.block[self.position:self.position + n]
+        self.position += n
+
+        return draws
+
+    def integer(self, n: int) -> int:
+        """
+        Returns:
+            A uniform integer in [0, n)
+        """
+        if self.position == len(self.block):
+            self.refill(1)
+
+        draw = self.block.item(self.position)
+        self.position += 1
+
+        return min(int(draw * n), n - 1)
+
+    def uniform(self, low: np.ndarray, width: np.ndarray) -> List[float]:
+        """
+        Returns:
+            A point drawn uniformly from the box low + [0, width)
+        """
+        return (low + width * self.random(len(low))).tolist()
+
+    def spawn(self, n: int) -> List[BlockRNG]:
+        """
+        Creates independent child generators, e.g. for parallel workers
+
+        Args:
+            n: number of children
+        Returns:
+            A list of n BlockRNGs
+        """
+        return [
+            BlockRNG(generator, block_size=self.block_size)
+            for generator in self.generator.spawn(n)
+        ]
+
+
+def as_block_rng(rng: Union[BlockRNG, Seed, None]) -> Optional[BlockRNG]:
+    """
+    Wraps a Generator or a seed into a BlockRNG
+
+    Args:
+        rng: a BlockRNG (returned as is), a Generator, a seed, or None
+    Returns:
+        A BlockRNG, or None to keep using the global legacy RNG
+    """
+    if rng is None or isinstance(rng, BlockRNG):
+        return rng
+
+    return BlockRNG(rng)
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from hoo.hoo_node import HOONode
 
 
@@ -24,7 +22,7 @@ def get_tree_info(root_node: HOONode):
     }
 
     tree_info[root_node.center[0]] = node_info
-    children_list = deepcopy(root_node.children)
+    children_list = list(root_node.children)
 
     while children_list:
         node = children_list[0]
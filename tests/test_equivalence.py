@@ -0,0 +1,255 @@
+"""
+Regression tests of the equivalences that the optimizations of the search
+rely on, with fixed seeds
+"""
+import copy
+import math
+
+import numpy as np
+import pytest
+
+from hoo.benchmarks.batch_step import random_states, scalar_steps
+# Aliased so that pytest does not collect it as a test class
+from hoo.environments.test_function import TestFunction as Function
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT
+from hoo.hoo import HOO
+from hoo.hoot.hoot import HOOT
+from hoo.hoot.hoot_node import HOOTNode
+from hoo.ld_hoo import LDHOO
+from hoo.poly_hoo import PolyHOO
+from hoo.state_actions.hoo_state import HOOState
+from hoo.state_actions.simulation_cache import SimulationCache
+from hoo.truncated_hoo import tHOO
+from hoo.utils.profiler import Profiler
+
+
+def benchmark_state(name: str = "branin") -> HOOState:
+    return HOOState(Function.from_benchmark(name))
+
+
+ALGORITHMS = {
+    "hoo": lambda state, **kwargs: HOO(state, **kwargs),
+    "t_hoo": lambda state, **kwargs: tHOO(state, **kwargs),
+    "ld_hoo": lambda state, **kwargs: LDHOO(state, 8, **kwargs),
+    "poly_hoo": lambda state, **kwargs: PolyHOO(state, 8, **kwargs),
+}
+
+
+def preorder(hoo: HOO) -> list:
+    """Every node of a tree, in pre-order"""
+    nodes = []
+    stack = [hoo.root]
+
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack += reversed(node.children)
+
+    return nodes
+
+
+def run_summary(hoo: HOO, n: int, sample: bool = True) -> tuple:
+    """Recommendation and node statistics of a tree after n iterations"""
+    action = hoo.run(n, sample=sample)
+
+    return (
+        action,
+        [(node.low, node.high, node.N, node.R) for node in preorder(hoo)],
+        hoo.top_k_actions(3, sample=False).actions.tolist(),
+    )
+
+
+@pytest.mark.parametrize("backend", ["object", "array"])
+def test_path_update_matches_full_update(backend):
+    np.random.seed(0)
+    hoo = HOO(benchmark_state(), backend=backend)
+    hoo.run(200)
+
+    t = 201
+    hoo.update_all_B(t)
+    hoo.generate_path()
+
+    for node in hoo.path:
+        node.N += 1
+        node.R += 0.5
+
+    # With the same time-step, only the nodes of the path change
+    path_update = copy.deepcopy(hoo)
+    path_update.update_B_path(math.log(t))
+    hoo.update_all_B(t)
+
+    assert (
+        [node.B for node in preorder(path_update)]
+        == [node.B for node in preorder(hoo)]
+    )
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+@pytest.mark.parametrize("sample", [True, False])
+def test_array_backend_matches_object_backend(algorithm, sample):
+    summaries = []
+
+    for backend in ["object", "array"]:
+        np.random.seed(1)
+        hoo = ALGORITHMS[algorithm](benchmark_state("hartmann3"),
+                                    backend=backend)
+        summaries.append(run_summary(hoo, 300, sample=sample))
+
+    assert summaries[0] == summaries[1]
+
+
+@pytest.mark.parametrize("environment", list(STR_TO_ENVIRONMENT))
+def test_step_batch_matches_step(environment):
+    env = STR_TO_ENVIRONMENT[environment](seed=0)
+    states = random_states(env, 1024)
+
+    rng = np.random.default_rng(0)
+    low = np.array(env.hoo_action_space.low)
+    high = np.array(env.hoo_action_space.high)
+    actions = low + (high - low) * rng.random((len(states), len(low)))
+
+    next_states, rewards, dones = scalar_steps(env, states, actions)
+    batch_output = env.step_batch(states, actions)
+
+    assert np.array_equal(batch_output.next_states, next_states)
+    assert np.array_equal(batch_output.rewards, rewards)
+    assert np.array_equal(batch_output.dones, dones)
+
+
+def hoot_summary(hoot: HOOT, n: int) -> tuple:
+    """Recommendation and root statistics of a HOOT run of n iterations"""
+    action = hoot.run(n, sample=False)
+
+    return action, [(node.N, node.R) for node in preorder(hoot.root.hoo)]
+
+
+def test_lazy_hoo_trees_match_eager_trees(monkeypatch):
+    # The action space of the cart-pole is 1-dimensional, so building a
+    # tree takes no random draw and the order of the builds does not matter
+    summaries = []
+    hoo_trees = []
+
+    for eager in [False, True]:
+        if eager:
+            lazy_init = HOOTNode.__init__
+
+            def eager_init(self, *args, **kwargs):
+                lazy_init(self, *args, **kwargs)
+                self.hoo
+
+            monkeypatch.setattr(HOOTNode, "__init__", eager_init)
+
+        np.random.seed(2)
+        state = HOOState(STR_TO_ENVIRONMENT["cartpole"](seed=0))
+        hoot = HOOT(10, HOOTNode(state))
+        summaries.append(hoot_summary(hoot, 100))
+        hoo_trees.append(hoot.footprint()["hoo_trees"])
+
+    assert summaries[0] == summaries[1]
+    assert hoo_trees[0] < hoo_trees[1]
+
+
+def test_simulation_cache_hits_match_simulations():
+    def cartpole_hoot(cache=None):
+        np.random.seed(3)
+        state = HOOState(STR_TO_ENVIRONMENT["cartpole"](seed=0))
+        return HOOT(10, HOOTNode(state), simulation_cache=cache)
+
+    expected = hoot_summary(cartpole_hoot(), 100)
+
+    # The second search repeats the simulations of the first one, which
+    # are all served by the cache
+    cache = SimulationCache()
+    first = hoot_summary(cartpole_hoot(cache), 100)
+    misses = cache.misses
+    second = hoot_summary(cartpole_hoot(cache), 100)
+
+    assert first == expected
+    assert second == expected
+    assert cache.misses == misses
+    assert cache.hits >= misses
+
+
+@pytest.mark.parametrize("algorithm", list(ALGORITHMS))
+@pytest.mark.parametrize("backend", ["object", "array"])
+def test_tracked_best_node_matches_exhaustive_search(algorithm, backend):
+    np.random.seed(4)
+    hoo = ALGORITHMS[algorithm](benchmark_state(), backend=backend)
+    hoo.track_best_node()
+
+    for n in [1, 10, 100, 400]:
+        hoo.run(n)
+
+        assert hoo.best_node() == hoo.choose_best_node(hoo.root)
+
+
+@pytest.mark.parametrize("rng", [None, 5])
+@pytest.mark.parametrize("doubling", [False, True])
+def test_flat_backend_matches_object_backend(rng, doubling):
+    summaries = {}
+
+    for backend in tHOO.backends:
+        np.random.seed(5)
+        hoo = tHOO(benchmark_state("hartmann6"), backend=backend, rng=rng,
+                   doubling=doubling)
+
+        # A second run keeps growing the same tree
+        summaries[backend] = (
+            run_summary(hoo, 300),
+            run_summary(hoo, 200, sample=False),
+        )
+
+    assert summaries["flat"] == summaries["object"]
+    assert summaries["array"] == summaries["object"]
+
+
+def test_flat_backend_generic_path_matches_fast_path():
+    summaries = []
+
+    for profiled in [False, True]:
+        np.random.seed(6)
+        hoo = tHOO(benchmark_state(), backend="flat")
+
+        # Profiled runs go through HOO.iterate and the node views
+        if profiled:
+            hoo.profiler = Profiler()
+
+        summaries.append(run_summary(hoo, 300))
+
+    assert summaries[0] == summaries[1]
+
+
+@pytest.mark.parametrize("profiled", [False, True])
+def test_doubling_horizon_counts_the_steps_of_every_run(profiled):
+    summaries = {}
+
+    for backend in ["object", "flat"]:
+        np.random.seed(7)
+        hoo = tHOO(benchmark_state(), backend=backend, doubling=True)
+
+        if profiled:
+            hoo.profiler = Profiler()
+
+        # The second run reaches the horizon of 128 at its 28th iteration
+        summaries[backend] = [run_summary(hoo, 100), hoo.n0]
+        summaries[backend] += [run_summary(hoo, 100), hoo.n0]
+
+        assert summaries[backend][1::2] == [128, 256]
+        assert hoo.time_step == 200
+
+    assert summaries["flat"] == summaries["object"]
+
+
+def test_bonus_table_is_kept_while_the_horizon_does_not_change():
+    hoo = tHOO(benchmark_state(), backend="flat")
+    hoo.run(100)
+    bonus = hoo.tree.bonus
+
+    hoo.run(100)
+
+    assert hoo.tree.bonus is bonus
+    assert len(bonus) == 101
+
+    hoo.run(200)
+
+    assert len(hoo.tree.bonus) == 201
@@ -0,0 +1,184 @@
+"""
+Tests of the experiment sweeps and of the result store
+"""
+import argparse
+import json
+
+import numpy as np
+
+from hoo.experiments import test_algorithms
+from hoo.experiments.result_store import ResultStore
+from hoo.experiments.test_algorithms import (build_jobs,
+                                             run_tests,
+                                             select_pending_jobs)
+
+
+def sweep_args(**kwargs) -> argparse.Namespace:
+    """Command line arguments of a sweep with tiny runs"""
+    args = {
+        "algorithms": ["hoot", "ld_hoot"],
+        "environment": "cartpole",
+        "seeds": 1,
+        "hoo_max_depth": 2,
+        "n_actions": 2,
+        "search_depth": 3,
+        "algorithm_iter": 5,
+        "time_budget": None,
+        "staleness": 0.,
+        "clip_reward": False,
+        "workers": 1,
+        "store": None,
+        **kwargs,
+    }
+
+    return argparse.Namespace(**args)
+
+
+def test_build_jobs():
+    jobs = build_jobs(sweep_args(algorithms=["hoot", "poly_hoot"], seeds=2))
+
+    assert [(configs.algorithm, configs.seed) for configs, _ in jobs] == [
+        ("hoot", 0), ("hoot", 1), ("poly_hoot", 0), ("poly_hoot", 1),
+    ]
+    assert [str(path) for _, path in jobs] == [
+        "cartpole/hoot", "cartpole/hoot",
+        "cartpole/poly_hoot_h_2", "cartpole/poly_hoot_h_2",
+    ]
+    assert all(configs.n_actions == 2 for configs, _ in jobs)
+
+
+def test_sweep_resumes_from_json_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    args = sweep_args()
+
+    assert run_tests(args) == []
+    assert "Pending: 2" in capsys.readouterr().out
+
+    for configs, path in build_jobs(args):
+        with open(path / f"{configs.seed}.json") as jfile:
+            assert len(json.load(jfile)["rewards"]) == 2
+
+    assert select_pending_jobs(build_jobs(args)) == []
+    assert run_tests(args) == []
+    assert "Done: 2; Pending: 0" in capsys.readouterr().out
+
+
+def test_sweep_resumes_from_store(tmp_path, capsys):
+    args = sweep_args(store=str(tmp_path / "store"))
+
+    assert run_tests(args) == []
+    assert "Pending: 2" in capsys.readouterr().out
+
+    store = ResultStore(args.store)
+
+    assert len(store.runs()) == 2
+    assert select_pending_jobs(build_jobs(args), store) == []
+    assert run_tests(args) == []
+    assert "Done: 2; Pending: 0" in capsys.readouterr().out
+    assert len(store.runs()) == 2
+
+
+def test_sweep_reports_failed_jobs(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    args = sweep_args()
+    simulate_run = test_algorithms.simulate_run
+
+    def failing_simulate_run(configs, **kwargs):
+        if configs.algorithm == "ld_hoot":
+            raise RuntimeError("diverged")
+
+        return simulate_run(configs, **kwargs)
+
+    monkeypatch.setattr(test_algorithms, "simulate_run", failing_simulate_run)
+    failed_jobs = run_tests(args)
+
+    assert [configs.algorithm for configs, _ in failed_jobs] == ["ld_hoot"]
+    assert (
+        "Failed - Algorithm: ld_hoot; Seed: 0; Error: RuntimeError('diverged')"
+        in capsys.readouterr().out
+    )
+
+    # Only the failed job is run again
+    monkeypatch.setattr(test_algorithms, "simulate_run", simulate_run)
+    pending_jobs = select_pending_jobs(build_jobs(args))
+
+    assert [configs.algorithm for configs, _ in pending_jobs] == ["ld_hoot"]
+    assert run_tests(args) == []
+    assert "Done: 1; Pending: 1" in capsys.readouterr().out
+    assert select_pending_jobs(build_jobs(args)) == []
+
+
+def run_output(algorithm: str, seed: int, rewards: list) -> dict:
+    """Output of a run, in the format of generate_hoot_path"""
+    return {
+        "actions": [[0.]] * len(rewards),
+        "rewards": rewards,
+        "state": [[0., 0.]] * (len(rewards) + 1),
+        "iterations": [10] * len(rewards),
+        "times": [0.1] * len(rewards),
+        "running_time": 0.1 * len(rewards),
+        "date": "2026-01-01 00:00:00",
+        "algorithm": algorithm,
+        "environment": "cartpole",
+        "seed": seed,
+    }
+
+
+def test_result_store_append_and_filter(tmp_path):
+    store = ResultStore(tmp_path)
+    entry = store.append(run_output("hoot", 0, [1., 2., 3.]))
+    store.append(run_output("hoot", 1, [4., 5., 6.]))
+    store.append(run_output("ld_hoot", 0, [7., 8.]))
+
+    assert entry["n_actions"] == 3
+    assert entry["iterations"] == [10, 10, 10]
+    assert "rewards" not in entry["configs"]
+    assert store.load(entry, "rewards").tolist() == [1., 2., 3.]
+    assert store.load(entry, "states").shape == (4, 2)
+
+    assert [e["configs"]["seed"] for e in store.runs(algorithm="hoot")] == [
+        0, 1
+    ]
+    assert len(store.runs(algorithm=["hoot", "ld_hoot"])) == 3
+    assert len(store.runs(algorithm="hoot", seed=1)) == 1
+    assert store.runs(algorithm="poly_hoot") == []
+
+    configs = entry["configs"]
+    stored_runs = store.stored_runs()
+
+    assert len(stored_runs) == 3
+    assert store.has_run(configs)
+    assert store.has_run(configs, stored_runs)
+    assert not store.has_run({**configs, "seed": 2}, stored_runs)
+    assert not store.has_run({**configs, "environment": "acrobot"})
+
+
+def test_reward_curves_match_numpy(tmp_path):
+    rewards = np.random.default_rng(0).normal(size=(5, 6))
+    lengths = [6, 5, 6, 4, 6]
+
+    store = ResultStore(tmp_path)
+    for seed, (run_rewards, length) in enumerate(zip(rewards, lengths)):
+        store.append(run_output("hoot", seed, run_rewards[:length].tolist()))
+    store.append(run_output("ld_hoot", 0, [1., 2.]))
+
+    curves = store.reward_curves(confidence=0.95)
+    curve = curves[("hoot",)]
+
+    # Runs are truncated to the shortest one
+    truncated = rewards[:, :4]
+    mean = truncated.mean(axis=0)
+    half_width = 1.959964 * truncated.std(axis=0, ddof=1) / np.sqrt(5)
+
+    assert curve.n_runs == 5
+    np.testing.assert_allclose(curve.mean, mean)
+    np.testing.assert_allclose(curve.lower, mean - half_width, rtol=1e-6)
+    np.testing.assert_allclose(curve.upper, mean + half_width, rtol=1e-6)
+
+    assert curves[("ld_hoot",)].n_runs == 1
+    assert curves[("ld_hoot",)].lower.tolist() == [1., 2.]
+
+    cumulative = store.reward_curves(cumulative=True, algorithm="hoot")
+    np.testing.assert_allclose(
+        cumulative[("hoot",)].mean, np.cumsum(truncated, axis=1).mean(axis=0)
+    )
@@ -0,0 +1,289 @@
+"""
+Tests of the HOOT search and of its options
+"""
+import threading
+
+import numpy as np
+import pytest
+
+# Aliased so that pytest does not collect it as a test class
+from hoo.environments.test_function import TestFunction as Function
+from hoo.experiments.run_configs import HOOTRunConfigs
+from hoo.experiments.simulator import STR_TO_ENVIRONMENT
+from hoo.hoo import TreeStatistics
+from hoo.hoot.hoot import HOOT, simulation_pool
+from hoo.hoot.hoot_node import HOOTNode
+from hoo.state_actions.hoo_state import HOOState
+from hoo.utils.profiler import Profiler
+from hoo.utils.rng import BlockRNG
+
+
+def cartpole_state() -> HOOState:
+    return HOOState(STR_TO_ENVIRONMENT["cartpole"](seed=0))
+
+
+def expanded_nodes(hoot: HOOT) -> list:
+    """Nodes of a HOOT tree whose HOO tree was built"""
+    nodes = []
+    stack = [hoot.root]
+
+    while stack:
+        node = stack.pop()
+        stack += node.children.values()
+
+        if node.expanded():
+            nodes.append(node)
+
+    return nodes
+
+
+def test_staleness_reaches_every_hoo_tree():
+    np.random.seed(0)
+    configs = HOOTRunConfigs(
+        environment="cartpole",
+        n_actions=1,
+        search_depth=5,
+        algorithm_iter=50,
+        staleness=0.5,
+    )
+    hoot = HOOT.from_configs(configs, cartpole_state())
+    hoot.run(configs.algorithm_iter)
+
+    nodes = expanded_nodes(hoot)
+
+    assert len(nodes) > 1
+    assert all(node.hoo.staleness == 0.5 for node in nodes)
+    assert hoot.root.new_root(cartpole_state()).hoo.staleness == 0.5
+
+
+def branin_root(**kwargs) -> HOOTNode:
+    return HOOTNode(HOOState(Function.from_benchmark("branin")), **kwargs)
+
+
+def sorted_statistics(statistics: TreeStatistics) -> list:
+    return sorted(zip(
+        map(tuple, statistics.low.tolist()),
+        map(tuple, statistics.high.tolist()),
+        statistics.N.tolist(),
+        statistics.R.tolist(),
+    ))
+
+
+@pytest.mark.parametrize("block_rng", [False, True])
+def test_single_worker_root_parallel_matches_plain_run(block_rng):
+    np.random.seed(1)
+    hoot = HOOT(1, branin_root(rng=BlockRNG(7) if block_rng else None))
+    hoot.run_root_parallel(200, sample=False)
+
+    # The worker searches with the first child stream of the root's
+    # generator, or of a seed drawn from the global RNG
+    np.random.seed(1)
+    if block_rng:
+        rng = BlockRNG(7).spawn(1)[0]
+    else:
+        rng = None
+        seed_sequence = np.random.SeedSequence(np.random.randint(2**31))
+        np.random.seed(seed_sequence.spawn(1)[0].generate_state(1))
+
+    plain = HOOT(1, branin_root(rng=rng, cyclic_splits=True))
+    action = plain.run(200, sample=False)
+
+    assert hoot.n_iterations == 200
+    assert sorted_statistics(hoot.root_statistics) == sorted_statistics(
+        plain.root.hoo.tree_statistics()
+    )
+    assert hoot.choose_best_action(sample=False) == action
+
+
+def test_root_parallel_workers_share_their_cells():
+    hoot = HOOT(1, branin_root(rng=BlockRNG(8)), n_workers=3)
+    hoot.run(100, sample=False)
+
+    statistics = hoot.root_statistics
+    depths, counts = np.unique(statistics.depth, return_counts=True)
+
+    assert statistics.N[statistics.depth == 0].tolist() == [300]
+    assert all(count <= 2**depth for depth, count in zip(depths, counts))
+
+
+def hoo_nodes(hoot: HOOT) -> list:
+    """HOO nodes of all the HOO trees built by a HOOT search"""
+    nodes = []
+
+    for hoot_node in expanded_nodes(hoot):
+        stack = [hoot_node.hoo.root]
+
+        while stack:
+            node = stack.pop()
+            stack += node.children
+            nodes.append(node)
+
+    return nodes
+
+
+def test_tree_parallel_removes_every_virtual_visit():
+    np.random.seed(2)
+    n = 300
+    hoot = HOOT(
+        4,
+        HOOTNode(cartpole_state()),
+        n_workers=4,
+        parallel="tree",
+        virtual_reward=-1000.,
+    )
+    hoot.run(n, sample=False)
+
+    assert hoot.n_iterations == n
+    assert hoot.root.visits() == n
+    assert hoot.root.hoo.staleness > 0
+    assert hoot.pending == {}
+
+    # Every search ends at a leaf of each HOO tree it goes through and then
+    # visits the children, so a node's visits are its children's plus one
+    for node in hoo_nodes(hoot):
+        children_N = sum(child.N for child in node.children)
+        children_R = sum(child.R for child in node.children)
+
+        if node.N == 0:
+            assert node.leaf() and node.R == 0
+        else:
+            assert node.N == children_N + 1
+            assert 0 <= node.R - children_R <= 1
+
+
+def test_simulation_pool_steps_snapshots():
+    state = cartpole_state()
+    hoot = HOOT(
+        1,
+        HOOTNode(state),
+        n_workers=2,
+        parallel="tree",
+        executor=simulation_pool(2, state.env_state),
+    )
+    action = [0.5]
+
+    with hoot.executor:
+        output = hoot.simulate(state, action, threading.local())
+
+    expected = state.simulate(action)
+
+    assert output.next_state.env_state is state.env_state
+    assert output.next_state.get_state() == expected.next_state.get_state()
+    assert (output.reward, output.done) == (expected.reward, expected.done)
+
+
+def test_eviction_keeps_the_tree_under_the_cap():
+    np.random.seed(3)
+    max_nodes = 40
+    profiler = Profiler()
+    state = cartpole_state()
+    hoot = HOOT(6, HOOTNode(state), max_nodes=max_nodes, profiler=profiler)
+    n_created = hoot.count_nodes()
+    n_evicted = 0
+
+    for _ in range(4):
+        action = hoot.run(150, sample=False)
+        n_created += profiler.counters["hoot_nodes_created"]
+        n_evicted += hoot.n_evicted_nodes
+        profiler.reset()
+
+        best_child = hoot.best_child()
+        footprint = hoot.footprint()
+        nodes = expanded_nodes(hoot)
+
+        assert hoot.n_evictions > 0
+        assert hoot.n_nodes == hoot.count_nodes() <= max_nodes
+        assert footprint["hoot_nodes"] == hoot.n_nodes
+        assert footprint["evicted_nodes"] == hoot.n_evicted_nodes
+        assert footprint["hoo_trees"] == len(nodes)
+        assert footprint["hoo_nodes"] == sum(
+            node.hoo.count_nodes() for node in nodes
+        )
+        assert n_created - n_evicted == hoot.n_nodes
+
+        # The recommended action leads to a child that was kept
+        assert best_child is not None
+        assert best_child.action == action
+
+        best_child.reset()
+        hoot = HOOT(6, best_child, max_nodes=max_nodes, profiler=profiler)
+        n_created = hoot.count_nodes()
+        n_evicted = 0
+
+
+def test_transpositions_share_nodes_between_paths():
+    np.random.seed(4)
+    hoot = HOOT(
+        4, HOOTNode(cartpole_state()), transposition_resolution=0.05
+    )
+    searches = {}
+    parents = {}
+
+    for t in range(1, 201):
+        last_node, rewards = hoot.search(sample=False)
+        hoot.backpropagate(last_node, rewards, t)
+
+        # The last node of a search does not select an action, so its HOO
+        # tree is not updated
+        for node in hoot.path[:-1]:
+            searches[id(node)] = searches.get(id(node), 0) + 1
+
+    nodes = {}
+    stack = [hoot.root]
+
+    while stack:
+        node = stack.pop()
+        nodes[id(node)] = node
+
+        for child in node.children.values():
+            parents.setdefault(id(child), set()).add(id(node))
+            if id(child) not in nodes:
+                stack.append(child)
+
+    shared = [
+        node_id for node_id, node_parents in parents.items()
+        if len(node_parents) > 1 and node_id in searches
+    ]
+
+    assert hoot.transpositions.hits > 0
+    assert len(shared) > 0
+    assert all(
+        nodes[node_id].visits() == count
+        for node_id, count in searches.items()
+    )
+
+    # Every path to a node has its length, also after re-rooting
+    root = hoot.best_child()
+    root.reset()
+    stack = [root]
+    seen = {id(root)}
+
+    assert root.depth == 0
+
+    while stack:
+        node = stack.pop()
+
+        for child in node.children.values():
+            assert child.depth == node.depth + 1
+
+            if id(child) not in seen:
+                seen.add(id(child))
+                stack.append(child)
+
+    assert len(seen) > 1
+
+
+def test_best_node_tracking_does_not_change_the_search():
+    actions = {}
+
+    for track_best in [False, True]:
+        np.random.seed(5)
+        hoot = HOOT(4, HOOTNode(cartpole_state()), track_best=track_best)
+        actions[track_best] = [hoot.run(50, sample=False)]
+        actions[track_best] += [
+            hoot.run(50, sample=False), hoot.best_child().action
+        ]
+
+        assert (hoot.root.hoo.best_tracker is not None) == track_best
+
+    assert actions[True] == actions[False]